@@ -0,0 +1,100 @@
+import csv
+import math
+from datetime import time
+
+from tarih_yardimci import tarih_donustur
+
+# Büyük Excel/CSV dışa aktarımlarını tüm satırları belleğe almadan, tipleri
+# düzeltilmiş parti parti kayıtlar halinde okur.
+
+SAYI_SUTUNLARI = ("NORMAL_OKUMA", "DIGER", "TOPLAM_OKUMA")
+
+def _sayi(v):
+    if v is None or v == "":
+        return 0
+    if isinstance(v, float):
+        return 0 if math.isnan(v) else int(v)
+    try:
+        return int(float(v))
+    except (TypeError, ValueError):
+        return 0
+
+def kayit_duzenle(kayit):
+    kayit["TARIH"] = tarih_donustur(kayit.get("TARIH"))
+    for sutun in SAYI_SUTUNLARI:
+        if sutun in kayit:
+            kayit[sutun] = _sayi(kayit[sutun])
+    # ILCE/BOLGE okunduğu gibi kalır; karşılaştırmalar isim_kayit.normalize_ad ile yapılır
+    for sutun in ("ILK_OKUMA", "SON_OKUMA"):
+        if isinstance(kayit.get(sutun), time):
+            kayit[sutun] = kayit[sutun].isoformat()
+    return kayit
+
+def _partile(basliklar, satirlar, parti_boyutu):
+    parti = []
+    for satir in satirlar:
+        if not any(h is not None and h != "" for h in satir):
+            continue  # boş satır
+        parti.append(kayit_duzenle(dict(zip(basliklar, satir))))
+        if len(parti) >= parti_boyutu:
+            yield parti
+            parti = []
+    if parti:
+        yield parti
+
+def excel_partileri(yol, parti_boyutu=5000):
+    # read_only modunda openpyxl satırları diskten akış halinde okur
+    from openpyxl import load_workbook
+    wb = load_workbook(yol, read_only=True, data_only=True)
+    try:
+        satirlar = wb.active.iter_rows(values_only=True)
+        basliklar = [str(b).strip() if b is not None else "" for b in next(satirlar, ())]
+        yield from _partile(basliklar, satirlar, parti_boyutu)
+    finally:
+        wb.close()
+
+def csv_partileri(yol, parti_boyutu=5000, ayirici=None, encoding="utf-8-sig"):
+    with open(yol, "r", encoding=encoding, newline="") as f:
+        if ayirici is None:
+            # Başlık satırında en çok geçen ayırıcıyı kullan
+            baslik = f.readline()
+            f.seek(0)
+            ayirici = max(",;\t", key=baslik.count)
+        okuyucu = csv.reader(f, delimiter=ayirici)
+        basliklar = [b.strip() for b in next(okuyucu, [])]
+        yield from _partile(basliklar, okuyucu, parti_boyutu)
+
+def dosya_partileri(yol, parti_boyutu=5000):
+    if yol.lower().endswith((".csv", ".txt")):
+        return csv_partileri(yol, parti_boyutu)
+    return excel_partileri(yol, parti_boyutu)
+
+def akisli_kayitlar(yol, parti_boyutu=5000):
+    for parti in dosya_partileri(yol, parti_boyutu):
+        yield from parti
+
+# ------------------ AKIŞLI TOPLAMA ------------------
+def gunluk_ozet_kayitlari(partiler):
+    # Ham satırları (kişi, gün, bölge, ilçe) bazında toplar. Bellek kullanımı
+    # satır sayısıyla değil kişi x gün sayısıyla büyür. Anahtarlar ilk
+    # görüldükleri sırada kalır; bu yüzden sonuç personel_karsilastirma_analizi
+    # ve default_karakter_karsilastirma'ya ham satırlar yerine verilebilir.
+    ozet = {}
+    for parti in partiler:
+        for v in parti:
+            anahtar = (v.get("AD_SOYAD", ""), v.get("TARIH"), v.get("KULLANICI_ADI"), v.get("BOLGE", ""), v.get("ILCE", ""))
+            kayit = ozet.get(anahtar)
+            if kayit is None:
+                ozet[anahtar] = {
+                    "AD_SOYAD": anahtar[0],
+                    "TARIH": anahtar[1],
+                    "KULLANICI_ADI": anahtar[2],
+                    "BOLGE": anahtar[3],
+                    "ILCE": anahtar[4],
+                    "TOPLAM_OKUMA": v.get("TOPLAM_OKUMA", 0),
+                    "NORMAL_OKUMA": v.get("NORMAL_OKUMA", 0),
+                }
+            else:
+                kayit["TOPLAM_OKUMA"] += v.get("TOPLAM_OKUMA", 0)
+                kayit["NORMAL_OKUMA"] += v.get("NORMAL_OKUMA", 0)
+    return list(ozet.values())
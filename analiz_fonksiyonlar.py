@@ -1,64 +1,97 @@
 import json
 import math
+import os
 from typing import List, Dict, Any
-from datetime import datetime
+from datetime import datetime, date, time
 from collections import defaultdict
-from dateutil.parser import parse
 
-# --- Normalizasyon Fonksiyonları ---
-def normalize_ilce_adi(ilce_adi):
-    if not ilce_adi:
-        return ""
-    return (ilce_adi.strip()
-            .upper()
-            .replace("İ", "I")
-            .replace("Ç", "C")
-            .replace("Ğ", "G")
-            .replace("Ö", "O")
-            .replace("Ş", "S")
-            .replace("Ü", "U"))
+from isim_kayit import (
+    ILCE_KAYDI,
+    BOLGE_KAYDI,
+    BOLGE_KATSAYILARI,
+    ascii_buyuk,
+    bolge_katsayisi,
+    bolge_kimligi,
+    ilce_kimligi,
+    sorgu_kimligi,
+)
+from tarih_yardimci import tarih_ordinal
 
-def normalize_bolge_adi(bolge_adi):
-    if not bolge_adi:
-        return ""
-    return (bolge_adi.strip()
-            .upper()
-            .replace("İ", "I")
-            .replace("Ç", "C")
-            .replace("Ğ", "G")
-            .replace("Ö", "O")
-            .replace("Ş", "S")
-            .replace("Ü", "U"))
+# --- Normalizasyon Fonksiyonları ---
+# Ad normalizasyonu ve kimlikler isim_kayit'ta; bu adlar eski çağıranlar için
+normalize_ilce_adi = ascii_buyuk
+normalize_bolge_adi = ascii_buyuk
 
 # --- Filtreleme Fonksiyonu ---
+def _kimlikle_filtrele(veriler, kayit, kimlik_al, ad):
+    # Satır kimlikleri önce alınır; böylece yalnızca veride geçen (kimliği
+    # henüz kaydedilmemiş) adlar da sorguyla eşleşir
+    kimlikler = [kimlik_al(v) for v in veriler]
+    aranan = sorgu_kimligi(kayit, ad)
+    return [v for v, k in zip(veriler, kimlikler) if k == aranan]
+
 def filtrele_veri_ilce_veya_bolge(veriler, ilce=None, bolge=None):
     if ilce:
-        ilce_norm = normalize_ilce_adi(ilce)
-        veriler = [v for v in veriler if normalize_ilce_adi(v.get("ILCE", "")) == ilce_norm]
+        veriler = _kimlikle_filtrele(veriler, ILCE_KAYDI, ilce_kimligi, ilce)
     if bolge:
-        norm_bolge = normalize_bolge_adi(bolge)
-        veriler = [v for v in veriler if v.get("BOLGE") and normalize_bolge_adi(v.get("BOLGE")) == norm_bolge]
+        veriler = _kimlikle_filtrele(veriler, BOLGE_KAYDI, bolge_kimligi, bolge)
     return veriler
 
 # --- Düzenlilik Puanı Hesabı ---
 def duzenlilik_puani(okuma_tarihleri, analiz_baslangic, analiz_bitis):
-    import pandas as pd
-    df = pd.DataFrame({'tarih': pd.to_datetime(okuma_tarihleri)})
-    aktif_gunler = df['tarih'].dt.date.nunique()
+    aktif_gunler = len({tarih_ordinal(t) for t in okuma_tarihleri} - {None})
     toplam_gun = (analiz_bitis - analiz_baslangic).days + 1
     duzenlilik = aktif_gunler / toplam_gun
     return min(duzenlilik, 1.0)
 
-# --- Bölge Katsayılarını Yükle (JSON'dan) ---
-try:
-    with open("BOLGE_KATSAYI_DETAYLI.json", "r", encoding="utf-8") as f:
-        katsayi_data = json.load(f)
-        BOLGE_KATSAYILARI = {normalize_bolge_adi(bolge): veriler["katsayi"] for bolge, veriler in katsayi_data.items()}
-except FileNotFoundError:
-    BOLGE_KATSAYILARI = {}
-
+# --- Bölge Katsayısı ---
 def get_bolge_katsayi(bolge_adi):
-    return BOLGE_KATSAYILARI.get(normalize_bolge_adi(bolge_adi), 1.0)
+    return bolge_katsayisi(BOLGE_KAYDI.kimlik(bolge_adi))
+
+# --- Bölge Ortalamaları Anlık Görüntüsü ---
+# bolge_ortalamalari.json ilk kullanımda ve dosya değiştiğinde okunur, arada
+# bellekteki doğrulanmış tablo kullanılır. Boş ya da bozuk dosya boş tablo
+# sayılır; ortalaması sayı olmayan bölgeler atlanır (varsayılan 1 alır).
+ORTALAMA_DOSYASI = "bolge_ortalamalari.json"
+_ortalama_tablosu = {"imza": None, "tablo": {}}
+
+def _sayi_mi(deger):
+    if deger is None or isinstance(deger, bool):
+        return False
+    try:
+        return math.isfinite(float(deger))
+    except (TypeError, ValueError):
+        return False
+
+def ortalamalari_dogrula(veri):
+    if not isinstance(veri, dict):
+        print("Bölge ortalamaları nesne olmalı; yok sayıldı.")
+        return {}
+    tablo = {}
+    for bolge, deger in veri.items():
+        ortalama = deger.get("ortalama_toplam_okuma") if isinstance(deger, dict) else deger
+        if not _sayi_mi(ortalama):
+            print(f"Geçersiz bölge ortalaması atlandı: {bolge!r} -> {deger!r}")
+            continue
+        tablo[bolge] = deger
+    return tablo
+
+def bolge_ortalamalari_dosyasi(dosya=ORTALAMA_DOSYASI):
+    try:
+        st = os.stat(dosya)
+    except OSError:
+        return {}
+    imza = (dosya, st.st_mtime_ns, st.st_size)
+    if imza != _ortalama_tablosu["imza"]:
+        try:
+            with open(dosya, "r", encoding="utf-8") as f:
+                icerik = f.read()
+            veri = json.loads(icerik) if icerik.strip() else {}
+        except (OSError, ValueError) as e:
+            print(f"Bölge ortalamaları okunamadı ({dosya}): {e}")
+            veri = {}
+        _ortalama_tablosu.update(imza=imza, tablo=ortalamalari_dogrula(veri))
+    return _ortalama_tablosu["tablo"]
 
 # --- Puan Hesabı ---
 def hesapla_puan(
@@ -121,6 +154,24 @@ def hesapla_puan(
     }
 
 # --- Personel Karşılaştırma Analizi ---
+def okuma_sayisi(deger):
+    # Boş hücre (None / NaN) okuma yok sayılır. Boş hücre yüzünden float
+    # okunan tam sayılar int'e döner; sütunlu motor (okuma_sutunu) da aynısını yapar
+    if deger is None:
+        return 0
+    if isinstance(deger, float):
+        if math.isnan(deger):
+            return 0
+        if deger.is_integer():
+            return int(deger)
+    return deger
+
+def kullanici_adi_veya_tire(ad):
+    # Boş ya da NaN (DataFrame'den gelen kayıt) kullanıcı adı "-"
+    if not ad or (isinstance(ad, float) and math.isnan(ad)):
+        return "-"
+    return ad
+
 def personel_karsilastirma_analizi(
     veriler: list,
     gun_sayisi: int,
@@ -131,13 +182,13 @@ def personel_karsilastirma_analizi(
         grouped[v.get("AD_SOYAD", "")].append(v)
     max_okuma = 1
     for kayitlar in grouped.values():
-        toplam = sum(k.get("TOPLAM_OKUMA", 0) for k in kayitlar)
+        toplam = sum(okuma_sayisi(k.get("TOPLAM_OKUMA")) for k in kayitlar)
         if toplam > max_okuma:
             max_okuma = toplam
     analiz_sonuc = []
     for ad_soyad, kayitlar in grouped.items():
-        toplam_okuma = sum(k.get("TOPLAM_OKUMA", 0) for k in kayitlar)
-        toplam_normal = sum(k.get("NORMAL_OKUMA", 0) for k in kayitlar)
+        toplam_okuma = sum(okuma_sayisi(k.get("TOPLAM_OKUMA")) for k in kayitlar)
+        toplam_normal = sum(okuma_sayisi(k.get("NORMAL_OKUMA")) for k in kayitlar)
         bolge = kayitlar[0].get("BOLGE", "")
         bolge_katsayi = get_bolge_katsayi(bolge)
         bolge_ort_deger = bolge_ortalamalari.get(bolge, 1)
@@ -150,12 +201,12 @@ def personel_karsilastirma_analizi(
         except Exception:
             bolge_ortalama = 1
         okuma_tarihleri = [k.get("TARIH") for k in kayitlar if k.get("TARIH")]
-        if okuma_tarihleri:
-            tarih_objs = [parse(t) for t in okuma_tarihleri]
-            analiz_baslangic = min(tarih_objs).date()
-            analiz_bitis = max(tarih_objs).date()
+        gunler = {tarih_ordinal(t) for t in okuma_tarihleri} - {None}
+        if gunler:
+            analiz_baslangic = date.fromordinal(min(gunler))
+            analiz_bitis = date.fromordinal(max(gunler))
             duzenlilik = duzenlilik_puani(okuma_tarihleri, analiz_baslangic, analiz_bitis)
-            aktif_gun = len(set(okuma_tarihleri))
+            aktif_gun = len(gunler)
             toplam_gun = (analiz_bitis - analiz_baslangic).days + 1
         else:
             duzenlilik = 0
@@ -176,7 +227,7 @@ def personel_karsilastirma_analizi(
         GENEL_AGIRLIK = 1.0
         genel_puan = final_puan * GENEL_AGIRLIK
         analiz_sonuc.append({
-            "KULLANICI_ADI": kayitlar[0].get("KULLANICI_ADI") or "-",
+            "KULLANICI_ADI": kullanici_adi_veya_tire(kayitlar[0].get("KULLANICI_ADI")),
             "AD_SOYAD": ad_soyad,
             "BOLGE": bolge,
             "TOPLAM_OKUMA": toplam_okuma,
@@ -193,7 +244,7 @@ def personel_karsilastirma_analizi(
         })
     return analiz_sonuc
 
-def default_karakter_karsilastirma(kullanici_verileri):
+def default_karakter_karsilastirma(kullanici_verileri, bolge_ortalamalari=None):
     if not kullanici_verileri:
         return {}
     toplam_okuma = sum(v.get("TOPLAM_OKUMA", 0) for v in kullanici_verileri)
@@ -201,23 +252,21 @@ def default_karakter_karsilastirma(kullanici_verileri):
     bolge = kullanici_verileri[0].get("BOLGE", "")
     bolge_katsayi = get_bolge_katsayi(bolge)
     okuma_tarihleri = [v.get("TARIH") for v in kullanici_verileri if v.get("TARIH")]
-    if okuma_tarihleri:
-        tarih_objs = [parse(t) for t in okuma_tarihleri]
-        analiz_baslangic = min(tarih_objs).date()
-        analiz_bitis = max(tarih_objs).date()
-        aktif_gun = len(set(okuma_tarihleri))
+    gunler = {tarih_ordinal(t) for t in okuma_tarihleri} - {None}
+    if gunler:
+        analiz_baslangic = date.fromordinal(min(gunler))
+        analiz_bitis = date.fromordinal(max(gunler))
+        aktif_gun = len(gunler)
         toplam_gun = (analiz_bitis - analiz_baslangic).days + 1
         duzenlilik = duzenlilik_puani(okuma_tarihleri, analiz_baslangic, analiz_bitis)
     else:
         aktif_gun = 0
         toplam_gun = 1
         duzenlilik = 0
-    # Ortalama bul: bolge_ortalamalari'ndan ya da sabit değer
-    try:
-        with open("bolge_ortalamalari.json", "r", encoding="utf-8") as f:
-            bolge_ortalamalari = json.load(f)
-    except Exception:
-        bolge_ortalamalari = {}
+    # Ortalama bul: bolge_ortalamalari'ndan ya da sabit değer. Verilmezse
+    # son anlık görüntü (bolge_ortalamalari.json) kullanılır.
+    if bolge_ortalamalari is None:
+        bolge_ortalamalari = bolge_ortalamalari_dosyasi()
     bolge_ort_deger = bolge_ortalamalari.get(bolge, 1)
     if isinstance(bolge_ort_deger, dict):
         bolge_ortalama = bolge_ort_deger.get("ortalama_toplam_okuma", 1)
@@ -252,28 +301,118 @@ def default_karakter_karsilastirma(kullanici_verileri):
         "PUAN_AÇIKLAMA": "",
     }
 
-def kullanici_okuma_performansi_karsilastir(defter_id: str, okuma_suresi: float) -> List[Dict[str, Any]]:
-    # Dummy örnek; gerçekte sorgu yazılacak
-    return [
-        {
-            "AD_SOYAD": "Ali Akcan",
-            "KULLANICI_ADI": "ali_a",
-            "PUAN": 85.5,
-            "KATEGORI": "İyi",
-            "ARTI_YONLER": "Hızlı ve doğru okuma",
-            "EKSIK_YONLER": "Daha fazla örnek incelenmeli",
-            "TOPLAM_OKUMA": 120
-        },
-        {
-            "AD_SOYAD": "Mehmet Yılmaz",
-            "KULLANICI_ADI": "mehmet_y",
-            "PUAN": 75.0,
-            "KATEGORI": "Orta",
-            "ARTI_YONLER": "Düzenli takip",
-            "EKSIK_YONLER": "Hız artırılabilir",
-            "TOPLAM_OKUMA": 110
-        },
-    ]
+# --- Defter Bazlı Karşılaştırma ---
+def defter_anahtari(deger):
+    # Excel'de sayı olarak okunan defter numaraları ("78", 78, 78.0) aynı anahtara iner
+    if deger is None or (isinstance(deger, float) and math.isnan(deger)):
+        return None
+    if isinstance(deger, float) and deger.is_integer():
+        return str(int(deger))
+    return str(deger).strip()
+
+def saat_dakikasi(deger):
+    # "09:27", "09:27:00" ya da datetime.time -> gün içindeki dakika
+    if isinstance(deger, (datetime, time)):
+        return deger.hour * 60 + deger.minute + deger.second / 60
+    if not isinstance(deger, str):
+        return None
+    parcalar = deger.strip().split(":")
+    if len(parcalar) not in (2, 3):
+        return None
+    try:
+        saat, dakika = int(parcalar[0]), int(parcalar[1])
+        saniye = float(parcalar[2]) if len(parcalar) == 3 else 0
+    except ValueError:
+        return None
+    return saat * 60 + dakika + saniye / 60
+
+def okuma_suresi_dakika(kayit):
+    # ILK_OKUMA ile SON_OKUMA arası; saatler eksik ya da ters ise None
+    ilk = saat_dakikasi(kayit.get("ILK_OKUMA"))
+    son = saat_dakikasi(kayit.get("SON_OKUMA"))
+    if ilk is None or son is None or son <= ilk:
+        return None
+    return son - ilk
+
+def kullanici_okuma_performansi_karsilastir(
+    defter_kayitlari: List[Dict[str, Any]], okuma_suresi: float = None
+) -> List[Dict[str, Any]]:
+    """Aynı defteri okuyan personelin hız ve doğruluk karşılaştırması.
+
+    Okuyucu başına defterdeki okuma, normal okuma ve süre toplanır; puan
+    manuel_default_hesapla ile verilir ve okuyucular puana göre sıralanır.
+    ILK_OKUMA/SON_OKUMA saatleri olmayan kayıtlarda süre olarak okuma_suresi
+    (dakika) kullanılır; o da yoksa kayıt puana ve hıza girmez.
+    """
+    okuyucular = {}
+    for k in defter_kayitlari:
+        o = okuyucular.get(k.get("AD_SOYAD"))
+        if o is None:
+            o = okuyucular[k.get("AD_SOYAD")] = {
+                "ilk": k, "toplam": 0, "normal": 0, "kayit": 0, "defterler": set(),
+                "sureli_toplam": 0, "sureli_normal": 0, "sure": 0.0, "gunler": set(),
+            }
+        toplam = k.get("TOPLAM_OKUMA") or 0
+        normal = k.get("NORMAL_OKUMA") or 0
+        o["toplam"] += toplam
+        o["normal"] += normal
+        o["kayit"] += 1
+        o["defterler"].add(defter_anahtari(k.get("DEFTER_ID")))
+        o["gunler"].add(tarih_ordinal(k.get("TARIH")))
+        sure = okuma_suresi_dakika(k)
+        if sure is None and okuma_suresi:
+            sure = okuma_suresi
+        if sure is not None:
+            o["sure"] += sure
+            o["sureli_toplam"] += toplam
+            o["sureli_normal"] += normal
+
+    satirlar = []
+    for ad_soyad, o in okuyucular.items():
+        # Puan ve hız süresi bilinen kayıtlardan; DOGRULUK bütün kayıtlardan
+        puan_dict = manuel_default_hesapla(len(o["defterler"]), o["sure"], o["sureli_toplam"], o["sureli_normal"])
+        dogruluk = o["normal"] / o["toplam"] if o["toplam"] > 0 else 0
+        satirlar.append({
+            "KULLANICI_ADI": o["ilk"].get("KULLANICI_ADI") or "-",
+            "AD_SOYAD": ad_soyad,
+            "BOLGE": o["ilk"].get("BOLGE", ""),
+            # Excel'de sayı, veritabanında metin; iki kaynakta da aynı JSON
+            "DEFTER_ID": defter_anahtari(o["ilk"].get("DEFTER_ID")),
+            "TOPLAM_OKUMA": o["toplam"],
+            "NORMAL_OKUMA": o["normal"],
+            "KAYIT_SAYISI": o["kayit"],
+            "AKTIF_GUN": len(o["gunler"] - {None}),
+            "TOPLAM_SURE_DK": round(o["sure"], 1),
+            "OKUMA_HIZI": puan_dict.get("OKUMA_HIZI", 0.0),
+            "DOGRULUK": round(dogruluk, 4),
+            "PUAN": puan_dict["PUAN"],
+            "GENEL_PUAN": puan_dict["PUAN"],
+            "KATEGORI": puan_dict["KATEGORI"],
+        })
+
+    # Defter ortalamasına göre güçlü / zayıf yönler
+    hizlar = [s["OKUMA_HIZI"] for s in satirlar if s["TOPLAM_SURE_DK"]]
+    ort_hiz = sum(hizlar) / len(hizlar) if hizlar else 0
+    ort_dogruluk = sum(s["DOGRULUK"] for s in satirlar) / len(satirlar) if satirlar else 0
+    for s in satirlar:
+        arti, eksik = [], []
+        if s["TOPLAM_SURE_DK"]:
+            (arti if s["OKUMA_HIZI"] >= ort_hiz else eksik).append(
+                "Defter ortalamasından hızlı" if s["OKUMA_HIZI"] >= ort_hiz else "Defter ortalamasından yavaş"
+            )
+        else:
+            eksik.append("Okuma süresi bilinmiyor")
+        (arti if s["DOGRULUK"] >= ort_dogruluk else eksik).append(
+            "Doğruluk defter ortalamasının üstünde" if s["DOGRULUK"] >= ort_dogruluk
+            else "Doğruluk defter ortalamasının altında"
+        )
+        s["ARTI_YONLER"] = ", ".join(arti) or "-"
+        s["EKSIK_YONLER"] = ", ".join(eksik) or "-"
+
+    satirlar.sort(key=lambda x: (-x["PUAN"], -x["DOGRULUK"]))
+    for sira, s in enumerate(satirlar, 1):
+        s["SIRA"] = sira
+    return satirlar
 
 def manuel_default_hesapla(defter_sayisi, toplam_sure_dakika, toplam_okuma, normal_okuma):
     if defter_sayisi == 0 or toplam_sure_dakika == 0:
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import math
+
+from analiz_fonksiyonlar import get_bolge_katsayi, kullanici_adi_veya_tire
+from isim_kayit import ILCE_KAYDI, BOS, sorgu_kimligi
+from tarih_yardimci import tarih_ordinal
+from tembel_modul import tembel_modul
+
+np = tembel_modul("numpy")
+pd = tembel_modul("pandas")
+
+# Sütunlu (NumPy/pandas) analiz motoru. Sonuçlar analiz_fonksiyonlar'daki
+# liste tabanlı fonksiyonlarla birebir aynı olmalıdır.
+
+def _math_uygula(fonksiyon, dizi):
+    # np.log1p ve ** 0.5 bazı değerlerde math sürümünden 1 ulp farklı sonuç
+    # veriyor; birebir eşleşme için bu iki işlemi math ile yapıyoruz. Kişi
+    # başına bir çağrı olduğundan maliyeti gruplamanın yanında önemsiz.
+    return np.fromiter(map(fonksiyon, dizi.tolist()), dtype=float, count=len(dizi))
+
+def _karekok(x):
+    return x ** 0.5
+
+# --- Vektörel Puan Hesabı ---
+def hesapla_puan_dizi(
+    normal_okuma,
+    toplam_okuma,
+    bolge_ortalama,
+    bolge_katsayi=1.0,
+    aktif_gun=None,
+    toplam_gun=None,
+    alpha=0.65,
+    beta=0.25,
+    gamma=0.10
+) -> np.ndarray:
+    # hesapla_puan'ın dizi sürümü; yuvarlanmamış PUAN dizisini döndürür.
+    normal_okuma = np.asarray(normal_okuma, dtype=float)
+    toplam_okuma = np.asarray(toplam_okuma, dtype=float)
+    n = len(toplam_okuma)
+    bolge_ortalama = np.broadcast_to(np.asarray(bolge_ortalama, dtype=float), (n,))
+    bolge_katsayi = np.broadcast_to(np.asarray(bolge_katsayi, dtype=float), (n,))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zorluk_carpani = _math_uygula(math.log1p, bolge_katsayi)
+        beklenen = bolge_ortalama * zorluk_carpani
+        oran = np.where(beklenen > 0, toplam_okuma / beklenen, 0.0)
+        verimlilik_orani = np.minimum(_math_uygula(_karekok, oran), 1.0)
+        dogruluk_orani = np.where(toplam_okuma > 0, normal_okuma / toplam_okuma, 0.0)
+        if aktif_gun is not None and toplam_gun is not None:
+            aktif_gun = np.asarray(aktif_gun, dtype=float)
+            toplam_gun = np.broadcast_to(np.asarray(toplam_gun, dtype=float), (n,))
+            duzenlilik_orani = np.where(
+                toplam_gun != 0, np.minimum(aktif_gun / toplam_gun, 1.0), 0.5
+            )
+        else:
+            duzenlilik_orani = np.full(n, 0.5)
+        normalize_puan = (
+            alpha * verimlilik_orani +
+            beta * dogruluk_orani +
+            gamma * duzenlilik_orani
+        ) / (alpha + beta + gamma)
+        puan = np.minimum(normalize_puan * 100, 100.0)
+    return np.where((toplam_okuma == 0) | (bolge_ortalama == 0), 0.0, puan)
+
+_KATEGORILER = [
+    ("Mükemmel", "Verimlilik ve doğruluk çok yüksek.", "-"),
+    ("Çok İyi", "İyi iş çıkarıyor.", "Performans sürdürülebilir olmalı."),
+    ("İyi", "Ortalama üzerinde performans.", "Daha fazla verimlilik sağlanabilir."),
+    ("Orta", "Gelişmeye açık.", "Verimlilik ve doğruluk artırılabilir."),
+    ("Geliştirmeli", "Gelişmeye açık.", "Performans düşük, geliştirme gerekli."),
+]
+
+def kategori_indeksleri(puan: np.ndarray) -> np.ndarray:
+    # hesapla_puan'daki eşiklerle aynı sırada _KATEGORILER indeksini verir
+    return np.select([puan >= 90, puan >= 75, puan >= 60, puan >= 40], [0, 1, 2, 3], default=4)
+
+def _bolge_ortalamasi(bolge_ortalamalari, bolge):
+    bolge_ort_deger = bolge_ortalamalari.get(bolge, 1)
+    if isinstance(bolge_ort_deger, dict):
+        bolge_ortalama = bolge_ort_deger.get("ortalama_toplam_okuma", 1)
+    else:
+        bolge_ortalama = bolge_ort_deger
+    try:
+        return float(bolge_ortalama)
+    except Exception:
+        return 1
+
+def tarih_ordinalleri(df):
+    # TARIH sütununu gün numarasına çevirir; her farklı değer bir kez çözülür
+    if "TARIH" not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    tarih = df["TARIH"]
+    esleme = {t: tarih_ordinal(t) for t in tarih.dropna().unique()}
+    return tarih.map(esleme).astype(float)
+
+def _sutun(df, ad, varsayilan):
+    if ad in df.columns:
+        return df[ad]
+    return pd.Series([varsayilan] * len(df), index=df.index, dtype=object if varsayilan is None else None)
+
+def okuma_sutunu(df, ad):
+    # okuma_sayisi'nın sütunlu karşılığı: boş hücreler 0; boş hücre yüzünden
+    # float olan tam sayı sütunu int64'e döner
+    seri = _sutun(df, ad, 0).fillna(0)
+    if seri.dtype.kind == "f" and (seri % 1 == 0).all():
+        seri = seri.astype("int64")
+    return seri
+
+# --- Personel Karşılaştırma Analizi (sütunlu) ---
+def puanlama_cercevesi(df):
+    # Puanlamada kullanılan sütunlar; indeks df ile aynı kalır
+    return pd.DataFrame({
+        "AD_SOYAD": _sutun(df, "AD_SOYAD", ""),
+        "TOPLAM_OKUMA": okuma_sutunu(df, "TOPLAM_OKUMA"),
+        "NORMAL_OKUMA": okuma_sutunu(df, "NORMAL_OKUMA"),
+        "TARIH_ORD": tarih_ordinalleri(df),
+    })
+
+def kisi_ozeti(cerceve, bolgeler, bolge_ortalamalari, gruplar=None):
+    # Kişi başına toplamlar ve max_okuma normalizasyonu öncesi puan. bolgeler
+    # kişilerin ilk görülme sırasıyla bölgeleridir. Parçalar halinde (bkz.
+    # paralel_analiz) hesaplanan özetler birleştirilip puan_sonuclari'na
+    # verilebilir; normalizasyon orada tüm kişiler üzerinden yapılır.
+    if gruplar is None:
+        gruplar = cerceve.groupby("AD_SOYAD", sort=False, dropna=False, observed=True)
+    ozet = gruplar.agg(
+        toplam_okuma=("TOPLAM_OKUMA", "sum"),
+        toplam_normal=("NORMAL_OKUMA", "sum"),
+        aktif_gun=("TARIH_ORD", "nunique"),
+        ilk_gun=("TARIH_ORD", "min"),
+        son_gun=("TARIH_ORD", "max"),
+    )
+    toplam_okuma = ozet["toplam_okuma"].to_numpy()
+    toplam_normal = ozet["toplam_normal"].to_numpy()
+    aktif_gun = ozet["aktif_gun"].to_numpy()
+    tarihli = ozet["ilk_gun"].notna().to_numpy()
+    toplam_gun = np.where(
+        tarihli, (ozet["son_gun"] - ozet["ilk_gun"]).fillna(0).to_numpy() + 1, 1
+    )
+    duzenlilik = np.where(
+        tarihli, np.minimum(aktif_gun / toplam_gun, 1.0), 0
+    )
+
+    bolge_katsayi = np.array([get_bolge_katsayi(b) for b in bolgeler], dtype=float)
+    bolge_ortalama = np.array([_bolge_ortalamasi(bolge_ortalamalari, b) for b in bolgeler], dtype=float)
+
+    puan = hesapla_puan_dizi(
+        toplam_normal, toplam_okuma, bolge_ortalama, bolge_katsayi, aktif_gun, toplam_gun
+    )
+    return {
+        "ad": ozet.index.tolist(),
+        "bolge": list(bolgeler),
+        "toplam_okuma": toplam_okuma,
+        "toplam_normal": toplam_normal,
+        "aktif_gun": aktif_gun,
+        "duzenlilik": duzenlilik,
+        "bolge_katsayi": bolge_katsayi,
+        "puan": puan,
+    }
+
+def normalize_puan(satir, puan_yuvarlak, max_okuma):
+    # puan_sonuclari'ndaki max_okuma normalizasyonunu tek satıra yeniden
+    # uygular (max_okuma değiştiğinde kişiyi baştan puanlamadan)
+    norm_factor = math.log1p(satir["TOPLAM_OKUMA"]) / math.log1p(max(1, max_okuma))
+    final_puan = puan_yuvarlak * norm_factor
+    return {
+        **satir,
+        "PUAN": round(final_puan, 2),
+        "GENEL_PUAN": round(final_puan, 2),
+        "PUAN_AÇIKLAMA": f"Puan log(norm) ile çarpıldı. (Norm: {round(norm_factor, 2)})",
+    }
+
+def puan_sonuclari(ozet, kullanici_adlari, max_okuma=None):
+    # kisi_ozeti çıktısından analiz satırları; max_okuma verilmezse bütün
+    # kişiler üzerinden (kişiler parti parti puanlanıyorsa dışarıdan verilir)
+    toplam_okuma = ozet["toplam_okuma"]
+    puan = ozet["puan"]
+    if len(toplam_okuma) == 0:
+        return []
+    kategori = kategori_indeksleri(puan)
+    max_okuma = max(1, toplam_okuma.max() if max_okuma is None else max_okuma)
+    norm_factor = _math_uygula(math.log1p, toplam_okuma) / math.log1p(max_okuma)
+
+    toplam_liste = toplam_okuma.tolist()
+    normal_liste = ozet["toplam_normal"].tolist()
+    bolgeler = ozet["bolge"]
+    bolge_katsayi = ozet["bolge_katsayi"]
+    duzenlilik = ozet["duzenlilik"]
+    aktif_gun = ozet["aktif_gun"]
+    analiz_sonuc = []
+    for i, ad_soyad in enumerate(ozet["ad"]):
+        puan_yuvarlak = round(float(puan[i]), 2)
+        final_puan = puan_yuvarlak * float(norm_factor[i])
+        kat, arti, eksik = _KATEGORILER[kategori[i]]
+        analiz_sonuc.append({
+            "KULLANICI_ADI": kullanici_adi_veya_tire(kullanici_adlari[i]),
+            "AD_SOYAD": ad_soyad,
+            "BOLGE": bolgeler[i],
+            "TOPLAM_OKUMA": toplam_liste[i],
+            "NORMAL_OKUMA": normal_liste[i],
+            "BOLGE_KATSAYI": float(bolge_katsayi[i]),
+            "PUAN": round(final_puan, 2),
+            "KATEGORI": kat,
+            "ARTI_YONLER": arti,
+            "EKSIK_YONLER": eksik,
+            "DUZENLILIK_PUANI": round(float(duzenlilik[i]) * 100, 2),
+            "GENEL_PUAN": round(final_puan, 2),
+            "AKTIF_GUN": int(aktif_gun[i]),
+            "PUAN_AÇIKLAMA": f"Puan log(norm) ile çarpıldı. (Norm: {round(float(norm_factor[i]), 2)})"
+        })
+    return analiz_sonuc
+
+def personel_karsilastirma_analizi_vektorel(
+    df: pd.DataFrame,
+    gun_sayisi: int,
+    bolge_ortalamalari: dict,
+    max_okuma=None
+) -> list:
+    if df.empty:
+        return []
+    ozet, kullanici_adlari = personel_ozeti(df, bolge_ortalamalari)
+    return puan_sonuclari(ozet, kullanici_adlari, max_okuma)
+
+def personel_ozeti(df, bolge_ortalamalari):
+    # kisi_ozeti ve kişilerin ilk kayıtlarındaki kullanıcı adları
+    cerceve = puanlama_cercevesi(df)
+    gruplar = cerceve.groupby("AD_SOYAD", sort=False, dropna=False, observed=True)
+    # Kişinin ilk kaydı (KULLANICI_ADI ve BOLGE buradan alınır)
+    ilk_satirlar = df.loc[gruplar.head(1).index]
+    bolgeler = _sutun(ilk_satirlar, "BOLGE", "").tolist()
+    ozet = kisi_ozeti(cerceve, bolgeler, bolge_ortalamalari, gruplar)
+    return ozet, _sutun(ilk_satirlar, "KULLANICI_ADI", None).tolist()
+
+# --- Filtreleme (sütunlu) ---
+def filtrele_cerceve(df, ilk_tarih=None, son_tarih=None, ilce=None):
+    # ilk_tarih / son_tarih gün numarası (tarih_ordinal) olarak verilir
+    if df.empty:
+        return df
+    maske = np.ones(len(df), dtype=bool)
+    if ilk_tarih is not None or son_tarih is not None:
+        gunler = tarih_ordinalleri(df).to_numpy()
+        if ilk_tarih is not None:
+            maske &= gunler >= ilk_tarih
+        if son_tarih is not None:
+            maske &= gunler <= son_tarih
+    if ilce:
+        # Satır kimlikleri sorgudan önce alınır (veride ilk kez geçen adlar)
+        kimlikler = ilce_kimlikleri(df)
+        maske &= kimlikler == sorgu_kimligi(ILCE_KAYDI, ilce)
+    return df[maske]
+
+def ilce_kimlikleri(df):
+    # Depodan gelen çerçevelerde ILCE_ID hazır; diğerlerinde (API) farklı
+    # ilçe adı başına bir kez kayıttan bakılır
+    if "ILCE_ID" in df.columns:
+        return df["ILCE_ID"].to_numpy()
+    ilceler = _sutun(df, "ILCE", "")
+    esleme = {i: ILCE_KAYDI.kimlik(i) for i in ilceler.unique()}
+    return ilceler.map(esleme).fillna(BOS).to_numpy(dtype=int)
+
+def min_normal_filtrele(df, normal_okuma_min):
+    if df.empty or "NORMAL_OKUMA" not in df.columns:
+        return df if normal_okuma_min <= 0 else df.iloc[0:0]
+    return df[df["NORMAL_OKUMA"].fillna(0) >= normal_okuma_min]
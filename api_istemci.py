@@ -0,0 +1,139 @@
+import asyncio
+import os
+from datetime import date, timedelta
+
+from tarih_yardimci import tarih_donustur, tarih_ordinal
+
+BASE_API_URL = os.environ.get("BASE_API_URL", "")
+
+# ------------------ DIŞ API İSTEMCİSİ ------------------
+class OkumaApiIstemcisi:
+    """Dış okuma API'si için paylaşılan, bağlantı havuzlu async istemci.
+
+    Geniş tarih aralıkları parca_gun günlük parçalara bölünür ve en fazla
+    eszamanli istek aynı anda gönderilir. Aynı parça için devam eden bir
+    istek varsa yenisi açılmaz, sonucu beklenir. sayfa_boyutu verilirse her
+    parça sayfa sayfa çekilir.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        parca_gun=7,
+        eszamanli=4,
+        zaman_asimi=30.0,
+        dogrula=False,
+        max_baglanti=20,
+        sayfa_boyutu=None,
+    ):
+        self.base_url = base_url
+        self.parca_gun = parca_gun
+        self.eszamanli = eszamanli
+        self.zaman_asimi = zaman_asimi
+        self.dogrula = dogrula
+        self.max_baglanti = max_baglanti
+        self.sayfa_boyutu = sayfa_boyutu
+        self._istemci = None
+        self._semafor = None
+        self._ucusta = {}
+        self.istek_sayisi = 0
+        self.birlestirilen_istek = 0
+
+    def _hazirla(self):
+        # İstemci ve semafor ilk kullanıldıkları olay döngüsüne bağlanır
+        if self._istemci is None:
+            # httpx yalnızca dış API kullanılıyorsa yüklenir
+            import httpx
+            self._istemci = httpx.AsyncClient(
+                timeout=self.zaman_asimi,
+                verify=self.dogrula,
+                limits=httpx.Limits(
+                    max_connections=self.max_baglanti,
+                    max_keepalive_connections=self.max_baglanti,
+                ),
+            )
+            self._semafor = asyncio.Semaphore(self.eszamanli)
+
+    async def kapat(self):
+        if self._istemci is not None:
+            await self._istemci.aclose()
+            self._istemci = None
+            self._semafor = None
+
+    def parcalara_bol(self, ilk_tarih, son_tarih):
+        ilk, son = tarih_ordinal(ilk_tarih), tarih_ordinal(son_tarih)
+        if ilk is None or son is None:
+            raise ValueError("Tarihler YYYY-AA-GG biçiminde olmalı.")
+        baslangic, bitis = date.fromordinal(ilk), date.fromordinal(son)
+        parcalar = []
+        while baslangic <= bitis:
+            parca_sonu = min(baslangic + timedelta(days=self.parca_gun - 1), bitis)
+            parcalar.append((baslangic.isoformat(), parca_sonu.isoformat()))
+            baslangic = parca_sonu + timedelta(days=1)
+        return parcalar
+
+    async def okumalari_getir(self, ilk_tarih, son_tarih):
+        if not self.base_url:
+            raise RuntimeError("BASE_API_URL tanımlı değil.")
+        self._hazirla()
+        parcalar = self.parcalara_bol(ilk_tarih, son_tarih)
+        sonuclar = await asyncio.gather(*(self._parca_getir(ilk, son) for ilk, son in parcalar))
+        veriler = []
+        for parca in sonuclar:
+            veriler.extend(parca)
+        return veriler
+
+    async def _parca_getir(self, ilk_tarih, son_tarih):
+        anahtar = (ilk_tarih, son_tarih)
+        gorev = self._ucusta.get(anahtar)
+        if gorev is not None:
+            self.birlestirilen_istek += 1
+        else:
+            gorev = asyncio.ensure_future(self._parca_indir(ilk_tarih, son_tarih))
+            self._ucusta[anahtar] = gorev
+            gorev.add_done_callback(lambda _: self._ucusta.pop(anahtar, None))
+        # Bekleyenlerden biri iptal edilirse ortak istek iptal olmasın
+        return await asyncio.shield(gorev)
+
+    async def _parca_indir(self, ilk_tarih, son_tarih):
+        params = {"ilkTarih": ilk_tarih, "sonTarih": son_tarih}
+        if not self.sayfa_boyutu:
+            return await self._istek(params)
+        veriler = []
+        sayfa = 1
+        while True:
+            sayfa_verisi = await self._istek({**params, "sayfa": sayfa, "sayfaBoyutu": self.sayfa_boyutu})
+            veriler.extend(sayfa_verisi)
+            if len(sayfa_verisi) < self.sayfa_boyutu:
+                return veriler
+            sayfa += 1
+
+    async def _istek(self, params):
+        async with self._semafor:
+            self.istek_sayisi += 1
+            response = await self._istemci.get(self.base_url, params=params)
+        response.raise_for_status()
+        veriler = response.json()
+        for v in veriler:
+            if "TARIH" in v:
+                v["TARIH"] = tarih_donustur(v["TARIH"])
+        return veriler
+
+    def istatistikler(self):
+        return {
+            "istek_sayisi": self.istek_sayisi,
+            "birlestirilen_istek": self.birlestirilen_istek,
+            "ucustaki_parca": len(self._ucusta),
+        }
+
+def _sayi_ortami(ad, varsayilan):
+    deger = os.environ.get(ad)
+    return int(deger) if deger else varsayilan
+
+api_istemcisi = OkumaApiIstemcisi(
+    BASE_API_URL,
+    parca_gun=_sayi_ortami("API_PARCA_GUN", 7),
+    eszamanli=_sayi_ortami("API_ESZAMANLI", 4),
+    dogrula=os.environ.get("API_SSL_DOGRULA", "0") == "1",
+    sayfa_boyutu=_sayi_ortami("API_SAYFA_BOYUTU", None),
+)
@@ -0,0 +1,301 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# /analiz hattının aşamalarını sentetik veriyle ölçer ve sürümler arasında
+# karşılaştırılabilecek bir JSON raporu yazar.
+#   yukleme : dosyadan DataFrame (pd.read_csv / pd.read_excel)
+#   tarih   : TARIH değerlerinin ISO biçimine çevrilmesi
+#   kimlik  : ILCE_ID / BOLGE_ID sütunları
+#   kayit   : DataFrame -> sözlük listesi (yalnızca klasik motor)
+#   filtre  : tarih aralığı + ilçe + min. normal okuma
+#   grup    : kişi bazında gruplama tek başına
+#   puan    : analiz fonksiyonunun tamamı (kendi gruplamasını da yapar)
+#   sirala  : PUAN'a göre sıralama
+#   json    : json_tiplerine + HizliJSONResponse gövdesi (orjson varsa onunla)
+# Ayrıca hesapla_puan (tek çağrı) ve en çok kaydı olan kişi için
+# default_karakter_karsilastirma süreleri raporlanır.
+#
+#   python -m benchmark.analiz_hizi --satirlar 10000 100000 1000000 --cikti analiz.json
+#   python -m benchmark.analiz_hizi --cikti yeni.json --onceki analiz.json
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KOK)
+
+AYLAR = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+         "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+ILCELER = ["EDREMİT", "KARESİ", "ALTIEYLÜL", "BANDIRMA"]
+ILK_GUN = date(2025, 6, 1)
+
+def sentetik_okumalar(satir_sayisi, personel_sayisi=500, gun_sayisi=30, tohum=42):
+    """Sentetik okuma satırları (DataFrame).
+
+    Her personel sabit bir bölgeye atanır; bölgeler BOLGE_KATSAYI_DETAYLI.json
+    dosyasından gelir. Zor bölgelerde (yüksek katsayı) günlük okuma daha
+    düşüktür. Tarihlerin çoğu '13-Haziran-2025', bir kısmı ISO biçimindedir.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rnd = np.random.default_rng(tohum)
+    with open(os.path.join(KOK, "BOLGE_KATSAYI_DETAYLI.json"), "r", encoding="utf-8") as f:
+        katsayilar = {b: v["katsayi"] for b, v in json.load(f).items()}
+    bolgeler = list(katsayilar)
+
+    personel_bolge = rnd.integers(0, len(bolgeler), personel_sayisi)
+    personel_kapasite = rnd.uniform(0.7, 1.3, personel_sayisi) / (0.5 + np.array(
+        [katsayilar[bolgeler[b]] for b in personel_bolge]))
+    kisi = rnd.integers(0, personel_sayisi, satir_sayisi)
+    gun = rnd.integers(0, gun_sayisi, satir_sayisi)
+
+    normal = np.maximum(rnd.normal(180, 50, satir_sayisi) * personel_kapasite[kisi], 0).astype(int)
+    diger = np.maximum(rnd.normal(70, 25, satir_sayisi), 0).astype(int)
+
+    tarih_metinleri = []
+    for g in range(gun_sayisi):
+        t = ILK_GUN + timedelta(days=g)
+        tarih_metinleri.append((f"{t.day:02d}-{AYLAR[t.month - 1]}-{t.year}", t.isoformat()))
+    iso = rnd.random(satir_sayisi) < 0.1
+    tarihler = [tarih_metinleri[g][i] for g, i in zip(gun.tolist(), iso.tolist())]
+
+    bolge_adlari = np.array(bolgeler, dtype=object)[personel_bolge[kisi]]
+    ilce_adlari = np.array(ILCELER, dtype=object)[personel_bolge[kisi] % len(ILCELER)]
+    return pd.DataFrame({
+        "ILCE": ilce_adlari,
+        "BOLGE": bolge_adlari,
+        "AD_SOYAD": [f"PERSONEL {k}" for k in kisi.tolist()],
+        "KULLANICI_ADI": [f"kullanici{k}" for k in kisi.tolist()],
+        "TARIH": tarihler,
+        "NORMAL_OKUMA": normal,
+        "DIGER": diger,
+        "TOPLAM_OKUMA": normal + diger,
+        "DEFTER_ID": rnd.integers(1, 1000, satir_sayisi),
+    })
+
+class Kronometre:
+    def __init__(self):
+        self.asamalar = {}
+
+    def olc(self, ad, fonksiyon, *args, **kwargs):
+        baslangic = time.perf_counter()
+        sonuc = fonksiyon(*args, **kwargs)
+        self.asamalar[ad] = round(time.perf_counter() - baslangic, 6)
+        return sonuc
+
+def _oku(yol):
+    import pandas as pd
+    if yol.endswith(".csv"):
+        return pd.read_csv(yol)
+    return pd.read_excel(yol)
+
+def _tarihleri_cevir(df):
+    from tarih_yardimci import _metin_ordinal, tarih_donustur
+    _metin_ordinal.cache_clear()  # önceki ölçümlerin önbelleği kullanılmasın
+    donusum = {t: tarih_donustur(t) for t in df["TARIH"].dropna().unique()}
+    df["TARIH"] = df["TARIH"].map(donusum)
+    return df
+
+def _json_govdesi(analiz_sonuc):
+    from json_yanit import HizliJSONResponse, json_tiplerine
+    return HizliJSONResponse(content=json_tiplerine({"analiz_sonucu": analiz_sonuc})).body
+
+def klasik_hat(yol, ilk_gun, son_gun, ilce, normal_okuma_min):
+    from collections import defaultdict
+    from analiz_fonksiyonlar import (
+        BOLGE_KATSAYILARI,
+        default_karakter_karsilastirma,
+        filtrele_veri_ilce_veya_bolge,
+        personel_karsilastirma_analizi,
+    )
+    from isim_kayit import kimlik_sutunlari_ekle
+    from tarih_yardimci import tarih_ordinal
+
+    k = Kronometre()
+    df = k.olc("yukleme", _oku, yol)
+    k.olc("tarih", _tarihleri_cevir, df)
+    k.olc("kimlik", kimlik_sutunlari_ekle, df)
+    veriler = k.olc("kayit", df.to_dict, orient="records")
+
+    def filtrele(veriler):
+        # main.analiz_hesapla ile aynı sıra (main içe aktarılmıyor: veritabanını açar)
+        veriler = [v for v in veriler if ilk_gun <= (tarih_ordinal(v.get("TARIH")) or 0) <= son_gun]
+        if ilce:
+            veriler = filtrele_veri_ilce_veya_bolge(veriler, ilce=ilce)
+        return [v for v in veriler if (v.get("NORMAL_OKUMA") or 0) >= normal_okuma_min]
+    filtrelenmis = k.olc("filtre", filtrele, veriler)
+
+    def grupla(veriler):
+        grouped = defaultdict(list)
+        for v in veriler:
+            grouped[v.get("AD_SOYAD", "")].append(v)
+        return grouped
+    gruplar = k.olc("grup", grupla, filtrelenmis)
+
+    gun_sayisi = len({v["TARIH"] for v in filtrelenmis})
+    sonuc = k.olc("puan", personel_karsilastirma_analizi, filtrelenmis, gun_sayisi, BOLGE_KATSAYILARI)
+    k.olc("sirala", sonuc.sort, key=lambda x: x["PUAN"], reverse=True)
+    k.olc("json", _json_govdesi, sonuc)
+    if gruplar:
+        en_buyuk = max(gruplar.values(), key=len)
+        k.olc("default", default_karakter_karsilastirma, en_buyuk)
+    return k.asamalar, len(filtrelenmis), len(sonuc)
+
+def vektorel_hat(yol, ilk_gun, son_gun, ilce, normal_okuma_min):
+    from analiz_fonksiyonlar import BOLGE_KATSAYILARI
+    from analiz_vektorel import (
+        filtrele_cerceve,
+        min_normal_filtrele,
+        personel_karsilastirma_analizi_vektorel,
+        tarih_ordinalleri,
+    )
+    from isim_kayit import kimlik_sutunlari_ekle
+
+    k = Kronometre()
+    df = k.olc("yukleme", _oku, yol)
+    k.olc("tarih", _tarihleri_cevir, df)
+    k.olc("kimlik", kimlik_sutunlari_ekle, df)
+    filtrelenmis = k.olc(
+        "filtre", lambda: min_normal_filtrele(filtrele_cerceve(df, ilk_gun, son_gun, ilce), normal_okuma_min)
+    )
+
+    def grupla(df):
+        cerceve = df[["AD_SOYAD", "TOPLAM_OKUMA", "NORMAL_OKUMA"]].assign(TARIH_ORD=tarih_ordinalleri(df))
+        return cerceve.groupby("AD_SOYAD", sort=False, dropna=False).agg(
+            toplam_okuma=("TOPLAM_OKUMA", "sum"),
+            toplam_normal=("NORMAL_OKUMA", "sum"),
+            aktif_gun=("TARIH_ORD", "nunique"),
+        )
+    k.olc("grup", grupla, filtrelenmis)
+
+    gun_sayisi = filtrelenmis["TARIH"].nunique()
+    sonuc = k.olc(
+        "puan", personel_karsilastirma_analizi_vektorel, filtrelenmis, gun_sayisi, BOLGE_KATSAYILARI
+    )
+    k.olc("sirala", sonuc.sort, key=lambda x: x["PUAN"], reverse=True)
+    k.olc("json", _json_govdesi, sonuc)
+    return k.asamalar, len(filtrelenmis), len(sonuc)
+
+HATLAR = {"klasik": klasik_hat, "vektorel": vektorel_hat}
+
+def hesapla_puan_olc(tekrar=100000):
+    from analiz_fonksiyonlar import hesapla_puan
+    baslangic = time.perf_counter()
+    for i in range(tekrar):
+        hesapla_puan(180 + i % 50, 260 + i % 90, 250.0, 0.54, 12, 19)
+    return round((time.perf_counter() - baslangic) / tekrar * 1e6, 3)
+
+def _orjson_surumu():
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson.__version__
+
+def _surum_bilgisi():
+    import numpy as np
+    import pandas as pd
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=KOK, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "zaman": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "orjson": _orjson_surumu(),
+        "platform": platform.platform(),
+    }
+
+def karsilastir(onceki, yeni):
+    # Aynı (satır, motor, aşama) için yeni / önceki süre oranı
+    eski = {(s["satir"], s["motor"]): s["asamalar"] for s in onceki["sonuclar"]}
+    for s in yeni["sonuclar"]:
+        eski_asamalar = eski.get((s["satir"], s["motor"]))
+        if not eski_asamalar:
+            continue
+        for asama, sure in s["asamalar"].items():
+            if eski_asamalar.get(asama):
+                oran = sure / eski_asamalar[asama]
+                isaret = "  <-- yavaşladı" if oran > 1.2 else ""
+                print(f"{s['satir']:>9} {s['motor']:<9} {asama:<8} {eski_asamalar[asama]:>9.4f} -> {sure:>9.4f} sn  x{oran:.2f}{isaret}")
+
+def main():
+    parser = argparse.ArgumentParser(description="/analiz hattı aşama süreleri")
+    parser.add_argument("--satirlar", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--personel", type=int, default=500)
+    parser.add_argument("--gun", type=int, default=30)
+    parser.add_argument("--motorlar", nargs="+", choices=list(HATLAR), default=list(HATLAR))
+    parser.add_argument("--bicim", choices=["csv", "xlsx"], default="csv",
+                        help="Sentetik dosya biçimi (xlsx büyük boyutlarda çok yavaş yazılır)")
+    parser.add_argument("--ilce", help="İlçe filtresi (ör. EDREMİT)")
+    parser.add_argument("--normal-okuma-min", type=int, default=0)
+    parser.add_argument("--tekrar", type=int, default=1, help="Her ölçüm kaç kez; en hızlısı raporlanır")
+    parser.add_argument("--tohum", type=int, default=42)
+    parser.add_argument("--cikti", help="Raporun yazılacağı JSON dosyası")
+    parser.add_argument("--onceki", help="Karşılaştırılacak önceki rapor")
+    args = parser.parse_args()
+
+    # Analiz aralığı: ilk ve son gün dışarıda kalır, böylece filtre gerçekten çalışır
+    ilk_gun = (ILK_GUN + timedelta(days=1)).toordinal()
+    son_gun = (ILK_GUN + timedelta(days=max(args.gun - 2, 1))).toordinal()
+
+    # İçe aktarma maliyeti ilk ölçüme yansımasın
+    import analiz_vektorel  # noqa: F401
+    _json_govdesi([])
+
+    rapor = {
+        "surum": _surum_bilgisi(),
+        "parametreler": {k: v for k, v in vars(args).items() if k not in ("cikti", "onceki")},
+        "hesapla_puan_us": hesapla_puan_olc(),
+        "sonuclar": [],
+    }
+    with tempfile.TemporaryDirectory() as klasor:
+        for satir_sayisi in args.satirlar:
+            yol = os.path.join(klasor, f"okumalar_{satir_sayisi}.{args.bicim}")
+            df = sentetik_okumalar(satir_sayisi, args.personel, args.gun, args.tohum)
+            if args.bicim == "csv":
+                df.to_csv(yol, index=False)
+            else:
+                df.to_excel(yol, index=False)
+            del df
+            for motor in args.motorlar:
+                en_iyi = None
+                for _ in range(args.tekrar):
+                    asamalar, filtrelenmis, kisi = HATLAR[motor](
+                        yol, ilk_gun, son_gun, args.ilce, args.normal_okuma_min
+                    )
+                    if en_iyi is None:
+                        en_iyi = asamalar
+                    else:
+                        en_iyi = {a: min(en_iyi[a], s) for a, s in asamalar.items()}
+                toplam = round(sum(s for a, s in en_iyi.items() if a != "default"), 6)
+                rapor["sonuclar"].append({
+                    "satir": satir_sayisi,
+                    "motor": motor,
+                    "filtrelenmis_satir": filtrelenmis,
+                    "personel": kisi,
+                    "asamalar": en_iyi,
+                    "toplam_sn": toplam,
+                })
+                ozet = "  ".join(f"{a}={s:.3f}" for a, s in en_iyi.items())
+                print(f"{satir_sayisi:>9} satır  {motor:<9} toplam={toplam:.3f} sn  {ozet}")
+
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            json.dump(rapor, f, ensure_ascii=False, indent=2)
+    if args.onceki:
+        with open(args.onceki, "r", encoding="utf-8") as f:
+            karsilastir(json.load(f), rapor)
+
+if __name__ == "__main__":
+    main()
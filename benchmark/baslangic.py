@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Soğuk başlangıç süreleri. Her ölçüm yeni bir süreçte yapılır:
+#   ice_aktarma : "import main" (pandas/numpy yüklenmiş mi, ayrıca raporlanır)
+#   hazir       : içe aktarma + lifespan başlangıcı (init_db)
+#   ilk_yanit   : hazir + ilk isteğin yanıtı (varsayılan /analiz)
+# Isınma açık ve kapalı ayrı ölçülür. Sunucu hazır olur olmaz ilk isteği
+# aldığında en kötü durum budur; --bekle ile ilk istekten önce beklenebilir.
+#
+#   python -m benchmark.baslangic --tekrar 5 --cikti baslangic.json
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def olc(isinma, yol, bekle):
+    os.environ["BASLANGIC_ISINMA"] = isinma
+    sys.path.insert(0, KOK)
+    baslangic = time.perf_counter()
+    import main
+    ice_aktarma = time.perf_counter() - baslangic
+    pandas_yuklu = "pandas" in sys.modules
+    # TestClient httpx'i yükler; içe aktarma ölçümünden sonra alınır
+    from fastapi.testclient import TestClient
+    with TestClient(main.app) as istemci:
+        hazir = time.perf_counter() - baslangic
+        time.sleep(bekle)
+        istek_baslangici = time.perf_counter()
+        yanit = istemci.get(yol)
+        ilk_yanit = time.perf_counter() - baslangic
+        ilk_istek = time.perf_counter() - istek_baslangici
+    print(json.dumps({
+        "isinma": isinma == "1",
+        "yol": yol,
+        "durum": yanit.status_code,
+        "ice_aktarma_sn": round(ice_aktarma, 4),
+        "pandas_ice_aktarmada": pandas_yuklu,
+        "hazir_sn": round(hazir, 4),
+        "ilk_yanit_sn": round(ilk_yanit - bekle, 4),
+        "ilk_istek_sn": round(ilk_istek, 4),
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description="Soğuk başlangıç süreleri")
+    parser.add_argument("--yol", default="/analiz", help="İlk istek")
+    parser.add_argument("--tekrar", type=int, default=3, help="Her ayar kaç yeni süreçte; medyan raporlanır")
+    parser.add_argument("--bekle", type=float, default=0.0, help="Hazır olduktan sonra ilk istekten önce (sn)")
+    parser.add_argument("--cikti", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--olc", nargs=3, metavar=("ISINMA", "YOL", "BEKLE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.olc:
+        isinma, yol, bekle = args.olc
+        olc(isinma, yol, float(bekle))
+        return
+
+    sonuclar = []
+    for isinma in ("0", "1"):
+        olcumler = []
+        for _ in range(args.tekrar):
+            cikti = subprocess.run(
+                [sys.executable, "-m", "benchmark.baslangic", "--olc", isinma, args.yol, str(args.bekle)],
+                cwd=KOK, capture_output=True, text=True, check=True,
+            ).stdout.strip().splitlines()[-1]
+            olcumler.append(json.loads(cikti))
+        sonuc = dict(olcumler[0])
+        for alan in ("ice_aktarma_sn", "hazir_sn", "ilk_yanit_sn", "ilk_istek_sn"):
+            sonuc[alan] = round(statistics.median(o[alan] for o in olcumler), 4)
+        sonuclar.append(sonuc)
+        print(
+            f"isinma={isinma}  ice_aktarma={sonuc['ice_aktarma_sn']:.3f} sn  hazir={sonuc['hazir_sn']:.3f} sn  "
+            f"ilk_yanit={sonuc['ilk_yanit_sn']:.3f} sn  ({sonuc['yol']} {sonuc['ilk_istek_sn']:.3f} sn)"
+        )
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            json.dump(sonuclar, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
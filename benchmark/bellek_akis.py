@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Akışlı okuma ile tüm Excel'i DataFrame + sözlük listesine çevirmenin tepe
+# bellek (RSS) kullanımını satır sayısına göre karşılaştırır. Her ölçüm ayrı
+# bir süreçte yapılır; ru_maxrss süreç başına tutulduğu için sonuçlar
+# birbirini etkilemez.
+#   pandas : excel_oku(...).to_dict(orient="records")
+#   akisli : yalnızca parti parti okuma (veritabanı aktarımını besleyen yol)
+#   ozet   : akışlı okuma + gunluk_ozet_kayitlari (kişi x gün kadar bellek)
+#
+#   python -m benchmark.bellek_akis --satirlar 10000 50000 100000 --cikti bellek.json
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AYLAR = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+         "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+def ornek_excel_yaz(yol, satir_sayisi, personel_sayisi=500, tohum=42):
+    from openpyxl import Workbook
+    rnd = random.Random(tohum)
+    with open(os.path.join(KOK, "BOLGE_KATSAYI_DETAYLI.json"), "r", encoding="utf-8") as f:
+        bolgeler = list(json.load(f))
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["ILCE", "BOLGE", "AD_SOYAD", "TARIH", "ILK_OKUMA", "SON_OKUMA",
+               "NORMAL_OKUMA", "DIGER", "TOPLAM_OKUMA", "DEFTER_ID"])
+    for _ in range(satir_sayisi):
+        p = rnd.randrange(personel_sayisi)
+        normal = rnd.randint(80, 300)
+        diger = rnd.randint(20, 120)
+        ws.append([
+            "EDREMİT", bolgeler[p % len(bolgeler)], f"PERSONEL {p}",
+            f"{rnd.randint(1, 28):02d}-{rnd.choice(AYLAR)}-2025", "09:00:00", "17:30:00",
+            normal, diger, normal + diger, rnd.randint(1, 999),
+        ])
+    wb.save(yol)
+
+def olc(yontem, yol):
+    sys.path.insert(0, KOK)
+    baslangic = time.perf_counter()
+    if yontem == "pandas":
+        from veri_deposu import excel_oku
+        kayitlar = excel_oku(yol).to_dict(orient="records")
+        adet = len(kayitlar)
+    else:
+        from akisli_okuma import dosya_partileri, gunluk_ozet_kayitlari
+        adet = 0
+
+        def say(partiler):
+            nonlocal adet
+            for parti in partiler:
+                adet += len(parti)
+                yield parti
+
+        if yontem == "ozet":
+            gunluk_ozet_kayitlari(say(dosya_partileri(yol)))
+        else:
+            for _ in say(dosya_partileri(yol)):
+                pass
+    sure = time.perf_counter() - baslangic
+    # Linux'ta ru_maxrss KB cinsindendir
+    tepe_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"yontem": yontem, "satir": adet, "sure_sn": round(sure, 3), "tepe_rss_mb": round(tepe_mb, 1)}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Akışlı okuma bellek karşılaştırması")
+    parser.add_argument("--satirlar", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--cikti", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--olc", nargs=2, metavar=("YONTEM", "DOSYA"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.olc:
+        olc(*args.olc)
+        return
+
+    sonuclar = []
+    with tempfile.TemporaryDirectory() as klasor:
+        for satir_sayisi in args.satirlar:
+            yol = os.path.join(klasor, f"okumalar_{satir_sayisi}.xlsx")
+            ornek_excel_yaz(yol, satir_sayisi)
+            for yontem in ("pandas", "akisli", "ozet"):
+                cikti = subprocess.run(
+                    [sys.executable, "-m", "benchmark.bellek_akis", "--olc", yontem, yol],
+                    cwd=KOK, capture_output=True, text=True, check=True,
+                ).stdout.strip().splitlines()[-1]
+                sonuc = json.loads(cikti)
+                sonuclar.append(sonuc)
+                print(f"{satir_sayisi:>9} satır  {yontem:<7} {sonuc['tepe_rss_mb']:>8.1f} MB  {sonuc['sure_sn']:>7.2f} sn")
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            json.dump(sonuclar, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
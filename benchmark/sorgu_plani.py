@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Rapor sorgularının EXPLAIN QUERY PLAN çıktısını denetler. Sorgular
+# veritabani.py'deki fonksiyonlar çalıştırılarak, gönderdikleri SQL ve
+# parametrelerle yakalanır. Tablonun bütün satırlarını okuyan bir plan
+# ("SCAN okumalar", "SCAN gunluk_ozet USING INDEX ...") varsa çıkış kodu 1
+# olur; kaplayan indeks taraması ("SCAN ... USING COVERING INDEX") kabul
+# edilir. Örnek tarih, ilçe ve kullanıcı veritabanındaki verilerden seçilir.
+#
+#   python -m benchmark.sorgu_plani
+#   python -m benchmark.sorgu_plani --ayrinti --cikti planlar.json
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KOK)
+
+def ornek_degerler():
+    from sqlalchemy import text
+    from veritabani import engine
+
+    with engine.connect() as conn:
+        ilk, son = conn.execute(text("SELECT MIN(date(tarih)), MAX(date(tarih)) FROM okumalar")).one()
+        ilce = conn.execute(text("SELECT ilce FROM okumalar WHERE ilce IS NOT NULL LIMIT 1")).scalar()
+        kullanici = conn.execute(
+            text("SELECT kullanici_adi FROM okumalar WHERE kullanici_adi IS NOT NULL LIMIT 1")
+        ).scalar()
+        ad_soyad = conn.execute(text("SELECT ad_soyad FROM okumalar WHERE ad_soyad IS NOT NULL LIMIT 1")).scalar()
+        defter = conn.execute(text("SELECT defter_id FROM okumalar WHERE defter_id IS NOT NULL LIMIT 1")).scalar()
+        son_id = conn.execute(text("SELECT IFNULL(MAX(id), 0) FROM okumalar")).scalar()
+    return {
+        "ilk": ilk, "son": son, "ilce": ilce, "kullanici": kullanici,
+        "ad_soyad": ad_soyad, "defter": defter, "son_id": son_id,
+    }
+
+def rapor_sorgulari(d):
+    import veritabani as v
+    from veritabani import SessionLocal
+
+    def oturumla(ifade):
+        def calistir():
+            oturum = SessionLocal()
+            try:
+                oturum.execute(ifade).all()
+            finally:
+                oturum.close()
+        return calistir
+
+    # Kısa bir aralık: raporlar genellikle gün/hafta seçer
+    ilk, son = d["ilk"], d["ilk"]
+    ilceler = [d["ilce"]]
+    kullanicilar = [d["kullanici"]]
+    return {
+        "filtre_alanlari_ilce": oturumla(v.ILCE_LISTESI),
+        "filtre_alanlari_kullanici": oturumla(v.KULLANICI_LISTESI),
+        "bolge_toplamlari_tam": lambda: v.bolge_toplamlari(0),
+        "bolge_toplamlari_artimli": lambda: v.bolge_toplamlari(max(0, d["son_id"] - 100)),
+        "kullanici_adlari_tarih": lambda: v.kullanici_adlari_sorgula(ilk, son),
+        "kullanici_adlari_tarih_ilce": lambda: v.kullanici_adlari_sorgula(ilk, son, ilceler),
+        "kullanici_adlari_eslesen": lambda: v.kullanici_adlari_eslesen(d["kullanici"]),
+        "okumalar_tarih_ilce": lambda: v.okumalari_sorgula(ilk, son, ilceler, 1),
+        "okumalar_kullanici": lambda: v.okumalari_sorgula(None, None, None, 1, kullanicilar),
+        "okumalar_kullanici_tarih": lambda: v.okumalari_sorgula(ilk, son, None, 1, kullanicilar),
+        "ozet_tarih": lambda: v.ozet_sorgula(ilk, son),
+        "ozet_tarih_ilce": lambda: v.ozet_sorgula(ilk, son, ilceler),
+        "ozet_kullanici": lambda: v.ozet_sorgula(kullanici_adlari=kullanicilar),
+        "defter": lambda: v.defter_okumalari(d["defter"]),
+        "canli_degisen_kisiler": lambda: v.degisen_kisiler(max(0, d["son_id"] - 100), d["son_id"]),
+        "canli_kisi_kayitlari": lambda: v.kisilerin_kayitlari([d["ad_soyad"]]),
+        "canli_kisi_kayitlari_min_normal": lambda: v.kisilerin_kayitlari([d["ad_soyad"]], normal_okuma_min=1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapor sorgularının planlarını denetler")
+    parser.add_argument("--ayrinti", action="store_true", help="SQL ve plan satırlarını da yaz")
+    parser.add_argument("--cikti", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    from veritabani import init_db, okuma_var_mi, sorgu_planlari
+
+    init_db()
+    if not okuma_var_mi():
+        print("okumalar tablosu boş; planlar için önce veri aktarın (python veri_aktarim.py).")
+        return 2
+    sonuclar = []
+    tarama_var = False
+    for ad, calistir in rapor_sorgulari(ornek_degerler()).items():
+        baslangic = time.perf_counter()
+        planlar = sorgu_planlari(calistir)
+        sure = time.perf_counter() - baslangic
+        tam_tarama = any(p[2] for p in planlar)
+        tarama_var |= tam_tarama
+        satirlar = [s for _, plan, _ in planlar for s in plan]
+        print(f"{'TARAMA' if tam_tarama else 'ok':7} {ad:34} {sure * 1000:8.1f} ms  {' | '.join(satirlar)}")
+        if args.ayrinti:
+            for sql, plan, _ in planlar:
+                print("        " + " ".join(sql.split()))
+        sonuclar.append({
+            "sorgu": ad,
+            "tam_tarama": tam_tarama,
+            "sure_ms": round(sure * 1000, 2),
+            "planlar": [{"sql": " ".join(sql.split()), "plan": plan} for sql, plan, _ in planlar],
+        })
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            json.dump(sonuclar, f, ensure_ascii=False, indent=2)
+    return 1 if tarama_var else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
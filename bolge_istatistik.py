@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import threading
+
+from veritabani import bolge_toplamlari
+
+ORTALAMA_DOSYASI = "bolge_ortalamalari.json"
+
+# ------------------ BÖLGE ORTALAMALARI ------------------
+class BolgeIstatistikleri:
+    """Bölge bazında okuma toplamı/adedi; ortalamalar bunlardan hesaplanır.
+
+    Bellekteki toplamlar okumalar tablosunda en son görülen id'ye kadardır.
+    Her istekte yalnızca MAX(id) ve veri_durumu.sifirlama okunur; yeni okuma
+    varsa sadece id'si daha büyük satırlar toplanıp eklenir (başka süreçlerin
+    aktarımları da böylece görülür). Sıfırlama sayacı değiştiyse (ya da MAX(id)
+    geriye gittiyse) tablo boşaltılmıştır, toplamlar baştan kurulur.
+    Değişiklikten sonra bolge_ortalamalari.json atomik olarak yeniden yazılır.
+    """
+
+    def __init__(self, dosya=ORTALAMA_DOSYASI):
+        self.dosya = dosya
+        self._kilit = threading.Lock()
+        self._toplamlar = {}  # bolge -> [toplam_sum, toplam_adet, normal_sum, normal_adet]
+        self._son_id = 0
+        self._sifirlama = None
+        self._yuklendi = False
+        self._ortalamalar = {}
+        self.artimli_guncelleme = 0
+        self.yeniden_kurma = 0
+
+    def _ekle(self, satirlar):
+        for bolge, toplam_sum, toplam_adet, normal_sum, normal_adet in satirlar:
+            kayit = self._toplamlar.setdefault(bolge, [0, 0, 0, 0])
+            kayit[0] += toplam_sum or 0
+            kayit[1] += toplam_adet
+            kayit[2] += normal_sum or 0
+            kayit[3] += normal_adet
+
+    def _ortalamalari_hesapla(self):
+        # /ortalama-okuma'nın eski AVG ... GROUP BY bolge çıktısıyla aynı biçim
+        self._ortalamalar = {
+            bolge: {
+                "ortalama_toplam_okuma": round(t / ta if ta else 0, 2),
+                "ortalama_normal_okuma": round(n / na if na else 0, 2),
+            }
+            for bolge, (t, ta, n, na) in self._toplamlar.items() if bolge
+        }
+
+    def guncelle(self, yeniden_kur=False):
+        with self._kilit:
+            tam = yeniden_kur or not self._yuklendi
+            son_id = 0 if tam else self._son_id
+            sifirlama, yeni_son_id, satirlar = bolge_toplamlari(son_id)
+            if not tam and (sifirlama != self._sifirlama or yeni_son_id < son_id):
+                # Tablo boşaltılıp yeniden doldurulmuş (id'ler 1'den başlar;
+                # MAX(id) eskisine eşit ya da büyük olabilir)
+                tam = True
+                sifirlama, yeni_son_id, satirlar = bolge_toplamlari(0)
+            if not tam and not satirlar:
+                return self._ortalamalar
+            if tam:
+                self._toplamlar = {}
+                self.yeniden_kurma += 1
+            else:
+                self.artimli_guncelleme += 1
+            self._ekle(satirlar)
+            self._son_id = yeni_son_id
+            self._sifirlama = sifirlama
+            self._yuklendi = True
+            eski = self._ortalamalar
+            self._ortalamalari_hesapla()
+            if yeniden_kur or self._ortalamalar != eski:
+                self._dosyaya_yaz(self._ortalamalar)
+            return self._ortalamalar
+
+    def ortalamalar(self):
+        # Dönen sözlük paylaşılır; değiştirilmemeli
+        return self.guncelle()
+
+    def sifirla(self):
+        # Aynı süreçte okumalar tablosu boşaltıldığında
+        with self._kilit:
+            self._yuklendi = False
+
+    def _dosyaya_yaz(self, veri):
+        # Aynı klasörde geçici dosyaya yazıp os.replace ile değiştirir; okuyan
+        # taraf hiçbir zaman yarım yazılmış dosya görmez
+        klasor = os.path.dirname(os.path.abspath(self.dosya))
+        try:
+            fd, gecici = tempfile.mkstemp(dir=klasor, prefix=".bolge_ortalamalari.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(veri, f, ensure_ascii=False, indent=2)
+            os.replace(gecici, self.dosya)
+        except OSError as e:
+            print(f"Bölge ortalamaları yazılamadı: {e}")
+
+    def istatistikler(self):
+        return {
+            "bolge_sayisi": len(self._ortalamalar),
+            "son_okuma_id": self._son_id,
+            "sifirlama": self._sifirlama,
+            "artimli_guncelleme": self.artimli_guncelleme,
+            "yeniden_kurma": self.yeniden_kurma,
+        }
+
+bolge_istatistikleri = BolgeIstatistikleri()
@@ -0,0 +1,328 @@
+import asyncio
+import threading
+import time
+
+import anyio
+
+from analiz_fonksiyonlar import BOLGE_KATSAYILARI
+from analiz_vektorel import filtrele_cerceve, min_normal_filtrele, normalize_puan, personel_ozeti, puan_sonuclari
+from isim_kayit import normalize_ad
+from json_yanit import json_bayt, json_tiplerine
+from onbellek import veri_surumu
+from veri_deposu import okuma_deposu
+from veritabani import (
+    degisen_kisiler,
+    ilce_adlari_eslesen,
+    kisilerin_kayitlari,
+    okuma_durumu,
+    okumalari_sorgula,
+    ozet_sorgula,
+)
+from tembel_modul import tembel_modul
+
+pd = tembel_modul("pandas")
+
+# Panonun abone olduğu canlı personel sıralaması (/analiz-canli). Aynı
+# filtreyle bağlanan istemciler tek bir CanliSiralama'yı paylaşır; bir döngü
+# KONTROL_ARALIGI saniyede bir yeni okuma olup olmadığına bakar ve yalnızca
+# değişen satırları abonelere iter.
+#
+# Veritabanında okumalar id sırasıyla eklendiğinden son görülen id'den sonraki
+# okumaların kişileri yeniden puanlanır; bir kişinin puanı yalnızca kendi
+# satırlarına, bölge ortalamalarına ve kişi toplamlarının en büyüğüne
+# (max_okuma) bağlıdır. max_okuma büyürse diğer kişilerin normalizasyonu
+# yeniden puanlanmadan güncellenir. Excel ve dış API'de sıralama baştan
+# hesaplanıp öncekiyle karşılaştırılır. Tablo sıfırlandığında (veri_durumu
+# sayacı; aktarım başka bir süreçte yapılmış olabilir) ve TAM_YENILEME_SN'de
+# bir baştan kurulur.
+
+KONTROL_ARALIGI = 2.0
+KALP_ATISI_SN = 15.0
+TAM_YENILEME_SN = 300.0
+API_YENILEME_SN = 30.0
+KUYRUK_BOYUTU = 32
+
+def _anahtar(ad_soyad):
+    return ad_soyad if isinstance(ad_soyad, str) else None
+
+def sse_olayi(olay, veri, olay_no=None):
+    satirlar = [b"event: " + olay.encode()]
+    if olay_no is not None:
+        satirlar.append(b"id: %d" % olay_no)
+    satirlar.append(b"data: " + json_bayt(veri))
+    return b"\n".join(satirlar) + b"\n\n"
+
+# ------------------ SIRALAMA DURUMU ------------------
+class CanliSiralama:
+    def __init__(self, ilkTarih, sonTarih, ilk_gun, son_gun, ilce, normal_okuma_min, kaynak_al, api_kayitlari):
+        self.ilkTarih = ilkTarih
+        self.sonTarih = sonTarih
+        self.ilk_gun = ilk_gun
+        self.son_gun = son_gun
+        self.ilce = ilce
+        self.normal_okuma_min = normal_okuma_min
+        self._kaynak_al = kaynak_al
+        self._api_kayitlari = api_kayitlari
+        self._kilit = threading.Lock()
+        self.aboneler = set()
+        self.gorev = None
+        self.hazir = False
+        self.kaynak = None
+        self.satirlar = {}
+        # Normalizasyon öncesi (yuvarlanmış) puanlar
+        self._ham = {}
+        self.max_okuma = 0
+        self._son_id = 0
+        self._surum = None
+        self._sifirlama = None
+        self._tam_zamani = 0.0
+        self.olay_no = 0
+        self.tam_hesaplama = 0
+        self.artimli_hesaplama = 0
+        self.yeniden_puanlanan = 0
+
+    # --- Puanlama ---
+    def _puanla(self, df, max_okuma=None):
+        if df.empty:
+            return {}, {}, 0
+        ozet, kullanici_adlari = personel_ozeti(df, BOLGE_KATSAYILARI)
+        en_buyuk = ozet["toplam_okuma"].max().item()
+        if max_okuma is None:
+            max_okuma = en_buyuk
+        satirlar = json_tiplerine(puan_sonuclari(ozet, kullanici_adlari, max_okuma))
+        ham = {}
+        yeni = {}
+        for satir, puan in zip(satirlar, ozet["puan"].tolist()):
+            anahtar = _anahtar(satir["AD_SOYAD"])
+            yeni[anahtar] = satir
+            ham[anahtar] = round(float(puan), 2)
+        return yeni, ham, en_buyuk
+
+    def _ilceler(self):
+        return ilce_adlari_eslesen(normalize_ad(self.ilce), normalize_ad) if self.ilce else None
+
+    def _tum_kayitlar(self, kaynak):
+        if kaynak == "veritabani":
+            ilceler = self._ilceler()
+            if self.normal_okuma_min > 0:
+                kayitlar = okumalari_sorgula(self.ilkTarih, self.sonTarih, ilceler, self.normal_okuma_min)
+            else:
+                kayitlar = ozet_sorgula(self.ilkTarih, self.sonTarih, ilceler)
+            return pd.DataFrame(kayitlar)
+        if kaynak == "api":
+            df = pd.DataFrame(self._api_kayitlari(self.ilkTarih, self.sonTarih))
+        else:
+            df = okuma_deposu.cerceve()
+        if df.empty:
+            return df
+        return min_normal_filtrele(filtrele_cerceve(df, self.ilk_gun, self.son_gun, self.ilce), self.normal_okuma_min)
+
+    def _tam(self, kaynak):
+        # Sıralama baştan kurulur; fark önceki durumla karşılaştırılarak çıkarılır
+        self._surum = veri_surumu.deger
+        # Sayaç ve son id kayıtlardan önce okunur; arada gelen okumalar bir
+        # sonraki artımlı adımda yeniden puanlanır
+        self._sifirlama, son_id = okuma_durumu() if kaynak == "veritabani" else (None, 0)
+        satirlar, ham, max_okuma = self._puanla(self._tum_kayitlar(kaynak))
+        eski = self.satirlar
+        guncellenen = [s for a, s in satirlar.items() if eski.get(a) != s]
+        silinen = [a for a in eski if a not in satirlar]
+        max_degisti = max_okuma != self.max_okuma
+        self.kaynak = kaynak
+        self.satirlar, self._ham, self.max_okuma = satirlar, ham, max_okuma
+        self._son_id = son_id
+        self._tam_zamani = time.monotonic()
+        self.tam_hesaplama += 1
+        return self._degisiklik(guncellenen, silinen, max_degisti)
+
+    def _artimli(self, yeni_son_id):
+        # Yalnızca (son_id, yeni_son_id] aralığında okuması gelen kişiler
+        # yeniden puanlanır; önceki max_okuma ile puanlanıp gerekirse diğer
+        # satırların normalizasyonu güncellenir
+        ilceler = self._ilceler()
+        kisiler = degisen_kisiler(
+            self._son_id, yeni_son_id, self.ilkTarih, self.sonTarih, ilceler, self.normal_okuma_min
+        )
+        self._son_id = yeni_son_id
+        self._surum = veri_surumu.deger
+        self.artimli_hesaplama += 1
+        if not kisiler:
+            return None
+        kayitlar = kisilerin_kayitlari(kisiler, self.ilkTarih, self.sonTarih, ilceler, self.normal_okuma_min)
+        satirlar, ham, en_buyuk = self._puanla(pd.DataFrame(kayitlar), self.max_okuma)
+        self.yeniden_puanlanan += len(satirlar)
+        eski_max = self.max_okuma
+        # Okumalar yalnızca eklendiğinden kişi toplamları azalmaz
+        self.max_okuma = max(eski_max, en_buyuk)
+        guncellenen = {}
+        if max(1, self.max_okuma) != max(1, eski_max):
+            for anahtar, satir in self.satirlar.items():
+                if anahtar in satirlar:
+                    continue
+                yeni = normalize_puan(satir, self._ham[anahtar], self.max_okuma)
+                if yeni != satir:
+                    self.satirlar[anahtar] = guncellenen[anahtar] = yeni
+            for anahtar, satir in satirlar.items():
+                satirlar[anahtar] = normalize_puan(satir, ham[anahtar], self.max_okuma)
+        for anahtar, satir in satirlar.items():
+            if self.satirlar.get(anahtar) != satir:
+                self.satirlar[anahtar] = guncellenen[anahtar] = satir
+        self._ham.update(ham)
+        return self._degisiklik(list(guncellenen.values()), [], self.max_okuma != eski_max)
+
+    def _degisiklik(self, guncellenen, silinen, max_degisti):
+        if not guncellenen and not silinen:
+            return None
+        self.olay_no += 1
+        return {
+            "olay": self.olay_no,
+            "kaynak": self.kaynak,
+            "guncellenen": guncellenen,
+            "silinen": silinen,
+            "max_okuma": self.max_okuma,
+            "max_okuma_degisti": max_degisti,
+            "kisi_sayisi": len(self.satirlar),
+        }
+
+    # --- Döngüden (worker thread) çağrılanlar ---
+    def hazirla(self):
+        with self._kilit:
+            if not self.hazir:
+                self._tam(self._kaynak_al())
+                self.hazir = True
+
+    def guncelle(self):
+        # Değişiklik yoksa None
+        with self._kilit:
+            kaynak = self._kaynak_al()
+            if kaynak != self.kaynak or time.monotonic() - self._tam_zamani >= TAM_YENILEME_SN:
+                return self._tam(kaynak)
+            if kaynak == "veritabani":
+                sifirlama, yeni_son_id = okuma_durumu()
+                if sifirlama != self._sifirlama or yeni_son_id < self._son_id:
+                    # Tablo boşaltılıp yeniden doldurulmuş; id'ler 1'den
+                    # başladığından eski satırlar artımlı güncellenemez
+                    return self._tam(kaynak)
+                if yeni_son_id == self._son_id:
+                    return None
+                return self._artimli(yeni_son_id)
+            if kaynak == "excel":
+                # Excel değiştiyse depo burada yeniden yüklenir ve veri sürümü artar
+                okuma_deposu.cerceve()
+                if veri_surumu.deger == self._surum:
+                    return None
+                return self._tam(kaynak)
+            if time.monotonic() - self._tam_zamani < API_YENILEME_SN:
+                return None
+            return self._tam(kaynak)
+
+    def siralama(self):
+        with self._kilit:
+            satirlar = sorted(self.satirlar.values(), key=lambda x: x["PUAN"], reverse=True)
+            return {
+                "olay": self.olay_no,
+                "kaynak": self.kaynak,
+                "analiz_sonucu": satirlar,
+                "max_okuma": self.max_okuma,
+            }
+
+    def istatistikler(self):
+        return {
+            "filtre": {
+                "ilkTarih": self.ilkTarih,
+                "sonTarih": self.sonTarih,
+                "ilce": self.ilce,
+                "normal_okuma_min": self.normal_okuma_min,
+            },
+            "kaynak": self.kaynak,
+            "abone": len(self.aboneler),
+            "kisi_sayisi": len(self.satirlar),
+            "olay": self.olay_no,
+            "tam_hesaplama": self.tam_hesaplama,
+            "artimli_hesaplama": self.artimli_hesaplama,
+            "yeniden_puanlanan_kisi": self.yeniden_puanlanan,
+        }
+
+# ------------------ YAYINLAR ------------------
+class CanliSiralamalar:
+    """Filtre başına paylaşılan canlı sıralamalar ve abonelikleri.
+
+    Son abone ayrılınca sıralama ve döngüsü bırakılır. Yetişemeyen (kuyruğu
+    dolan) istemcinin birikmiş farkları atılır ve güncel sıralama gönderilir.
+    """
+
+    def __init__(self, kaynak_al, api_kayitlari):
+        self._kaynak_al = kaynak_al
+        self._api_kayitlari = api_kayitlari
+        self._siralamalar = {}
+
+    async def _dongu(self, siralama):
+        while siralama.aboneler:
+            await asyncio.sleep(KONTROL_ARALIGI)
+            try:
+                degisiklik = await anyio.to_thread.run_sync(siralama.guncelle)
+            except Exception as e:
+                print(f"Canlı sıralama güncellenemedi: {e}")
+                continue
+            if degisiklik is None:
+                continue
+            olay = sse_olayi("degisiklik", degisiklik, degisiklik["olay"])
+            for kuyruk in list(siralama.aboneler):
+                try:
+                    kuyruk.put_nowait(olay)
+                except asyncio.QueueFull:
+                    while not kuyruk.empty():
+                        kuyruk.get_nowait()
+                    tam = await anyio.to_thread.run_sync(siralama.siralama)
+                    kuyruk.put_nowait(sse_olayi("siralama", tam, tam["olay"]))
+
+    async def akis(self, ilkTarih, sonTarih, ilk_gun, son_gun, ilce, normal_okuma_min):
+        # İlk olay tam sıralama, sonrakiler yalnızca değişen satırlar
+        anahtar = (ilk_gun, son_gun, normalize_ad(ilce), normal_okuma_min)
+        siralama = self._siralamalar.get(anahtar)
+        if siralama is None:
+            siralama = CanliSiralama(
+                ilkTarih, sonTarih, ilk_gun, son_gun, ilce, normal_okuma_min,
+                self._kaynak_al, self._api_kayitlari,
+            )
+            self._siralamalar[anahtar] = siralama
+        kuyruk = asyncio.Queue(maxsize=KUYRUK_BOYUTU)
+        # Kuyruk ilk sıralamadan önce eklenir; aradaki farklar sıralamanın
+        # ardından tekrar uygulanır (sonuç değişmez)
+        siralama.aboneler.add(kuyruk)
+        try:
+            try:
+                await anyio.to_thread.run_sync(siralama.hazirla)
+                tam = await anyio.to_thread.run_sync(siralama.siralama)
+            except Exception as e:
+                print(f"Canlı sıralama hatası: {e}")
+                yield sse_olayi("hata", {"HATA": f"Sıralama hesaplanamadı: {e}"})
+                return
+            if siralama.gorev is None:
+                siralama.gorev = asyncio.create_task(self._dongu(siralama))
+            yield sse_olayi("siralama", tam, tam["olay"])
+            while True:
+                try:
+                    olay = await asyncio.wait_for(kuyruk.get(), KALP_ATISI_SN)
+                except asyncio.TimeoutError:
+                    # Vekil sunucuların bağlantıyı boşta sayıp kapatmaması için
+                    yield b": canli\n\n"
+                    continue
+                yield olay
+        finally:
+            siralama.aboneler.discard(kuyruk)
+            if not siralama.aboneler:
+                if self._siralamalar.get(anahtar) is siralama:
+                    del self._siralamalar[anahtar]
+                if siralama.gorev is not None:
+                    siralama.gorev.cancel()
+
+    async def kapat(self):
+        for siralama in list(self._siralamalar.values()):
+            siralama.aboneler.clear()
+            if siralama.gorev is not None:
+                siralama.gorev.cancel()
+        self._siralamalar.clear()
+
+    def istatistikler(self):
+        return [s.istatistikler() for s in list(self._siralamalar.values())]
@@ -0,0 +1,80 @@
+import csv
+import io
+
+from analiz_vektorel import personel_karsilastirma_analizi_vektorel, _sutun
+from json_yanit import json_bayt, nan_temizle
+from sayfalama import alanlari_sec, _alan_listesi
+from tembel_modul import tembel_modul
+
+np = tembel_modul("numpy")
+pd = tembel_modul("pandas")
+
+# Personel puanlarını sıralamadan, kişi partileri halinde puanlayıp NDJSON ya
+# da CSV olarak akıtır. max_okuma normalizasyonu bütün kişilere bağlı
+# olduğundan önce ayrıca bulunur ve her partiye verilir; böylece her satır
+# /analiz'deki satırla aynıdır, yalnızca sıra farklıdır.
+
+PARTI_BOYUTU = 5000
+
+ALANLAR = [
+    "KULLANICI_ADI", "AD_SOYAD", "BOLGE", "TOPLAM_OKUMA", "NORMAL_OKUMA", "BOLGE_KATSAYI",
+    "PUAN", "KATEGORI", "ARTI_YONLER", "EKSIK_YONLER", "DUZENLILIK_PUANI", "GENEL_PUAN",
+    "AKTIF_GUN", "PUAN_AÇIKLAMA",
+]
+
+def kisi_partileri(kayitlar, parti_boyutu=PARTI_BOYUTU):
+    # Kişi sırasıyla gelen kayıtları bir kişiyi bölmeden partilere ayırır
+    parti = []
+    onceki = object()
+    for kayit in kayitlar:
+        ad = kayit.get("AD_SOYAD")
+        if ad != onceki and len(parti) >= parti_boyutu:
+            yield parti
+            parti = []
+        onceki = ad
+        parti.append(kayit)
+    if parti:
+        yield parti
+
+def cerceve_max_okuma(df):
+    if df.empty:
+        return 0
+    kodlar, _ = pd.factorize(_sutun(df, "AD_SOYAD", ""), use_na_sentinel=False)
+    return np.bincount(kodlar, _sutun(df, "TOPLAM_OKUMA", 0).fillna(0).to_numpy(dtype=float)).max()
+
+def cerceve_partileri(df, parti_boyutu=PARTI_BOYUTU):
+    # Bellekteki çerçeveyi kişi sınırlarından bölerek partiler halinde verir
+    if df.empty:
+        return
+    kodlar, _ = pd.factorize(_sutun(df, "AD_SOYAD", ""), use_na_sentinel=False)
+    sira = np.argsort(kodlar, kind="stable")
+    kisi_sonlari = (np.flatnonzero(np.diff(kodlar[sira])) + 1).tolist() + [len(df)]
+    bas = 0
+    for son in kisi_sonlari:
+        if son - bas >= parti_boyutu or son == len(df):
+            yield df.iloc[sira[bas:son]]
+            bas = son
+
+def puan_partileri(kayit_partileri, max_okuma, bolge_ortalamalari):
+    for parti in kayit_partileri:
+        df = parti if isinstance(parti, pd.DataFrame) else pd.DataFrame(parti)
+        yield personel_karsilastirma_analizi_vektorel(df, 0, bolge_ortalamalari, max_okuma)
+
+def ndjson_akisi(satir_partileri, alanlar=None, haric=None):
+    for satirlar in satir_partileri:
+        # Satırlarda NaN kalmışsa stdlib json_bayt akışın ortasında hata vermesin
+        yield b"".join(json_bayt(nan_temizle(s)) + b"\n" for s in alanlari_sec(satirlar, alanlar, haric))
+
+def csv_akisi(satir_partileri, alanlar=None, haric=None):
+    cikar = set(_alan_listesi(haric))
+    sutunlar = [a for a in (_alan_listesi(alanlar) or ALANLAR) if a not in cikar]
+    tampon = io.StringIO()
+    yazici = csv.DictWriter(tampon, fieldnames=sutunlar, extrasaction="ignore")
+    yazici.writeheader()
+    for satirlar in satir_partileri:
+        yazici.writerows(satirlar)
+        yield tampon.getvalue()
+        tampon.seek(0)
+        tampon.truncate()
+    if tampon.tell():
+        yield tampon.getvalue()
@@ -0,0 +1,175 @@
+import json
+import math
+import threading
+
+# İlçe / bölge adları için tek normalizasyon ve kimlik (ID) kaydı. Her farklı
+# ham ad bir kez normalize edilir ve bir tamsayı kimliğe bağlanır; satırlar
+# bu kimlikleri taşır, filtreler tamsayı karşılaştırmasına dönüşür.
+
+_ASCII = str.maketrans({"İ": "I", "Ç": "C", "Ğ": "G", "Ö": "O", "Ş": "S", "Ü": "U"})
+_ASCII_BOSLUKSUZ = str.maketrans({"İ": "I", "Ç": "C", "Ğ": "G", "Ö": "O", "Ş": "S", "Ü": "U", " ": None})
+
+def ascii_buyuk(ad):
+    # Büyük harf + Türkçe karakterler ASCII; boşluklar korunur
+    if not ad:
+        return ""
+    return ad.strip().upper().translate(_ASCII)
+
+def normalize_ad(ad):
+    # Kanonik anahtar: ascii_buyuk + boşluklar silinir ("KÜÇÜK KUYU" == "KÜÇÜKKUYU")
+    if not ad:
+        return ""
+    return ad.strip().upper().translate(_ASCII_BOSLUKSUZ)
+
+class IsimKaydi:
+    def __init__(self, tur):
+        self.tur = tur
+        self._kilit = threading.Lock()
+        self._anahtar_kimlik = {}
+        self._ham_kimlik = {}
+        self._adlar = []
+        self.uyumsuzluklar = []
+
+    def kimlik(self, ad, ekle=True):
+        # Ham ada karşılık gelen kimlik; ad boşsa ya da ekle=False iken
+        # kayıtlı değilse None
+        try:
+            return self._ham_kimlik[ad]
+        except (KeyError, TypeError):
+            pass
+        if not isinstance(ad, str) or not ad.strip():
+            return None
+        anahtar = normalize_ad(ad)
+        if not ekle:
+            # Sorgu adı: yazımı veri uyumsuzluğu sayılmaz, önbelleğe de yazılmaz
+            # (istemcinin gönderdiği her yazım kaydı büyütmesin)
+            return self._anahtar_kimlik.get(anahtar)
+        with self._kilit:
+            kimlik = self._anahtar_kimlik.get(anahtar)
+            if kimlik is None:
+                kimlik = len(self._adlar)
+                self._anahtar_kimlik[anahtar] = kimlik
+                self._adlar.append(ad)
+            elif ad != self._adlar[kimlik]:
+                self._uyumsuzluk_ekle("farkli_yazim", ad, self._adlar[kimlik], anahtar)
+            if ascii_buyuk(ad) != anahtar:
+                # Eski iki normalize fonksiyonu bu adda farklı sonuç veriyordu
+                self._uyumsuzluk_ekle("bosluk", ad, ascii_buyuk(ad), anahtar)
+            self._ham_kimlik[ad] = kimlik
+        return kimlik
+
+    def _uyumsuzluk_ekle(self, neden, ad, diger, anahtar):
+        self.uyumsuzluklar.append({"tur": self.tur, "neden": neden, "ad": ad, "diger": diger, "anahtar": anahtar})
+
+    def ad(self, kimlik):
+        return self._adlar[kimlik]
+
+    def __len__(self):
+        return len(self._adlar)
+
+ILCE_KAYDI = IsimKaydi("ilce")
+BOLGE_KAYDI = IsimKaydi("bolge")
+
+# Satırda ad yoksa -1; sorgulanan ad kayıtta yoksa hiçbir satırla eşleşmeyen -2
+BOS = -1
+BILINMEYEN = -2
+
+def sorgu_kimligi(kayit, ad):
+    # Filtre parametresi için kimlik; ad verilmemişse None (filtre yok).
+    # Sorgu adları kayda eklenmez.
+    if not ad:
+        return None
+    kimlik = kayit.kimlik(ad, ekle=False)
+    return BILINMEYEN if kimlik is None else kimlik
+
+def ilce_kimligi(v):
+    kimlik = v.get("ILCE_ID")
+    return kimlik if kimlik is not None else ILCE_KAYDI.kimlik(v.get("ILCE"))
+
+def bolge_kimligi(v):
+    kimlik = v.get("BOLGE_ID")
+    return kimlik if kimlik is not None else BOLGE_KAYDI.kimlik(v.get("BOLGE"))
+
+def kimlik_sutunlari_ekle(df):
+    # DataFrame'e ILCE_ID / BOLGE_ID sütunlarını ekler (boş ad: -1).
+    # Normalizasyon her farklı ad için bir kez yapılır.
+    for sutun, kayit in (("ILCE", ILCE_KAYDI), ("BOLGE", BOLGE_KAYDI)):
+        if sutun in df.columns:
+            esleme = {ad: kayit.kimlik(ad) for ad in df[sutun].dropna().unique()}
+            # Anlık görüntüden açılan kategorik sütunda map kategorik döner;
+            # fillna yeni kategori ekleyemediğinden önce sayıya çevrilir
+            df[sutun + "_ID"] = df[sutun].map(esleme).astype(float).fillna(BOS).astype(int)
+    return df
+
+_raporlanan = {}
+
+def uyumsuzluklari_raporla():
+    # Son rapordan bu yana eklenen uyumsuzlukları yazdırır
+    for kayit in (ILCE_KAYDI, BOLGE_KAYDI):
+        once = _raporlanan.get(kayit.tur, 0)
+        _raporlanan[kayit.tur] = len(kayit.uyumsuzluklar)
+        for u in kayit.uyumsuzluklar[once:]:
+            if u["neden"] == "bosluk":
+                print(f"İsim uyumsuzluğu ({u['tur']}): '{u['ad']}' boşluklu '{u['diger']}', boşluksuz '{u['anahtar']}' olarak normalize ediliyor.")
+            else:
+                print(f"İsim uyumsuzluğu ({u['tur']}): '{u['ad']}' ile '{u['diger']}' aynı ada ('{u['anahtar']}') işaret ediyor.")
+
+def isim_raporu():
+    return {
+        "ilce_sayisi": len(ILCE_KAYDI),
+        "bolge_sayisi": len(BOLGE_KAYDI),
+        "uyumsuzluklar": ILCE_KAYDI.uyumsuzluklar + BOLGE_KAYDI.uyumsuzluklar,
+    }
+
+# --- Bölge Katsayılarını Yükle (JSON'dan) ---
+# BOLGE_KATSAYILARI anahtarları /katsayilarbolge çıktısı için eski
+# biçimde (ascii_buyuk) kalır; aramalar kimlik üzerinden yapılır.
+# Tablo bir kez, doğrulanarak yüklenir; boş ya da bozuk dosya ve geçersiz
+# katsayılar uygulamayı durdurmaz (katsayısı olmayan bölge 1.0 alır).
+KATSAYI_DOSYASI = "BOLGE_KATSAYI_DETAYLI.json"
+BOLGE_KATSAYILARI = {}
+_KATSAYI_KIMLIK = {}
+
+def _gecerli_katsayi(deger):
+    return (
+        isinstance(deger, (int, float)) and not isinstance(deger, bool)
+        and math.isfinite(deger) and deger > 0
+    )
+
+def katsayilari_yukle(dosya=KATSAYI_DOSYASI):
+    """Katsayı tablosunu yerinde yeniden kurar; yüklenen bölge sayısını döner.
+
+    Sözlükler yerinde güncellenir, çünkü diğer modüller onları içe aktarıp
+    doğrudan kullanır.
+    """
+    try:
+        with open(dosya, "r", encoding="utf-8") as f:
+            icerik = f.read()
+        veri = json.loads(icerik) if icerik.strip() else {}
+    except FileNotFoundError:
+        veri = {}
+    except (OSError, ValueError) as e:
+        print(f"Bölge katsayıları okunamadı ({dosya}): {e}")
+        veri = {}
+    if not isinstance(veri, dict):
+        print(f"Bölge katsayıları nesne olmalı ({dosya}); yok sayıldı.")
+        veri = {}
+    katsayilar = {}
+    for bolge, veriler in veri.items():
+        katsayi = veriler.get("katsayi") if isinstance(veriler, dict) else None
+        if not bolge or not _gecerli_katsayi(katsayi):
+            print(f"Geçersiz bölge katsayısı atlandı: {bolge!r} -> {veriler!r}")
+            continue
+        katsayilar[bolge] = float(katsayi)
+    BOLGE_KATSAYILARI.clear()
+    _KATSAYI_KIMLIK.clear()
+    for bolge, katsayi in katsayilar.items():
+        BOLGE_KATSAYILARI[ascii_buyuk(bolge)] = katsayi
+        _KATSAYI_KIMLIK[BOLGE_KAYDI.kimlik(bolge)] = katsayi
+    uyumsuzluklari_raporla()
+    return len(katsayilar)
+
+katsayilari_yukle()
+
+def bolge_katsayisi(kimlik):
+    return _KATSAYI_KIMLIK.get(kimlik, 1.0)
@@ -0,0 +1,61 @@
+import json
+import math
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Büyük analiz yanıtları için JSON kodlama. orjson kuruluysa kodlama ve
+# sonucun JSON tiplerine indirgenmesi onunla yapılır; kurulu değilse
+# jsonable_encoder + json modülüne düşülür. İki yol da aynı JSON'u üretir
+# (NaN/Infinity orjson'da null olur, stdlib yolunda da null'a çevrilir).
+# json_bayt'a verilen içerik önce nan_temizle'den geçirilmelidir; stdlib
+# json_bayt NaN görürse hata verir.
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _SECENEKLER = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def json_bayt(icerik):
+        return orjson.dumps(icerik, default=str, option=_SECENEKLER)
+
+    def json_tiplerine(icerik):
+        # Önbelleğe konacak sonucu düz dict/list/str/sayıya indirger
+        return orjson.loads(json_bayt(icerik))
+
+    def nan_temizle(icerik):
+        # orjson NaN/Infinity'yi kendisi null yazar
+        return icerik
+else:
+    def nan_temizle(icerik):
+        if isinstance(icerik, float) and not math.isfinite(icerik):
+            return None
+        if isinstance(icerik, dict):
+            return {a: nan_temizle(d) for a, d in icerik.items()}
+        if isinstance(icerik, (list, tuple)):
+            return [nan_temizle(d) for d in icerik]
+        return icerik
+
+    def json_tiplerine(icerik):
+        return nan_temizle(jsonable_encoder(icerik))
+
+    def json_bayt(icerik):
+        return json.dumps(
+            icerik, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=str
+        ).encode("utf-8")
+
+class HizliJSONResponse(JSONResponse):
+    def render(self, content):
+        return json_bayt(nan_temizle(content))
+
+def sutunlu(satirlar):
+    # Satır listesini alan başına dizilere çevirir: {"AD_SOYAD": [...], "PUAN": [...]}.
+    # Alanlar ilk görülme sırasıyla; satırda olmayan alan None olur.
+    alanlar = {}
+    for satir in satirlar:
+        for alan in satir:
+            alanlar.setdefault(alan, None)
+    return {alan: [satir.get(alan) for satir in satirlar] for alan in alanlar}
@@ -1,36 +1,150 @@
-from fastapi import FastAPI, Request, Query, Body
-from fastapi.responses import HTMLResponse, JSONResponse
+import time
+
+# Başlangıç ölçümü için; ağır içe aktarmalardan önce alınır
+_ICE_AKTARMA_BASLANGICI = time.perf_counter()
+
+from fastapi import FastAPI, Request, Query, Body, Depends
+from fastapi.responses import HTMLResponse, JSONResponse, Response, PlainTextResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from datetime import datetime
 from collections import defaultdict
-from typing import Optional
-from sqlalchemy import func
-import requests
-import json
-import urllib3
-import pandas as pd  # Excel okuma için
-
-from veritabani import Okuma, SessionLocal, init_db
+from typing import Optional, List
+from contextlib import asynccontextmanager
+from starlette.routing import Match
+from sqlalchemy import select
+import os
+import sys
+import threading
+import traceback
+import anyio
+
+from veritabani import (
+    Okuma,
+    ILCE_LISTESI,
+    KULLANICI_LISTESI,
+    OKUMA_VAR,
+    init_db,
+    okuma_var_mi,
+    okumalari_sorgula,
+    ozet_sorgula,
+    kullanici_adlari_sorgula,
+    ilce_adlari_eslesen,
+    eslesen_ilceler,
+    kullanici_adlari_eslesen,
+    kullanici_adlari_ifadesi,
+    kisi_sirali_kayitlar,
+    kisi_toplami_en_buyuk,
+    defter_okumalari,
+)
+from veritabani_havuzu import asenkron_veritabani, veritabani_oturumu
+from veri_deposu import okuma_deposu, defter_anahtari, EXCEL_DOSYASI
+from veri_aktarim import dosyayi_aktar, kayitlari_aktar
+from bolge_istatistik import bolge_istatistikleri
+from onbellek import SonucOnbellegi, TekUcus, veri_surumu
+from api_istemci import api_istemcisi
+from tarih_yardimci import tarih_ordinal, iso_tarih
+from isim_kayit import normalize_ad, isim_raporu
+from olcum import (
+    ISTEK_SURESI,
+    HATALAR,
+    OrneklemeliProfil,
+    aktif_endpoint,
+    asama,
+    gosterge_satirlari,
+    onbellek_sonucu,
+    prometheus_metni,
+)
+from analiz_vektorel import (
+    personel_karsilastirma_analizi_vektorel,
+    filtrele_cerceve,
+    min_normal_filtrele,
+    tarih_ordinalleri,
+)
+from paralel_analiz import paralel_puanla, havuzu_kapat
+from json_yanit import HizliJSONResponse, json_tiplerine
+from sayfalama import analiz_sayfasi, ImlecHatasi
+from disa_aktarim import (
+    cerceve_max_okuma,
+    cerceve_partileri,
+    csv_akisi,
+    kisi_partileri,
+    ndjson_akisi,
+    puan_partileri,
+)
+from canli_siralama import CanliSiralamalar
+from toplu_hesap import GirdiHatasi, girdi_cercevesi, toplu_default_hesapla, toplu_puan_hesapla
+from tembel_modul import tembel_modul
+from puan_serisi import puan_serisi, PENCERE_GUN
 from analiz_fonksiyonlar import (
     personel_karsilastirma_analizi,
     default_karakter_karsilastirma,
     hesapla_puan,
     kullanici_okuma_performansi_karsilastir,
     manuel_default_hesapla,
+    filtrele_veri_ilce_veya_bolge,
     BOLGE_KATSAYILARI,
 )
 
-# Bölge ortalamalarını JSON dosyasından yükle
-with open("bolge_ortalamalari.json", "r", encoding="utf-8") as f:
-    bolge_ortalamalari = json.load(f)
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-init_db()
-print("Veritabanı tabloları oluşturuldu.")
-
-app = FastAPI()
+pd = tembel_modul("pandas")
+
+# ------------------ BAŞLANGIÇ ------------------
+# pandas/numpy ve openpyxl/httpx ilk kullanıldıkları anda yüklenir; içe
+# aktarma sırasında dosya ya da veritabanı işi yapılmaz. Tablolar lifespan
+# başlangıcında oluşturulur. BASLANGIC_ISINMA=1 (varsayılan) iken uygulama
+# hazır olduktan sonra arka planda ağır modüller ve okuma verisi yüklenir;
+# ilk istek bunları beklemez, ısınma sürerken gelirse aynı kilidi bekler.
+BASLANGIC_ISINMA = os.environ.get("BASLANGIC_ISINMA", "1") == "1"
+BASLANGIC_OLCUMU = {
+    "ice_aktarma_sn": None,
+    "hazir_sn": None,
+    "ilk_yanit_sn": None,
+    "ilk_yanit_yolu": None,
+    "isinma": BASLANGIC_ISINMA,
+    "isinma_sn": None,
+}
+
+def _baslangictan_beri():
+    return round(time.perf_counter() - _ICE_AKTARMA_BASLANGICI, 4)
+
+def isinma():
+    baslangic = time.perf_counter()
+    try:
+        # pandas (ve numpy) ilk öznitelik erişiminde yüklenir
+        pd.DataFrame
+        kaynak = okuma_kaynagi()
+        if kaynak == "excel":
+            okuma_deposu.kayitlar()
+        elif kaynak == "veritabani":
+            bolge_istatistikleri.ortalamalar()
+    except Exception as e:
+        print(f"Isınma hatası: {e}")
+    BASLANGIC_OLCUMU["isinma_sn"] = round(time.perf_counter() - baslangic, 4)
+
+@asynccontextmanager
+async def lifespan(app):
+    init_db()
+    print("Veritabanı tabloları oluşturuldu.")
+    BASLANGIC_OLCUMU["hazir_sn"] = _baslangictan_beri()
+    print(
+        f"Başlangıç: içe aktarma {BASLANGIC_OLCUMU['ice_aktarma_sn']} sn, "
+        f"hazır {BASLANGIC_OLCUMU['hazir_sn']} sn"
+    )
+    if BASLANGIC_ISINMA:
+        threading.Thread(target=isinma, name="isinma", daemon=True).start()
+    yield
+    await canli_siralamalar.kapat()
+    await api_istemcisi.kapat()
+    await asenkron_veritabani.kapat()
+    havuzu_kapat()
+
+app = FastAPI(lifespan=lifespan)
+analiz_onbellegi = SonucOnbellegi(
+    max_boyut=int(os.environ.get("ANALIZ_ONBELLEK_BOYUTU", "256")),
+    ttl=float(os.environ.get("ANALIZ_ONBELLEK_TTL", "300")),
+)
+analiz_ucuslari = TekUcus()
 templates = Jinja2Templates(directory="templates")
 
 app.add_middleware(
@@ -41,59 +155,97 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# BASE_API_URL = "https://........"
+# İstek başına örneklemeli profil (?profil=1 ya da "X-Profil: 1") yalnızca
+# PROFIL_IZNI=1 iken açılır; yanıt yerine katlanmış yığınlar döner.
+PROFIL_IZNI = os.environ.get("PROFIL_IZNI", "0") == "1"
+
+def _endpoint_yolu(scope):
+    # Etiket olarak ham URL değil route şablonu kullanılır (sınırlı sayıda değer)
+    for route in app.router.routes:
+        eslesme, _ = route.matches(scope)
+        if eslesme == Match.FULL:
+            return route.path
+    return "diger"
+
+@app.middleware("http")
+async def olcum_middleware(request: Request, call_next):
+    endpoint = _endpoint_yolu(request.scope)
+    aktif_endpoint.set(endpoint)
+    profil_istendi = PROFIL_IZNI and (
+        request.query_params.get("profil") == "1" or request.headers.get("x-profil") == "1"
+    )
+    baslangic = time.perf_counter()
+    durum = 500
+    try:
+        if profil_istendi:
+            with OrneklemeliProfil() as profil:
+                response = await call_next(request)
+            durum = response.status_code
+            return PlainTextResponse(
+                profil.katlanmis(), headers={"X-Profil-Ornek": str(profil.ornek_sayisi)}
+            )
+        response = await call_next(request)
+        durum = response.status_code
+        return response
+    except Exception as e:
+        HATALAR.artir(endpoint, type(e).__name__)
+        raise
+    finally:
+        ISTEK_SURESI.gozlemle(time.perf_counter() - baslangic, endpoint, request.method, durum)
+        if BASLANGIC_OLCUMU["ilk_yanit_sn"] is None:
+            BASLANGIC_OLCUMU["ilk_yanit_sn"] = _baslangictan_beri()
+            BASLANGIC_OLCUMU["ilk_yanit_yolu"] = endpoint
+
+# Okumaların kaynağı: "excel", "veritabani", "api" (BASE_API_URL) ya da
+# "otomatik" (okumalar tablosunda kayıt varsa veritabanı, yoksa Excel)
+OKUMA_KAYNAGI = os.environ.get("OKUMA_KAYNAGI", "otomatik")
 
 # ------------------ EXCEL'DEN VERİ ÇEKME ------------------
-import pandas as pd
-
 def excelden_veri_cek():
-    try:
-        df = pd.read_excel("readings_sahte.xlsx")
-        # TARIH sütunu format dönüşümü (gerekirse)
-        def tarih_donustur(t):
-            try:
-                # Pandas otomatik çevirir ama Türkçe için yardımcı olalım:
-                # '13-Haziran-2025' gibi bir tarihi '%d-%B-%Y' ile tanır.
-                # Fakat %B Türkçe için locale ister. Alternatif: elle çevirelim.
-                ay_map = {
-                    "Ocak": "01", "Şubat": "02", "Mart": "03", "Nisan": "04",
-                    "Mayıs": "05", "Haziran": "06", "Temmuz": "07", "Ağustos": "08",
-                    "Eylül": "09", "Ekim": "10", "Kasım": "11", "Aralık": "12"
-                }
-                if isinstance(t, str) and '-' in t:
-                    parcalar = t.split('-')
-                    if len(parcalar) == 3 and parcalar[1] in ay_map:
-                        return f"{parcalar[2]}-{ay_map[parcalar[1]]}-{int(parcalar[0]):02d}"
-                return t  # Eğer uygun formatta değilse dokunma
-            except:
-                return t
-
-        if "TARIH" in df.columns:
-            df["TARIH"] = df["TARIH"].apply(tarih_donustur)
-
-        return df.to_dict(orient="records")
-    except Exception as e:
-        print(f"Excel okuma hatası: {e}")
-        return []
+    # Excel süreç başına bir kez okunur; dosya değişince depo kendini yeniler.
+    with asama("excel_okuma") as a:
+        kayitlar = okuma_deposu.kayitlar()
+        a.satir = len(kayitlar)
+    return kayitlar
+
+
+def okuma_kaynagi():
+    if OKUMA_KAYNAGI in ("excel", "veritabani", "api"):
+        return OKUMA_KAYNAGI
+    return "veritabani" if okuma_var_mi() else "excel"
+
+async def okuma_kaynagi_oturumla(oturum):
+    # okuma_kaynagi'nın async endpointlerdeki karşılığı (havuzlu oturumla)
+    if OKUMA_KAYNAGI in ("excel", "veritabani", "api"):
+        return OKUMA_KAYNAGI
+    return "veritabani" if (await oturum.execute(OKUMA_VAR)).first() is not None else "excel"
+
+def apiden_veri_cek(ilkTarih, sonTarih):
+    # Senkron endpointler threadpool'da çalışır; istek uygulamanın olay
+    # döngüsündeki paylaşılan async istemciye devredilir.
+    with asama("api_okuma") as a:
+        veriler = anyio.from_thread.run(api_istemcisi.okumalari_getir, ilkTarih, sonTarih)
+        a.satir = len(veriler)
+    return veriler
+
+def _canli_api_kayitlari(ilkTarih, sonTarih):
+    bugun = datetime.now().strftime("%Y-%m-%d")
+    return apiden_veri_cek(ilkTarih or bugun, sonTarih or bugun)
+
+canli_siralamalar = CanliSiralamalar(okuma_kaynagi, _canli_api_kayitlari)
 
+TARIH_HATASI = {"HATA": "Tarihler YYYY-AA-GG biçiminde olmalı."}
+
+def tarih_araliginda(v, ilk_gun, son_gun):
+    gun = tarih_ordinal(v.get("TARIH"))
+    if gun is None:
+        return False
+    return (ilk_gun is None or gun >= ilk_gun) and (son_gun is None or gun <= son_gun)
 
 # ------------------ UTILITY ------------------
 class UrlRequest(BaseModel):
     api_url: str
 
-def normalize_ilce_adi(ilce_adi):
-    if not ilce_adi:
-        return ""
-    return (ilce_adi.strip()
-                   .upper()
-                   .replace("İ", "I")
-                   .replace("Ç", "C")
-                   .replace("Ğ", "G")
-                   .replace("Ö", "O")
-                   .replace("Ş", "S")
-                   .replace("Ü", "U")
-                   .replace(" ", ""))
-
 # ------------------ ENDPOINTLER ------------------
 
 @app.get("/", response_class=HTMLResponse)
@@ -102,34 +254,82 @@ async def index(request: Request):
 
 @app.get("/katsayilarbolge")
 def katsayilarbolge_getir():
-    return JSONResponse(content=BOLGE_KATSAYILARI)
+    return HizliJSONResponse(content=BOLGE_KATSAYILARI)
+
+@app.get("/veri-deposu")
+def veri_deposu_durumu():
+    return okuma_deposu.istatistikler()
+
+@app.get("/veritabani-havuzu")
+def veritabani_havuzu_durumu():
+    return asenkron_veritabani.istatistikler()
+
+@app.get("/baslangic")
+def baslangic_durumu():
+    return {
+        **BASLANGIC_OLCUMU,
+        "yuklu_moduller": {ad: ad in sys.modules for ad in ("pandas", "numpy", "openpyxl", "httpx")},
+    }
 
-@app.get("/kullanicilar")
-def kullanicilar(
+@app.get("/isim-kaydi")
+def isim_kaydi_durumu():
+    return isim_raporu()
+
+@app.get("/metrics")
+def metrics():
+    ek = list(gosterge_satirlari("analiz_onbellegi_boyut", "Analiz önbelleğindeki kayıt sayısı",
+                                 [((), analiz_onbellegi.istatistikler()["boyut"])]))
+    ek += gosterge_satirlari("veri_surumu", "Okuma verisinin sürümü", [((), veri_surumu.deger)])
+    ek += gosterge_satirlari("excel_kayit_sayisi", "Bellekteki Excel kayıt sayısı",
+                             [((), okuma_deposu.istatistikler()["kayit_sayisi"])])
+    return PlainTextResponse(prometheus_metni(ek), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/analiz-onbellegi")
+def analiz_onbellegi_durumu():
+    return {
+        **analiz_onbellegi.istatistikler(),
+        "tek_ucus": analiz_ucuslari.istatistikler(),
+        "canli": canli_siralamalar.istatistikler(),
+    }
+
+@app.get("/kullanicilar", response_class=HizliJSONResponse)
+async def kullanicilar(
     ilkTarih: Optional[str] = Query(None),
     sonTarih: Optional[str] = Query(None),
-    ilce: Optional[str] = Query(None)
+    ilce: Optional[str] = Query(None),
+    oturum=Depends(veritabani_oturumu),
 ):
+    kaynak = await okuma_kaynagi_oturumla(oturum)
+    if kaynak != "veritabani":
+        return await anyio.to_thread.run_sync(kullanicilar_dosyadan, kaynak, ilkTarih, sonTarih, ilce)
+    # Tarih ve ilçe filtreleri indeksli WHERE koşullarına iner
+    ilceler = None
+    if ilce:
+        ilceler = eslesen_ilceler((await oturum.execute(ILCE_LISTESI)).scalars(), normalize_ad(ilce), normalize_ad)
+    try:
+        ifade = kullanici_adlari_ifadesi(ilkTarih, sonTarih, ilceler)
+    except ValueError:
+        return TARIH_HATASI
+    kullanici_adlari = sorted({a for a in (await oturum.execute(ifade)).scalars() if a})
+    if not kullanici_adlari:
+        return {"HATA": "Belirtilen kriterlere uyan kullanıcı adı bulunamadı."}
+    return {"kullanicilar": kullanici_adlari}
+
+def kullanicilar_dosyadan(kaynak, ilkTarih, sonTarih, ilce):
+    # Excel ve dış API (worker thread'de)
     bugun = datetime.now().strftime("%Y-%m-%d")
-    # --- EXCEL'den veri çek ---
-    veriler = excelden_veri_cek()
-    
-    # --- API ile çekmek isteyenler için, aşağıdaki satırların başındaki # işaretini kaldırabilir ---
-    # params = {
-    #     "ilkTarih": ilkTarih or bugun,
-    #     "sonTarih": sonTarih or bugun,
-    # }
-    # try:
-    #     response = requests.get(BASE_API_URL, params=params, verify=False)
-    #     response.raise_for_status()
-    #     veriler = response.json()
-    # except Exception as e:
-    #     return {"HATA": f"Dış API'den kullanıcı verisi alınamadı: {e}"}
+    if kaynak == "api":
+        try:
+            veriler = apiden_veri_cek(ilkTarih or bugun, sonTarih or bugun)
+        except Exception as e:
+            return {"HATA": f"Dış API'den kullanıcı verisi alınamadı: {e}"}
+    else:
+        # --- EXCEL'den veri çek ---
+        veriler = excelden_veri_cek()
 
     # İlçe filtresi (normalize)
     if ilce:
-        ilce_norm = normalize_ilce_adi(ilce)
-        veriler = [v for v in veriler if normalize_ilce_adi(v.get("ILCE", "")) == ilce_norm]
+        veriler = filtrele_veri_ilce_veya_bolge(veriler, ilce=ilce)
 
     kullanici_adlari = list({v.get("KULLANICI_ADI") for v in veriler if v.get("KULLANICI_ADI")})
     if not kullanici_adlari:
@@ -138,6 +338,7 @@ def kullanicilar(
 
 @app.get("/analiz")
 def analiz(
+    request: Request,
     tip: str = Query(default="", description="Analiz tipi: default, karsilastirma, defter"),
     kullanici_adi: str = "",
     defter_id: Optional[str] = Query(None),
@@ -146,39 +347,137 @@ def analiz(
     sonTarih: Optional[str] = Query(None),
     ilce: Optional[str] = Query(None),
     normal_okuma_min: int = 0,
-    bolge: Optional[str] = Query(None)
+    bolge: Optional[str] = Query(None),
+    motor: str = Query(default="klasik", description="Analiz motoru: klasik, vektorel"),
+    top_k: Optional[int] = Query(None, ge=1, description="Yalnızca en yüksek puanlı k kişi"),
+    limit: Optional[int] = Query(None, ge=1, description="Sayfa boyutu"),
+    offset: int = Query(default=0, ge=0),
+    imlec: Optional[str] = Query(None, description="Önceki yanıttaki sonraki_imlec"),
+    alanlar: Optional[str] = Query(None, description="Dönecek alanlar, virgülle: AD_SOYAD,PUAN"),
+    haric: Optional[str] = Query(None, description="Çıkarılacak alanlar, virgülle: ARTI_YONLER,EKSIK_YONLER"),
+    kullanici_listesi: bool = True,
+    bicim: str = Query(default="satir", description="satir ya da sutun (alan başına diziler)"),
+):
+    kaynak = okuma_kaynagi()
+    if kaynak == "excel":
+        # Excel değiştiyse depo burada yeniden yüklenir ve veri sürümü artar
+        okuma_deposu.cerceve()
+    anahtar = (
+        kaynak,
+        tip,
+        kullanici_adi.lower() if tip == "default" else "",
+        iso_tarih(ilkTarih) or ilkTarih or "",
+        iso_tarih(sonTarih) or sonTarih or "",
+        normalize_ad(ilce),
+        normal_okuma_min,
+        motor if tip != "default" else "",
+        defter_anahtari(defter_id) if tip == "defter" else None,
+        okuma_suresi if tip == "defter" else None,
+    )
+    surum = veri_surumu.deger
+    onbellekte = analiz_onbellegi.al(anahtar)
+    if onbellekte is None:
+        def hesapla():
+            sonuc = analiz_hesapla(
+                kaynak, tip, kullanici_adi, ilkTarih, sonTarih, ilce, normal_okuma_min, motor,
+                defter_id, okuma_suresi,
+            )
+            with asama("json_kodlama"):
+                sonuc = json_tiplerine(sonuc)
+                return sonuc, analiz_onbellegi.koy(anahtar, sonuc, surum)
+
+        # Aynı parametrelerle süren bir hesaplama varsa onun sonucu beklenir
+        (sonuc, etag), paylasildi = analiz_ucuslari.calistir((anahtar, surum), hesapla)
+        onbellek_sonucu("paylasildi" if paylasildi else "iska")
+    else:
+        onbellek_sonucu("isabet")
+        sonuc, etag = onbellekte
+
+    # Sayfa ve alan seçimi önbellekteki tam sıralama üzerinden yapılır
+    try:
+        sonuc, etag = analiz_sayfasi(
+            sonuc, etag, top_k, limit, offset, imlec, alanlar, haric, kullanici_listesi, bicim
+        )
+    except ImlecHatasi as e:
+        return {"HATA": str(e)}
+
+    basliklar = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    istemci_etaglari = request.headers.get("if-none-match", "")
+    if etag in [e.strip() for e in istemci_etaglari.split(",")]:
+        onbellek_sonucu("304")
+        return Response(status_code=304, headers=basliklar)
+    with asama("json_yanit"):
+        return HizliJSONResponse(content=sonuc, headers=basliklar)
+
+@app.get("/analiz-canli")
+async def analiz_canli(
+    ilkTarih: Optional[str] = Query(None),
+    sonTarih: Optional[str] = Query(None),
+    ilce: Optional[str] = Query(None),
+    normal_okuma_min: int = 0,
 ):
+    # Personel karşılaştırmasının canlı hali (Server-Sent Events). İlk olay
+    # (siralama) /analiz?tip=karsilastirma ile aynı satırlar; yeni okumalar
+    # geldikçe degisiklik olaylarında yalnızca değişen satırlar gelir.
+    ilk_gun = tarih_ordinal(ilkTarih) if ilkTarih else None
+    son_gun = tarih_ordinal(sonTarih) if sonTarih else None
+    if (ilkTarih and ilk_gun is None) or (sonTarih and son_gun is None):
+        return TARIH_HATASI
+    akis = canli_siralamalar.akis(
+        iso_tarih(ilkTarih), iso_tarih(sonTarih), ilk_gun, son_gun, ilce, normal_okuma_min
+    )
+    return StreamingResponse(
+        akis,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def analiz_hesapla(kaynak, tip, kullanici_adi, ilkTarih, sonTarih, ilce, normal_okuma_min, motor,
+                   defter_id=None, okuma_suresi=None):
     bugun = datetime.now().strftime("%Y-%m-%d")
-    # --- EXCEL'den veri çek ---
-    veriler = excelden_veri_cek()
-    # --- API ile çekmek isteyenler için ---
-    # params = {
-    #     "ilkTarih": ilkTarih or bugun,
-    #     "sonTarih": sonTarih or bugun,
-    # }
-    # try:
-    #     response = requests.get(BASE_API_URL, params=params, verify=False)
-    #     response.raise_for_status()
-    #     veriler = response.json()
-    # except Exception as e:
-    #     return {"HATA": f"Dış API'den veri çekilemedi: {str(e)}"}
+    ilk_gun = tarih_ordinal(ilkTarih) if ilkTarih else None
+    son_gun = tarih_ordinal(sonTarih) if sonTarih else None
+    if (ilkTarih and ilk_gun is None) or (sonTarih and son_gun is None):
+        return TARIH_HATASI
+    if tip == "defter":
+        return defter_analizi(
+            kaynak, defter_id, okuma_suresi, ilkTarih, sonTarih, ilk_gun, son_gun, ilce, normal_okuma_min
+        )
+    if kaynak == "veritabani":
+        try:
+            return analiz_veritabani(tip, kullanici_adi, ilkTarih, sonTarih, ilce, normal_okuma_min, motor)
+        except ValueError:
+            return TARIH_HATASI
+    if kaynak == "api":
+        try:
+            veriler = apiden_veri_cek(ilkTarih or bugun, sonTarih or bugun)
+        except Exception as e:
+            return {"HATA": f"Dış API'den veri çekilemedi: {str(e)}"}
+        if motor == "vektorel" and tip != "default":
+            return analiz_vektorel(pd.DataFrame(veriler), ilk_gun, son_gun, ilce, normal_okuma_min)
+    else:
+        if motor == "vektorel" and tip != "default":
+            return analiz_vektorel(okuma_deposu.cerceve(), ilk_gun, son_gun, ilce, normal_okuma_min)
+        if tip == "default":
+            return default_analizi_depodan(kullanici_adi, ilk_gun, son_gun, ilce, normal_okuma_min)
+        # --- EXCEL'den veri çek ---
+        veriler = excelden_veri_cek()
 
     if not veriler:
         return {"analiz_sonucu": [], "kullanicilar": []}
 
-    # Tarih filtresi (isteğe bağlı, eğer Excel dosyan tüm tarihleri içeriyorsa)
-    if ilkTarih:
-        veriler = [v for v in veriler if v.get("TARIH", "") >= ilkTarih]
-    if sonTarih:
-        veriler = [v for v in veriler if v.get("TARIH", "") <= sonTarih]
+    with asama("filtre") as a:
+        # Tarih filtresi (isteğe bağlı, eğer Excel dosyan tüm tarihleri içeriyorsa)
+        if ilk_gun is not None or son_gun is not None:
+            veriler = [v for v in veriler if tarih_araliginda(v, ilk_gun, son_gun)]
 
-    # İlçe filtre
-    if ilce:
-        ilce_norm = normalize_ilce_adi(ilce)
-        veriler = [v for v in veriler if normalize_ilce_adi(v.get("ILCE", "")) == ilce_norm]
+        # İlçe filtre
+        if ilce:
+            veriler = filtrele_veri_ilce_veya_bolge(veriler, ilce=ilce)
 
-    # Min. normal okuma filtresi
-    filtrelenmis_veriler = [v for v in veriler if (v.get("NORMAL_OKUMA") or 0) >= normal_okuma_min]
+        # Min. normal okuma filtresi
+        filtrelenmis_veriler = [v for v in veriler if (v.get("NORMAL_OKUMA") or 0) >= normal_okuma_min]
+        a.satir = len(filtrelenmis_veriler)
     gun_sayisi = len(set([v["TARIH"] for v in filtrelenmis_veriler if "TARIH" in v]))
 
     if tip == "default":
@@ -189,15 +488,22 @@ def analiz(
             ]
             if not kullanici_verileri:
                 return {"analiz_sonucu": [], "HATA": f"'{kullanici_adi}' için veri bulunamadı."}
-            analiz_sonuc = default_karakter_karsilastirma(kullanici_verileri)
+            analiz_sonuc = default_karakter_karsilastirma(
+                kullanici_verileri, bolge_istatistikleri.ortalamalar()
+            )
             return {"analiz_sonucu": analiz_sonuc}
         return {"analiz_sonucu": []}
 
     # Personel karşılaştırma
-    analiz_sonuc = personel_karsilastirma_analizi(
-        filtrelenmis_veriler, gun_sayisi, BOLGE_KATSAYILARI
-    )
-    analiz_sonuc.sort(key=lambda x: x["PUAN"], reverse=True)
+    with asama("puan") as a:
+        # Büyük veri ve ANALIZ_ISCI_SAYISI > 0 ise süreç havuzunda puanlanır
+        analiz_sonuc = paralel_puanla(filtrelenmis_veriler, BOLGE_KATSAYILARI)
+        if analiz_sonuc is None:
+            analiz_sonuc = personel_karsilastirma_analizi(
+                filtrelenmis_veriler, gun_sayisi, BOLGE_KATSAYILARI
+            )
+        analiz_sonuc.sort(key=lambda x: x["PUAN"], reverse=True)
+        a.satir = len(analiz_sonuc)
 
     # Excel kullanırken kullanıcı adlarını da çekmek için:
     kullanici_listesi = sorted({v.get("KULLANICI_ADI") for v in veriler if v.get("KULLANICI_ADI")})
@@ -207,39 +513,265 @@ def analiz(
         "kullanicilar": kullanici_listesi
     }
 
+def default_analizi_depodan(kullanici_adi, ilk_gun, son_gun, ilce, normal_okuma_min):
+    # Tek kişilik rapor: bütün satırlar taranmaz; kişinin satırları depodaki
+    # kullanıcı indeksinden, tarih aralığı ikili aramayla alınır
+    if okuma_deposu.cerceve().empty:
+        return {"analiz_sonucu": [], "kullanicilar": []}
+    if not kullanici_adi:
+        return {"analiz_sonucu": []}
+    with asama("filtre") as a:
+        kullanici_verileri = okuma_deposu.kullanici_kayitlari(kullanici_adi, ilk_gun, son_gun)
+        if ilce:
+            kullanici_verileri = filtrele_veri_ilce_veya_bolge(kullanici_verileri, ilce=ilce)
+        kullanici_verileri = [v for v in kullanici_verileri if (v.get("NORMAL_OKUMA") or 0) >= normal_okuma_min]
+        a.satir = len(kullanici_verileri)
+    if not kullanici_verileri:
+        return {"analiz_sonucu": [], "HATA": f"'{kullanici_adi}' için veri bulunamadı."}
+    analiz_sonuc = default_karakter_karsilastirma(kullanici_verileri, bolge_istatistikleri.ortalamalar())
+    return {"analiz_sonucu": analiz_sonuc}
+
+def analiz_veritabani(tip, kullanici_adi, ilkTarih, sonTarih, ilce, normal_okuma_min, motor):
+    # /analiz'in veritabanı üzerinden çalışan yolu; bütün filtreler SQL'e iner.
+    # Min. normal okuma filtresi yoksa puanlama günlük özet tablosundan beslenir.
+    ilceler = ilce_adlari_eslesen(normalize_ad(ilce), normalize_ad) if ilce else None
+
+    def kayitlar(kullanici_adlari=None):
+        if normal_okuma_min > 0:
+            return okumalari_sorgula(ilkTarih, sonTarih, ilceler, normal_okuma_min, kullanici_adlari)
+        return ozet_sorgula(ilkTarih, sonTarih, ilceler, kullanici_adlari)
+
+    if tip == "default":
+        if kullanici_adi:
+            kullanici_verileri = kayitlar(kullanici_adlari_eslesen(kullanici_adi))
+            if not kullanici_verileri:
+                return {"analiz_sonucu": [], "HATA": f"'{kullanici_adi}' için veri bulunamadı."}
+            analiz_sonuc = default_karakter_karsilastirma(
+                kullanici_verileri, bolge_istatistikleri.ortalamalar()
+            )
+            return {"analiz_sonucu": analiz_sonuc}
+        return {"analiz_sonucu": []}
+
+    with asama("veritabani") as a:
+        filtrelenmis_veriler = kayitlar()
+        a.satir = len(filtrelenmis_veriler)
+    gun_sayisi = len({v["TARIH"] for v in filtrelenmis_veriler})
+    with asama("puan") as a:
+        analiz_sonuc = paralel_puanla(filtrelenmis_veriler, BOLGE_KATSAYILARI)
+        if analiz_sonuc is None and motor == "vektorel":
+            analiz_sonuc = personel_karsilastirma_analizi_vektorel(
+                pd.DataFrame(filtrelenmis_veriler), gun_sayisi, BOLGE_KATSAYILARI
+            )
+        elif analiz_sonuc is None:
+            analiz_sonuc = personel_karsilastirma_analizi(
+                filtrelenmis_veriler, gun_sayisi, BOLGE_KATSAYILARI
+            )
+        analiz_sonuc.sort(key=lambda x: x["PUAN"], reverse=True)
+        a.satir = len(analiz_sonuc)
+
+    return {
+        "analiz_sonucu": analiz_sonuc,
+        "kullanicilar": kullanici_adlari_sorgula(ilkTarih, sonTarih, ilceler)
+    }
+
+def defter_analizi(kaynak, defter_id, okuma_suresi, ilkTarih, sonTarih, ilk_gun, son_gun, ilce, normal_okuma_min):
+    # Aynı defteri okuyan personelin hız/doğruluk sıralaması. Veritabanında
+    # ix_okumalar_defter_id, Excel'de depodaki defter indeksi kullanılır;
+    # bütün okumalar taranmaz.
+    defter = defter_anahtari(defter_id)
+    if not defter:
+        return {"analiz_sonucu": [], "HATA": "Defter analizi için defter_id girilmelidir."}
+    with asama("defter") as a:
+        if kaynak == "veritabani":
+            ilceler = ilce_adlari_eslesen(normalize_ad(ilce), normalize_ad) if ilce else None
+            try:
+                veriler = defter_okumalari(defter, ilkTarih, sonTarih, ilceler, normal_okuma_min)
+            except ValueError:
+                return TARIH_HATASI
+        else:
+            if kaynak == "api":
+                bugun = datetime.now().strftime("%Y-%m-%d")
+                try:
+                    veriler = apiden_veri_cek(ilkTarih or bugun, sonTarih or bugun)
+                except Exception as e:
+                    return {"HATA": f"Dış API'den veri çekilemedi: {str(e)}"}
+                veriler = [v for v in veriler if defter_anahtari(v.get("DEFTER_ID")) == defter]
+            else:
+                veriler = okuma_deposu.defter_kayitlari(defter)
+            if ilk_gun is not None or son_gun is not None:
+                veriler = [v for v in veriler if tarih_araliginda(v, ilk_gun, son_gun)]
+            if ilce:
+                veriler = filtrele_veri_ilce_veya_bolge(veriler, ilce=ilce)
+            veriler = [v for v in veriler if (v.get("NORMAL_OKUMA") or 0) >= normal_okuma_min]
+        a.satir = len(veriler)
+    if not veriler:
+        return {"analiz_sonucu": [], "HATA": f"'{defter_id}' numaralı defter için veri bulunamadı."}
+
+    with asama("puan") as a:
+        analiz_sonuc = kullanici_okuma_performansi_karsilastir(veriler, okuma_suresi)
+        a.satir = len(analiz_sonuc)
+    return {
+        "analiz_sonucu": analiz_sonuc,
+        "kullanicilar": sorted({v.get("KULLANICI_ADI") for v in veriler if v.get("KULLANICI_ADI")}),
+    }
+
+def analiz_vektorel(df, ilk_gun, son_gun, ilce, normal_okuma_min):
+    # /analiz'in sütunlu motorla çalışan personel karşılaştırma yolu
+    if df.empty:
+        return {"analiz_sonucu": [], "kullanicilar": []}
+    with asama("filtre") as a:
+        df = filtrele_cerceve(df, ilk_gun, son_gun, ilce)
+        filtrelenmis = min_normal_filtrele(df, normal_okuma_min)
+        a.satir = len(filtrelenmis)
+    gun_sayisi = filtrelenmis["TARIH"].nunique() if "TARIH" in filtrelenmis.columns else 0
+
+    with asama("puan") as a:
+        analiz_sonuc = paralel_puanla(filtrelenmis, BOLGE_KATSAYILARI)
+        if analiz_sonuc is None:
+            analiz_sonuc = personel_karsilastirma_analizi_vektorel(
+                filtrelenmis, gun_sayisi, BOLGE_KATSAYILARI
+            )
+        analiz_sonuc.sort(key=lambda x: x["PUAN"], reverse=True)
+        a.satir = len(analiz_sonuc)
+
+    kullanici_listesi = []
+    if "KULLANICI_ADI" in df.columns:
+        kullanici_listesi = sorted({k for k in df["KULLANICI_ADI"].dropna().unique() if k})
+    return {
+        "analiz_sonucu": analiz_sonuc,
+        "kullanicilar": kullanici_listesi
+    }
+
+@app.get("/puan-serisi")
+def puan_serisi_getir(
+    pencere: str = Query(default="hafta", description="Pencere: gun, hafta, ay"),
+    tur: str = Query(default="ardisik", description="ardisik (takvime hizalı) ya da kayan"),
+    adim: int = Query(default=1, ge=1, description="Kayan pencerede kayma (gün)"),
+    ilkTarih: Optional[str] = Query(None),
+    sonTarih: Optional[str] = Query(None),
+    ilce: Optional[str] = Query(None),
+    normal_okuma_min: int = 0,
+):
+    # Kişi başına pencere pencere PUAN; her pencere /analiz'in o aralık için
+    # verdiği personel karşılaştırma puanıyla aynıdır
+    if pencere not in PENCERE_GUN or tur not in ("ardisik", "kayan"):
+        return {"HATA": "pencere gun/hafta/ay, tur ardisik/kayan olmalı."}
+    ilk_gun = tarih_ordinal(ilkTarih) if ilkTarih else None
+    son_gun = tarih_ordinal(sonTarih) if sonTarih else None
+    if (ilkTarih and ilk_gun is None) or (sonTarih and son_gun is None):
+        return TARIH_HATASI
+
+    kaynak = okuma_kaynagi()
+    if kaynak == "veritabani":
+        ilceler = ilce_adlari_eslesen(normalize_ad(ilce), normalize_ad) if ilce else None
+        with asama("veritabani") as a:
+            if normal_okuma_min > 0:
+                kayitlar = okumalari_sorgula(ilkTarih, sonTarih, ilceler, normal_okuma_min)
+            else:
+                kayitlar = ozet_sorgula(ilkTarih, sonTarih, ilceler)
+            df = pd.DataFrame(kayitlar)
+            a.satir = len(df)
+    else:
+        if kaynak == "api":
+            bugun = datetime.now().strftime("%Y-%m-%d")
+            try:
+                df = pd.DataFrame(apiden_veri_cek(ilkTarih or bugun, sonTarih or bugun))
+            except Exception as e:
+                return {"HATA": f"Dış API'den veri çekilemedi: {str(e)}"}
+        else:
+            df = okuma_deposu.cerceve()
+        if not df.empty:
+            with asama("filtre") as a:
+                df = min_normal_filtrele(filtrele_cerceve(df, ilk_gun, son_gun, ilce), normal_okuma_min)
+                a.satir = len(df)
+
+    if ilk_gun is None or son_gun is None:
+        # Verilmeyen uç verideki ilk/son gün olur
+        gunler = tarih_ordinalleri(df).dropna() if not df.empty else pd.Series(dtype=float)
+        if gunler.empty:
+            return {"pencere": pencere, "tur": tur, "pencereler": [], "seriler": []}
+        ilk_gun = int(gunler.min()) if ilk_gun is None else ilk_gun
+        son_gun = int(gunler.max()) if son_gun is None else son_gun
+
+    with asama("puan") as a:
+        sonuc = puan_serisi(df, ilk_gun, son_gun, BOLGE_KATSAYILARI, pencere, tur, adim)
+        a.satir = len(sonuc["seriler"])
+    return {"pencere": pencere, "tur": tur, **sonuc}
+
+@app.get("/analiz-disa-aktar")
+def analiz_disa_aktar(
+    bicim: str = Query(default="ndjson", description="ndjson ya da csv"),
+    ilkTarih: Optional[str] = Query(None),
+    sonTarih: Optional[str] = Query(None),
+    ilce: Optional[str] = Query(None),
+    normal_okuma_min: int = 0,
+    alanlar: Optional[str] = Query(None, description="Dönecek alanlar, virgülle"),
+    haric: Optional[str] = Query(None, description="Çıkarılacak alanlar, virgülle"),
+):
+    # Personel karşılaştırma puanlarının tamamı, sırasız ve akış halinde. Kişiler
+    # partiler halinde puanlanır; veritabanında bellek kullanımı kişi sayısından
+    # bağımsızdır.
+    if bicim not in ("ndjson", "csv"):
+        return {"HATA": "bicim ndjson ya da csv olmalı."}
+    ilk_gun = tarih_ordinal(ilkTarih) if ilkTarih else None
+    son_gun = tarih_ordinal(sonTarih) if sonTarih else None
+    if (ilkTarih and ilk_gun is None) or (sonTarih and son_gun is None):
+        return TARIH_HATASI
+
+    kaynak = okuma_kaynagi()
+    if kaynak == "veritabani":
+        ilceler = ilce_adlari_eslesen(normalize_ad(ilce), normalize_ad) if ilce else None
+        try:
+            max_okuma = kisi_toplami_en_buyuk(ilkTarih, sonTarih, ilceler, normal_okuma_min)
+        except ValueError:
+            return TARIH_HATASI
+        partiler = kisi_partileri(kisi_sirali_kayitlar(ilkTarih, sonTarih, ilceler, normal_okuma_min))
+    else:
+        if kaynak == "api":
+            bugun = datetime.now().strftime("%Y-%m-%d")
+            try:
+                df = pd.DataFrame(apiden_veri_cek(ilkTarih or bugun, sonTarih or bugun))
+            except Exception as e:
+                return {"HATA": f"Dış API'den veri çekilemedi: {str(e)}"}
+        else:
+            df = okuma_deposu.cerceve()
+        if not df.empty:
+            df = min_normal_filtrele(filtrele_cerceve(df, ilk_gun, son_gun, ilce), normal_okuma_min)
+        max_okuma = cerceve_max_okuma(df)
+        partiler = cerceve_partileri(df)
+
+    satirlar = puan_partileri(partiler, max_okuma, BOLGE_KATSAYILARI)
+    if bicim == "csv":
+        return StreamingResponse(
+            csv_akisi(satirlar, alanlar, haric),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="personel_puanlari.csv"'},
+        )
+    return StreamingResponse(ndjson_akisi(satirlar, alanlar, haric), media_type="application/x-ndjson")
+
 # Aşağıdaki endpointlerde büyük değişiklik yok, ister veritabanını ister Excel'i kullanabilirsin
 @app.get("/filtre-alanlari")
-def filtre_alanlari():
-    session = SessionLocal()
-    try:
-        ilceler = session.query(Okuma.ilce).distinct().all()
-        kullanicilar = session.query(Okuma.kullanici_adi).distinct().all()
-        ilce_list = sorted(set(i[0] for i in ilceler if i[0]))
-        kullanici_list = sorted(set(k[0] for k in kullanicilar if k[0]))
-        return {
-            "ilceler": ilce_list,
-            "kullanicilar": kullanici_list,
-        }
-    finally:
-        session.close()
+async def filtre_alanlari(oturum=Depends(veritabani_oturumu)):
+    ilceler = (await oturum.execute(ILCE_LISTESI)).scalars().all()
+    kullanicilar = (await oturum.execute(KULLANICI_LISTESI)).scalars().all()
+    return {
+        "ilceler": sorted(set(i for i in ilceler if i)),
+        "kullanicilar": sorted(set(k for k in kullanicilar if k)),
+    }
 
 @app.get("/ortalama-okuma")
 def ortalama_okuma():
-    session = SessionLocal()
-    try:
-        rows = session.query(
-            Okuma.bolge,
-            func.avg(Okuma.toplam_okuma),
-            func.avg(Okuma.normal_okuma)
-        ).group_by(Okuma.bolge).all()
-        return {
-            row[0]: {
-                "ortalama_toplam_okuma": round(row[1] or 0, 2),
-                "ortalama_normal_okuma": round(row[2] or 0, 2)
-            } for row in rows if row[0]
-        }
-    finally:
-        session.close()
+    # Bellekteki bölge toplamlarından; yalnızca yeni okumalar eklenir
+    return bolge_istatistikleri.ortalamalar()
+
+@app.post("/veri-aktar")
+def veri_aktar(kayitlar: Optional[List[dict]] = Body(None), sifirla: bool = False):
+    # Gövde boşsa Excel dosyası, doluysa API JSON dökümü aktarılır
+    if kayitlar is None:
+        adet = dosyayi_aktar(EXCEL_DOSYASI, sifirla)
+    else:
+        adet = kayitlari_aktar(kayitlar, sifirla)
+    return {"status": "ok", "adet": adet}
 
 class ManuelDefaultInput(BaseModel):
     defter_sayisi: int
@@ -257,8 +789,54 @@ def default_hesapla(data: ManuelDefaultInput = Body(...)):
     )
     return sonuc
 
+async def _toplu_girdi(request):
+    # JSON listesi, ham CSV gövdesi ya da "dosya" alanlı form yüklemesi
+    icerik_turu = request.headers.get("content-type", "")
+    if icerik_turu.startswith("multipart/form-data"):
+        form = await request.form()
+        dosya = form.get("dosya")
+        if dosya is None or isinstance(dosya, str):
+            raise GirdiHatasi("Form yüklemesinde 'dosya' alanı gerekli.")
+        govde = await dosya.read()
+        icerik_turu = "json" if (dosya.filename or "").lower().endswith(".json") else "csv"
+    else:
+        govde = await request.body()
+    return await anyio.to_thread.run_sync(girdi_cercevesi, govde, icerik_turu)
+
+@app.post("/default-hesapla/toplu")
+async def default_hesapla_toplu(request: Request):
+    # /default-hesapla'nın çok girdili sürümü; sonuçlar girdi sırasıyla
+    try:
+        df = await _toplu_girdi(request)
+        sonuc = await anyio.to_thread.run_sync(toplu_default_hesapla, df)
+    except GirdiHatasi as e:
+        return {"HATA": str(e)}
+    return HizliJSONResponse(content={"sonuclar": sonuc})
+
+@app.post("/puan-hesapla/toplu")
+async def puan_hesapla_toplu(
+    request: Request,
+    alpha: Optional[List[float]] = Query(None),
+    beta: Optional[List[float]] = Query(None),
+    gamma: Optional[List[float]] = Query(None),
+):
+    # hesapla_puan girdileri: normal_okuma, toplam_okuma, bolge_ortalama,
+    # isteğe bağlı bolge_katsayi, aktif_gun, toplam_gun. alpha/beta/gamma
+    # birden çok verilebilir (?alpha=0.5&alpha=0.65); her kombinasyon için
+    # puan matrisinin bir satırı döner.
+    try:
+        df = await _toplu_girdi(request)
+        sonuc = await anyio.to_thread.run_sync(toplu_puan_hesapla, df, alpha, beta, gamma)
+    except GirdiHatasi as e:
+        return {"HATA": str(e)}
+    return HizliJSONResponse(content=sonuc)
+
 @app.exception_handler(Exception)
 async def all_exception_handler(request: Request, exc: Exception):
+    # Yanıt genel kalır ama hata kaybolmasın: iz loga, sayısı /metrics'e
+    # (http_hata_toplam, olcum_middleware) yazılır
+    print(f"Yakalanmamış hata ({request.method} {request.url.path}):")
+    traceback.print_exception(exc)
     return JSONResponse(
         status_code=500,
         content={"message": f"Internal server error: {exc}"}
@@ -266,39 +844,25 @@ async def all_exception_handler(request: Request, exc: Exception):
 
 @app.get("/guncelle-bolge-ortalamalari")
 def guncelle_bolge_ortalamalari():
-    session = SessionLocal()
-    try:
-        rows = session.query(
-            Okuma.bolge,
-            func.avg(Okuma.toplam_okuma),
-            func.avg(Okuma.normal_okuma)
-        ).group_by(Okuma.bolge).all()
-        data = {
-            row[0]: {
-                "ortalama_toplam_okuma": round(row[1] or 0, 2),
-                "ortalama_normal_okuma": round(row[2] or 0, 2)
-            } for row in rows if row[0]
-        }
-        with open("bolge_ortalamalari.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return {"status": "ok", "adet": len(data)}
-    finally:
-        session.close()
+    # Toplamları tablodan baştan kurar ve anlık görüntüyü yeniden yazar
+    data = bolge_istatistikleri.guncelle(yeniden_kur=True)
+    return {"status": "ok", "adet": len(data)}
 
 @app.get("/test-okuma-kayitlari")
-def test_okuma_kayitlari():
-    session = SessionLocal()
-    try:
-        kayitlar = session.query(Okuma).limit(5).all()
-        return [
-            {
-                "bolge": k.bolge,
-                "toplam_okuma": k.toplam_okuma,
-                "normal_okuma": k.normal_okuma,
-                "ad_soyad": k.ad_soyad,
-                "tarih": str(k.tarih),
-            }
-            for k in kayitlar
-        ]
-    finally:
-        session.close()
+async def test_okuma_kayitlari(oturum=Depends(veritabani_oturumu)):
+    sorgu = select(
+        Okuma.bolge, Okuma.toplam_okuma, Okuma.normal_okuma, Okuma.ad_soyad, Okuma.tarih
+    ).order_by(Okuma.id).limit(5)
+    kayitlar = (await oturum.execute(sorgu)).all()
+    return [
+        {
+            "bolge": k.bolge,
+            "toplam_okuma": k.toplam_okuma,
+            "normal_okuma": k.normal_okuma,
+            "ad_soyad": k.ad_soyad,
+            "tarih": str(k.tarih),
+        }
+        for k in kayitlar
+    ]
+
+BASLANGIC_OLCUMU["ice_aktarma_sn"] = _baslangictan_beri()
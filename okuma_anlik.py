@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, datetime, time
+from functools import lru_cache
+
+from tembel_modul import tembel_modul
+
+np = tembel_modul("numpy")
+pd = tembel_modul("pandas")
+
+# Excel okumalarının sütunlu anlık görüntüsü. Çalışma kitabı (tarihleri
+# çevrilmiş olarak) kaynak dosyanın mtime/boyutu başına bir kez yazılır;
+# sonraki yüklemeler ve diğer worker süreçleri openpyxl yerine bu dosyaları
+# bellek eşlemeli (mmap) açar. Sayısal sütunlar kopyalanmadan doğrudan
+# dosyadan okunur; böylece aynı makinedeki worker'lar tek bir sayfa önbelleği
+# kopyasını paylaşır.
+#
+# pyarrow kuruluysa Arrow IPC (Feather v2, sıkıştırmasız) dosyası kullanılır;
+# değilse her sütun ayrı bir .npy dosyasıdır. Metin (ve saat gibi nesne)
+# sütunları kod dizisi + tekil değerler olarak yazılır ve kategorik sütun
+# olarak açılır: kodlar dosyadan eşlenir, süreç başına yalnızca tekil değerler
+# çözülür. Dosyalar pickle içermez (allow_pickle=False ile okunur).
+#
+#   OKUMA_ANLIK_GORUNTU : "0" ise kapalı (her yüklemede Excel okunur)
+#   OKUMA_ANLIK_KLASORU : görüntülerin yazılacağı klasör (varsayılan
+#                         kaynak dosyanın yanında .okuma_anlik)
+
+ETKIN = os.environ.get("OKUMA_ANLIK_GORUNTU", "1") != "0"
+SURUM = 2
+
+@lru_cache(maxsize=None)
+def _pyarrow():
+    # pyarrow kuruluysa bile yalnızca ilk görüntü işleminde içe aktarılır
+    try:
+        import pyarrow.feather
+    except ImportError:
+        return None
+    return pyarrow
+
+def _klasor(kaynak):
+    return os.environ.get("OKUMA_ANLIK_KLASORU") or os.path.join(
+        os.path.dirname(os.path.abspath(kaynak)), ".okuma_anlik"
+    )
+
+def _goruntu_adi(kaynak):
+    st = os.stat(kaynak)
+    bicim = "arrow" if _pyarrow() is not None else "npy"
+    return f"{os.path.basename(kaynak)}-{st.st_mtime_ns}-{st.st_size}-v{SURUM}-{bicim}"
+
+# ------------------ NPY BİÇİMİ ------------------
+# Metin olmayan tekil değerler metin olarak yazılır; türleri ayrı bir uint8
+# dizisinde bu sıradaki indeksleriyle tutulur. bool int'ten, datetime
+# date'ten önce denenir.
+_TEKIL_TURLERI = (
+    (str, str, str),
+    (bool, lambda v: "1" if v else "", bool),
+    (int, str, int),
+    (float, repr, float),
+    (datetime, datetime.isoformat, datetime.fromisoformat),
+    (date, date.isoformat, date.fromisoformat),
+    (time, time.isoformat, time.fromisoformat),
+)
+
+def _tekil_turu(deger):
+    for i, (tur, _, _) in enumerate(_TEKIL_TURLERI):
+        if isinstance(deger, tur):
+            return i
+    raise TypeError(f"Anlık görüntüye yazılamayan değer türü: {type(deger).__name__}")
+
+def _kod_turu(tekil_sayisi):
+    # pandas'ın kategorik kodlar için seçtiği tür; kodlar kopyalanmadan kullanılır
+    for tur in (np.int8, np.int16, np.int32):
+        if tekil_sayisi < np.iinfo(tur).max:
+            return tur
+    return np.int64
+
+def _npy_yaz(df, klasor):
+    sutunlar = []
+    for i, ad in enumerate(df.columns):
+        seri = df[ad]
+        if isinstance(seri.dtype, np.dtype) and seri.dtype.kind in "biufcmM":
+            np.save(os.path.join(klasor, f"{i}.npy"), seri.to_numpy())
+            sutunlar.append({"ad": ad, "tur": "dizi"})
+            continue
+        kodlar, tekiller = pd.factorize(seri)
+        tekiller = [v.item() if isinstance(v, np.generic) else v for v in tekiller]
+        turler = [_tekil_turu(v) for v in tekiller]
+        metinler = [_TEKIL_TURLERI[t][1](v) for v, t in zip(tekiller, turler)]
+        np.save(os.path.join(klasor, f"{i}.npy"), kodlar.astype(_kod_turu(len(tekiller))))
+        np.save(os.path.join(klasor, f"{i}.tekil.npy"), np.array(metinler, dtype=str))
+        sutun = {"ad": ad, "tur": "kodlu"}
+        if any(turler):
+            np.save(os.path.join(klasor, f"{i}.tur.npy"), np.array(turler, dtype=np.uint8))
+            sutun["turlu"] = True
+        sutunlar.append(sutun)
+    with open(os.path.join(klasor, "sutunlar.json"), "w", encoding="utf-8") as f:
+        json.dump(sutunlar, f, ensure_ascii=False)
+
+def _npy_oku(klasor):
+    with open(os.path.join(klasor, "sutunlar.json"), "r", encoding="utf-8") as f:
+        sutunlar = json.load(f)
+    veri = {}
+    for i, s in enumerate(sutunlar):
+        dizi = np.load(os.path.join(klasor, f"{i}.npy"), mmap_mode="r", allow_pickle=False)
+        if s["tur"] == "dizi":
+            veri[s["ad"]] = dizi
+            continue
+        tekiller = np.load(os.path.join(klasor, f"{i}.tekil.npy"), allow_pickle=False)
+        if s.get("turlu"):
+            turler = np.load(os.path.join(klasor, f"{i}.tur.npy"), allow_pickle=False)
+            tekiller = pd.Index([_TEKIL_TURLERI[t][2](m) for m, t in zip(tekiller.tolist(), turler.tolist())], dtype=object)
+        else:
+            tekiller = pd.Index(tekiller)
+        # Eksik değer kodu -1 (NaN). Kodlar dosyadan eşlenmiş hâliyle kalır.
+        kategorik = pd.Categorical.from_codes(dizi, categories=tekiller, validate=False)
+        veri[s["ad"]] = pd.Series(kategorik, copy=False)
+    return pd.DataFrame(veri, copy=False)
+
+# ------------------ ARROW BİÇİMİ ------------------
+def _arrow_yaz(df, klasor):
+    _pyarrow().feather.write_feather(df, os.path.join(klasor, "okumalar.arrow"), compression="uncompressed")
+
+def _arrow_oku(klasor):
+    tablo = _pyarrow().feather.read_table(os.path.join(klasor, "okumalar.arrow"), memory_map=True)
+    return tablo.to_pandas(split_blocks=True)
+
+# ------------------ GÖRÜNTÜ ------------------
+def _oku(yol):
+    return _arrow_oku(yol) if _pyarrow() is not None else _npy_oku(yol)
+
+def _yaz(df, kok, ad):
+    # Geçici klasöre yazılıp tek rename ile yayınlanır; aynı anda çeviren
+    # başka bir worker önce davrandıysa bizim kopyamız atılır
+    os.makedirs(kok, exist_ok=True)
+    gecici = tempfile.mkdtemp(dir=kok, prefix=".yaziliyor-")
+    try:
+        (_arrow_yaz if _pyarrow() is not None else _npy_yaz)(df, gecici)
+        os.rename(gecici, os.path.join(kok, ad))
+    except OSError:
+        shutil.rmtree(gecici, ignore_errors=True)
+        if not os.path.isdir(os.path.join(kok, ad)):
+            raise
+    _eskileri_sil(kok, ad)
+
+def _eskileri_sil(kok, guncel):
+    # Kaynağın eski sürümlerinin görüntüleri. Onları hâlâ eşlemiş süreçler
+    # etkilenmez (Linux'ta dosya son eşleme kapanınca silinir).
+    for ad in os.listdir(kok):
+        if ad != guncel and not ad.startswith("."):
+            shutil.rmtree(os.path.join(kok, ad), ignore_errors=True)
+
+def anlik_goruntu_ile_oku(kaynak, cevirici):
+    """kaynak için güncel görüntü varsa onu açar; yoksa cevirici(kaynak) ile
+    okuyup görüntüyü yazar. (df, goruntuden_mi) döner.
+
+    Yeni yazılan görüntü de açılarak döndürülür; böylece sütun türleri
+    (metin sütunları kategorik) hangi worker'ın çevirdiğine bağlı olmaz.
+    Görüntü okunamaz ya da yazılamazsa çevirici sonucu yine döner; anlık
+    görüntü yalnızca hızlandırmadır.
+    """
+    kok = _klasor(kaynak)
+    ad = _goruntu_adi(kaynak)
+    yol = os.path.join(kok, ad)
+    if os.path.isdir(yol):
+        try:
+            return _oku(yol), True
+        except Exception as e:
+            print(f"Anlık görüntü okunamadı, Excel'den okunuyor: {e}")
+            shutil.rmtree(yol, ignore_errors=True)
+    df = cevirici(kaynak)
+    try:
+        # Okurken dosya değiştiyse içerik bu imzaya ait olmayabilir
+        if _goruntu_adi(kaynak) == ad:
+            _yaz(df, kok, ad)
+            return _oku(yol), False
+    except Exception as e:
+        print(f"Anlık görüntü yazılamadı: {e}")
+    return df, False
@@ -0,0 +1,181 @@
+import bisect
+import contextvars
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# İstek ve aşama süreleri, satır sayıları ve önbellek isabetleri için hafif
+# ölçüm katmanı. Değerler süreç içinde tutulur ve /metrics'te Prometheus
+# metin biçiminde sunulur (ek bağımlılık yok).
+
+SURE_ARALIKLARI = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SATIR_ARALIKLARI = (0, 10, 100, 1000, 10000, 100000, 1000000, 10000000)
+
+# Middleware isteğin endpoint yolunu buraya yazar; aşamalar etiketini buradan alır
+aktif_endpoint = contextvars.ContextVar("aktif_endpoint", default="-")
+
+def _etiket_metni(etiketler):
+    if not etiketler:
+        return ""
+    parcalar = []
+    for ad, deger in etiketler:
+        deger = str(deger).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parcalar.append(f'{ad}="{deger}"')
+    return "{" + ",".join(parcalar) + "}"
+
+def _sayi(deger):
+    return repr(float(deger)) if isinstance(deger, float) else str(deger)
+
+class Sayac:
+    def __init__(self, ad, aciklama, etiket_adlari):
+        self.ad = ad
+        self.aciklama = aciklama
+        self.etiket_adlari = etiket_adlari
+        self._kilit = threading.Lock()
+        self._degerler = {}
+
+    def artir(self, *etiketler, miktar=1):
+        with self._kilit:
+            self._degerler[etiketler] = self._degerler.get(etiketler, 0) + miktar
+
+    def satirlar(self):
+        yield f"# HELP {self.ad} {self.aciklama}"
+        yield f"# TYPE {self.ad} counter"
+        with self._kilit:
+            degerler = list(self._degerler.items())
+        for etiketler, deger in degerler:
+            yield f"{self.ad}{_etiket_metni(zip(self.etiket_adlari, etiketler))} {_sayi(deger)}"
+
+class Histogram:
+    def __init__(self, ad, aciklama, etiket_adlari, araliklar=SURE_ARALIKLARI):
+        self.ad = ad
+        self.aciklama = aciklama
+        self.etiket_adlari = etiket_adlari
+        self.araliklar = araliklar
+        self._kilit = threading.Lock()
+        self._degerler = {}  # etiketler -> [kova sayıları, toplam, adet]
+
+    def gozlemle(self, deger, *etiketler):
+        i = bisect.bisect_left(self.araliklar, deger)
+        with self._kilit:
+            kayit = self._degerler.get(etiketler)
+            if kayit is None:
+                kayit = self._degerler[etiketler] = [[0] * (len(self.araliklar) + 1), 0.0, 0]
+            kayit[0][i] += 1
+            kayit[1] += deger
+            kayit[2] += 1
+
+    def satirlar(self):
+        yield f"# HELP {self.ad} {self.aciklama}"
+        yield f"# TYPE {self.ad} histogram"
+        with self._kilit:
+            degerler = [(e, (list(k[0]), k[1], k[2])) for e, k in self._degerler.items()]
+        for etiketler, (kovalar, toplam, adet) in degerler:
+            etiket_ciftleri = list(zip(self.etiket_adlari, etiketler))
+            birikimli = 0
+            for sinir, sayi in zip(self.araliklar, kovalar):
+                birikimli += sayi
+                yield f"{self.ad}_bucket{_etiket_metni(etiket_ciftleri + [('le', _sayi(sinir))])} {birikimli}"
+            yield f"{self.ad}_bucket{_etiket_metni(etiket_ciftleri + [('le', '+Inf')])} {adet}"
+            yield f"{self.ad}_sum{_etiket_metni(etiket_ciftleri)} {_sayi(toplam)}"
+            yield f"{self.ad}_count{_etiket_metni(etiket_ciftleri)} {adet}"
+
+ISTEK_SURESI = Histogram(
+    "http_istek_suresi_saniye", "HTTP istek süresi", ("endpoint", "method", "durum"))
+ASAMA_SURESI = Histogram(
+    "asama_suresi_saniye", "İstek içindeki aşama süresi", ("endpoint", "asama"))
+ASAMA_SATIRI = Histogram(
+    "asama_satir_sayisi", "Aşamadan çıkan satır sayısı", ("endpoint", "asama"), SATIR_ARALIKLARI)
+ONBELLEK = Sayac(
+    "onbellek_sonuc_toplam", "Önbellek isabet / ıska / paylaşılan / 304 sayısı", ("endpoint", "sonuc"))
+HATALAR = Sayac(
+    "http_hata_toplam", "Yakalanmamış istisnalar", ("endpoint", "tur"))
+
+METRIKLER = [ISTEK_SURESI, ASAMA_SURESI, ASAMA_SATIRI, ONBELLEK, HATALAR]
+
+class Asama:
+    __slots__ = ("satir",)
+
+    def __init__(self):
+        self.satir = None
+
+@contextmanager
+def asama(ad):
+    """Bir istek aşamasını ölçer. Satır sayısı varsa `a.satir = ...` ile verilir.
+
+        with asama("filtre") as a:
+            veriler = ...
+            a.satir = len(veriler)
+    """
+    kayit = Asama()
+    baslangic = time.perf_counter()
+    try:
+        yield kayit
+    finally:
+        endpoint = aktif_endpoint.get()
+        ASAMA_SURESI.gozlemle(time.perf_counter() - baslangic, endpoint, ad)
+        if kayit.satir is not None:
+            ASAMA_SATIRI.gozlemle(kayit.satir, endpoint, ad)
+
+def onbellek_sonucu(sonuc):
+    ONBELLEK.artir(aktif_endpoint.get(), sonuc)
+
+def prometheus_metni(ek_satirlar=()):
+    satirlar = []
+    for metrik in METRIKLER:
+        satirlar.extend(metrik.satirlar())
+    satirlar.extend(ek_satirlar)
+    return "\n".join(satirlar) + "\n"
+
+def gosterge_satirlari(ad, aciklama, degerler):
+    # /metrics anında okunan değerler (önbellek boyutu vb.)
+    yield f"# HELP {ad} {aciklama}"
+    yield f"# TYPE {ad} gauge"
+    for etiketler, deger in degerler:
+        yield f"{ad}{_etiket_metni(etiketler)} {_sayi(deger)}"
+
+# ------------------ ÖRNEKLEMELİ PROFİLLEYİCİ ------------------
+# En üstteki çerçevesi bunlardan biri olan thread boşta bekliyor sayılır
+_BOSTA = {"wait", "select", "poll", "_wait_for_tstate_lock"}
+
+class OrneklemeliProfil:
+    """İstek sürerken çalışan thread'lerin yığınlarını aralik saniyede bir örnekler.
+
+    Çıktı "katlanmış yığın" biçimindedir (flamegraph.pl / speedscope ile
+    açılabilir). Tüm thread'ler örneklendiğinden aynı anda çalışan başka
+    istekler de çıktıya karışabilir; tek istek incelemesi içindir.
+    """
+
+    def __init__(self, aralik=0.005):
+        self.aralik = aralik
+        self.yiginlar = Counter()
+        self.ornek_sayisi = 0
+        self._dur = threading.Event()
+        self._thread = threading.Thread(target=self._calis, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._dur.set()
+        self._thread.join()
+
+    def _calis(self):
+        kendi = threading.get_ident()
+        while not self._dur.wait(self.aralik):
+            for thread_id, cerceve in sys._current_frames().items():
+                if thread_id == kendi or cerceve.f_code.co_name in _BOSTA:
+                    continue
+                yigin = []
+                while cerceve is not None:
+                    kod = cerceve.f_code
+                    yigin.append(f"{kod.co_name} ({kod.co_filename.rsplit('/', 1)[-1]})")
+                    cerceve = cerceve.f_back
+                self.yiginlar[";".join(reversed(yigin))] += 1
+            self.ornek_sayisi += 1
+
+    def katlanmis(self):
+        return "\n".join(f"{yigin} {sayi}" for yigin, sayi in self.yiginlar.most_common()) + "\n"
@@ -0,0 +1,139 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from json_yanit import json_bayt
+
+# ------------------ VERİ SÜRÜMÜ ------------------
+class VeriSurumu:
+    # Okumalar değiştiğinde (Excel yeniden yüklendi, veritabanına aktarım
+    # yapıldı) artırılır; önbellek anahtarları bu değeri içerir.
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self.deger = 0
+
+    def artir(self):
+        with self._kilit:
+            self.deger += 1
+            return self.deger
+
+veri_surumu = VeriSurumu()
+
+# ------------------ SONUÇ ÖNBELLEĞİ ------------------
+def etag_hesapla(icerik):
+    return '"' + hashlib.sha1(json_bayt(icerik)).hexdigest() + '"'
+
+class SonucOnbellegi:
+    """Analiz sonuçları için LRU + TTL önbellek.
+
+    Anahtarlar normalize edilmiş sorgu parametreleridir. Kayıtlar veri sürümü
+    değişince geçersiz sayılır; TTL ise aynı veritabanını paylaşan diğer
+    worker süreçlerinde yapılan aktarımların en geç ne kadar sonra
+    görüleceğini belirler.
+    """
+
+    def __init__(self, max_boyut=256, ttl=300):
+        self.max_boyut = max_boyut
+        self.ttl = ttl
+        self._kilit = threading.Lock()
+        self._kayitlar = OrderedDict()
+        self._isabet = 0
+        self._iska = 0
+
+    def al(self, anahtar):
+        # (sonuc, etag) ya da None döner
+        simdi = time.monotonic()
+        with self._kilit:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is not None:
+                zaman, surum, sonuc, etag = kayit
+                if surum == veri_surumu.deger and simdi - zaman < self.ttl:
+                    self._kayitlar.move_to_end(anahtar)
+                    self._isabet += 1
+                    return sonuc, etag
+                del self._kayitlar[anahtar]
+            self._iska += 1
+            return None
+
+    def koy(self, anahtar, sonuc, surum):
+        etag = etag_hesapla(sonuc)
+        with self._kilit:
+            self._kayitlar[anahtar] = (time.monotonic(), surum, sonuc, etag)
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.max_boyut:
+                self._kayitlar.popitem(last=False)
+        return etag
+
+    def temizle(self):
+        with self._kilit:
+            self._kayitlar.clear()
+
+    def istatistikler(self):
+        return {
+            "boyut": len(self._kayitlar),
+            "max_boyut": self.max_boyut,
+            "ttl_sn": self.ttl,
+            "isabet": self._isabet,
+            "iska": self._iska,
+            "veri_surumu": veri_surumu.deger,
+        }
+
+# ------------------ TEK UÇUŞ ------------------
+class _Ucus:
+    __slots__ = ("olay", "sonuc", "hata", "bekleyen")
+
+    def __init__(self):
+        self.olay = threading.Event()
+        self.sonuc = None
+        self.hata = None
+        self.bekleyen = 0
+
+class TekUcus:
+    """Aynı anahtarla eşzamanlı gelen hesaplamaları tek çalıştırmada birleştirir.
+
+    İlk gelen istek hesaplar; o sürerken aynı anahtarla gelenler bekler ve
+    aynı sonucu (ya da aynı hatayı) alır. Hesaplama bitince anahtar
+    bırakılır; sonraki istekler için önbellek SonucOnbellegi'dir.
+    """
+
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self._ucuslar = {}
+        self.hesaplama = 0
+        self.paylasilan = 0
+
+    def calistir(self, anahtar, fonksiyon):
+        # (sonuc, paylasildi_mi) döner
+        with self._kilit:
+            ucus = self._ucuslar.get(anahtar)
+            if ucus is None:
+                ucus = self._ucuslar[anahtar] = _Ucus()
+                lider = True
+                self.hesaplama += 1
+            else:
+                lider = False
+                ucus.bekleyen += 1
+                self.paylasilan += 1
+        if not lider:
+            ucus.olay.wait()
+            if ucus.hata is not None:
+                raise ucus.hata
+            return ucus.sonuc, True
+        try:
+            ucus.sonuc = fonksiyon()
+            return ucus.sonuc, False
+        except BaseException as e:
+            ucus.hata = e
+            raise
+        finally:
+            with self._kilit:
+                del self._ucuslar[anahtar]
+            ucus.olay.set()
+
+    def istatistikler(self):
+        return {
+            "hesaplama": self.hesaplama,
+            "paylasilan": self.paylasilan,
+            "ucustaki": len(self._ucuslar),
+        }
@@ -0,0 +1,154 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from analiz_fonksiyonlar import okuma_sayisi
+from analiz_vektorel import kisi_ozeti, puan_sonuclari, puanlama_cercevesi, _sutun
+from tarih_yardimci import tarih_ordinal
+from tembel_modul import tembel_modul
+
+np = tembel_modul("numpy")
+pd = tembel_modul("pandas")
+
+# Personel karşılaştırma puanlamasını süreç havuzuna dağıtır. İşçilere sözlük
+# listeleri yerine sıkıştırılmış sütun dizileri (kişi kodu, toplam, normal,
+# gün numarası) gönderilir. Kişiler bölgelerine göre parçalara ayrılır; her
+# işçi kendi bölgelerinin kişi özetini çıkarır, max_okuma normalizasyonu
+# birleştirmeden sonra bütün kişiler üzerinden yapılır.
+#
+#   ANALIZ_ISCI_SAYISI  : havuzdaki süreç sayısı (0: kapalı, varsayılan)
+#   ANALIZ_PARALEL_ESIK : bu satır sayısının altında puanlama süreç içinde kalır
+
+ISCI_SAYISI = int(os.environ.get("ANALIZ_ISCI_SAYISI", "0"))
+PARALEL_ESIK = int(os.environ.get("ANALIZ_PARALEL_ESIK", "100000"))
+
+_havuz = None
+_havuz_kilidi = threading.Lock()
+
+def havuz():
+    global _havuz
+    with _havuz_kilidi:
+        if _havuz is None:
+            _havuz = ProcessPoolExecutor(max_workers=ISCI_SAYISI)
+        return _havuz
+
+def havuzu_kapat():
+    global _havuz
+    with _havuz_kilidi:
+        if _havuz is not None:
+            _havuz.shutdown(wait=False, cancel_futures=True)
+            _havuz = None
+
+# ------------------ SÜTUN DİZİLERİ ------------------
+def _cerceveden_diziler(df):
+    cerceve = puanlama_cercevesi(df)
+    kodlar, adlar = pd.factorize(cerceve["AD_SOYAD"], use_na_sentinel=False)
+    # factorize kodları ilk görülme sırasıyla verir; kişinin ilk satırı:
+    _, ilk_konum = np.unique(kodlar, return_index=True)
+    ilk_satirlar = df.iloc[ilk_konum]
+    return {
+        "kodlar": kodlar,
+        "toplam": cerceve["TOPLAM_OKUMA"].to_numpy(),
+        "normal": cerceve["NORMAL_OKUMA"].to_numpy(),
+        "gunler": cerceve["TARIH_ORD"].to_numpy(dtype=float),
+        "adlar": list(adlar),
+        "bolgeler": _sutun(ilk_satirlar, "BOLGE", "").tolist(),
+        "kullanici_adlari": _sutun(ilk_satirlar, "KULLANICI_ADI", None).tolist(),
+    }
+
+def _kayitlardan_diziler(veriler):
+    # Sözlük listesinden tek geçişte; kişi başına ilk kaydın BOLGE/KULLANICI_ADI'sı
+    kod_haritasi = {}
+    adlar, bolgeler, kullanici_adlari = [], [], []
+    kodlar, toplam, normal, gunler = [], [], [], []
+    for v in veriler:
+        ad = v.get("AD_SOYAD", "")
+        kod = kod_haritasi.get(ad)
+        if kod is None:
+            kod = kod_haritasi[ad] = len(adlar)
+            adlar.append(ad)
+            bolgeler.append(v.get("BOLGE", ""))
+            kullanici_adlari.append(v.get("KULLANICI_ADI"))
+        kodlar.append(kod)
+        toplam.append(okuma_sayisi(v.get("TOPLAM_OKUMA")))
+        normal.append(okuma_sayisi(v.get("NORMAL_OKUMA")))
+        gun = tarih_ordinal(v.get("TARIH")) if v.get("TARIH") else None
+        gunler.append(np.nan if gun is None else gun)
+    return {
+        "kodlar": np.array(kodlar, dtype=np.int64),
+        "toplam": np.array(toplam),
+        "normal": np.array(normal),
+        "gunler": np.array(gunler, dtype=float),
+        "adlar": adlar,
+        "bolgeler": bolgeler,
+        "kullanici_adlari": kullanici_adlari,
+    }
+
+def bolge_parcalari(kodlar, bolgeler, parca_sayisi):
+    # Kişi -> parça numarası. Bölgeler satır sayısına göre büyükten küçüğe en
+    # az yüklü parçaya atanır; bir bölgenin bütün kişileri aynı parçadadır.
+    kisi_satiri = np.bincount(kodlar, minlength=len(bolgeler))
+    bolge_satiri = {}
+    for bolge, satir in zip(bolgeler, kisi_satiri.tolist()):
+        bolge_satiri[bolge] = bolge_satiri.get(bolge, 0) + satir
+    yuk = [0] * parca_sayisi
+    bolge_parcasi = {}
+    for bolge, satir in sorted(bolge_satiri.items(), key=lambda x: -x[1]):
+        parca = yuk.index(min(yuk))
+        bolge_parcasi[bolge] = parca
+        yuk[parca] += satir
+    return np.array([bolge_parcasi[b] for b in bolgeler], dtype=np.int64)
+
+# ------------------ İŞÇİ ------------------
+def _parca_ozeti(kodlar, toplam, normal, gunler, kisi_bolgeleri, bolge_ortalamalari):
+    # İşçi sürecinde çalışır; AD_SOYAD yerine kişi kodları kullanılır
+    cerceve = pd.DataFrame({
+        "AD_SOYAD": kodlar,
+        "TOPLAM_OKUMA": toplam,
+        "NORMAL_OKUMA": normal,
+        "TARIH_ORD": gunler,
+    })
+    sirali = pd.unique(kodlar)
+    ozet = kisi_ozeti(cerceve, [kisi_bolgeleri[k] for k in sirali.tolist()], bolge_ortalamalari)
+    ozet["ad"] = sirali
+    del ozet["bolge"]
+    return ozet
+
+_SAYISAL_ALANLAR = ("toplam_okuma", "toplam_normal", "aktif_gun", "duzenlilik", "bolge_katsayi", "puan")
+
+def paralel_puanla(veri, bolge_ortalamalari):
+    """personel_karsilastirma_analizi(_vektorel) ile aynı sonucu süreç havuzunda üretir.
+
+    veri DataFrame ya da sözlük listesi olabilir. Havuz kapalıysa ya da satır
+    sayısı eşiğin altındaysa None döner; çağıran süreç içi yolu kullanır.
+    """
+    if ISCI_SAYISI <= 0 or len(veri) < PARALEL_ESIK:
+        return None
+    diziler = _cerceveden_diziler(veri) if isinstance(veri, pd.DataFrame) else _kayitlardan_diziler(veri)
+    kodlar = diziler["kodlar"]
+    bolgeler = diziler["bolgeler"]
+    kisi_parcasi = bolge_parcalari(kodlar, bolgeler, ISCI_SAYISI)
+    satir_parcasi = kisi_parcasi[kodlar]
+
+    isler = []
+    for parca in range(ISCI_SAYISI):
+        maske = satir_parcasi == parca
+        if not maske.any():
+            continue
+        kisi_bolgeleri = {int(k): bolgeler[k] for k in np.flatnonzero(kisi_parcasi == parca).tolist()}
+        isler.append(havuz().submit(
+            _parca_ozeti, kodlar[maske], diziler["toplam"][maske], diziler["normal"][maske],
+            diziler["gunler"][maske], kisi_bolgeleri, bolge_ortalamalari,
+        ))
+
+    # Parça özetleri kişi kodu sırasına (ilk görülme sırası) yerleştirilir
+    parcalar = [is_.result() for is_ in isler]
+    konumlar = np.concatenate([p["ad"] for p in parcalar])
+    ozet = {}
+    for alan in _SAYISAL_ALANLAR:
+        degerler = np.concatenate([p[alan] for p in parcalar])
+        ozet[alan] = np.empty(len(degerler), dtype=degerler.dtype)
+        ozet[alan][konumlar] = degerler
+    ozet["ad"] = diziler["adlar"]
+    ozet["bolge"] = bolgeler
+    return puan_sonuclari(ozet, diziler["kullanici_adlari"])
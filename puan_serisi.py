@@ -0,0 +1,204 @@
+import math
+import os
+from datetime import date, timedelta
+
+from analiz_vektorel import (
+    _KATEGORILER,
+    _bolge_ortalamasi,
+    _math_uygula,
+    _sutun,
+    hesapla_puan_dizi,
+    kategori_indeksleri,
+    tarih_ordinalleri,
+)
+from analiz_fonksiyonlar import get_bolge_katsayi, kullanici_adi_veya_tire
+from tembel_modul import tembel_modul
+
+np = tembel_modul("numpy")
+pd = tembel_modul("pandas")
+
+# Kişi başına zaman pencereli PUAN serisi. Satırlar bir kez kişi x gün
+# matrisine toplanır ve gün ekseninde önek toplamları alınır; her pencere
+# için toplam, normal ve aktif gün iki önek toplamı farkıdır. Pencere başına
+# puanlar /analiz'in o tarih aralığı için vereceği PUAN ile aynıdır.
+#
+# Matrisler kişi parçaları halinde kurulur; bir parçadaki kişi x gün hücresi
+# (min tablosunun seviyeleri dahil) PUAN_SERISI_PARCA_HUCRE'yi geçmez. Tarih
+# verilmeyen uzun aralıklarda bellek kişi sayısıyla büyümez.
+
+PENCERE_GUN = {"gun": 1, "hafta": 7, "ay": 30}
+PARCA_HUCRE = int(os.environ.get("PUAN_SERISI_PARCA_HUCRE", "4000000"))
+
+def pencereler(ilk_gun, son_gun, pencere="hafta", tur="ardisik", adim=1):
+    """[(ilk_ordinal, son_ordinal), ...]
+
+    ardisik: takvime hizalı, örtüşmeyen pencereler (gün, ISO haftası,
+    takvim ayı); uçtakiler aralığa göre kırpılır.
+    kayan: 1/7/30 günlük pencereler, aralık içinde adim gün kayarak.
+    """
+    if pencere not in PENCERE_GUN:
+        raise ValueError("pencere gun, hafta ya da ay olmalı.")
+    if tur == "kayan":
+        uzunluk = PENCERE_GUN[pencere]
+        return [(bitis - uzunluk + 1, bitis) for bitis in range(ilk_gun + uzunluk - 1, son_gun + 1, max(adim, 1))]
+    if tur != "ardisik":
+        raise ValueError("tur ardisik ya da kayan olmalı.")
+    sonuc = []
+    gun = ilk_gun
+    while gun <= son_gun:
+        t = date.fromordinal(gun)
+        if pencere == "gun":
+            bitis = gun
+        elif pencere == "hafta":
+            bitis = gun + (6 - t.weekday())
+        else:
+            sonraki_ay = (t.replace(day=28) + timedelta(days=4)).replace(day=1)
+            bitis = sonraki_ay.toordinal() - 1
+        bitis = min(bitis, son_gun)
+        sonuc.append((gun, bitis))
+        gun = bitis + 1
+    return sonuc
+
+def _sonraki_aktif(aktif):
+    # Her gün için o gün ya da sonraki ilk aktif günün indeksi (yoksa D)
+    d = aktif.shape[1]
+    indeks = np.where(aktif, np.arange(d), d)
+    return np.minimum.accumulate(indeks[:, ::-1], axis=1)[:, ::-1]
+
+def _onceki_aktif(aktif):
+    # Her gün için o gün ya da önceki son aktif günün indeksi (yoksa -1)
+    indeks = np.where(aktif, np.arange(aktif.shape[1]), -1)
+    return np.maximum.accumulate(indeks, axis=1)
+
+class _MinTablosu:
+    # Gün ekseninde aralık minimumu (seyrek tablo): O(D log D) kurulum, O(1) sorgu
+    def __init__(self, dizi):
+        self.seviyeler = [dizi]
+        k = 1
+        while 2 * k <= dizi.shape[1]:
+            onceki = self.seviyeler[-1]
+            self.seviyeler.append(np.minimum(onceki[:, :-k], onceki[:, k:]))
+            k *= 2
+
+    def sorgu(self, l, r):
+        k = (r - l + 1).bit_length() - 1
+        seviye = self.seviyeler[k]
+        return np.minimum(seviye[:, l], seviye[:, r - (1 << k) + 1])
+
+def _parca_pencereleri(pencere_parcalari, araliklar, ilk_gun, p, d, satirlar, konum, toplam_satir,
+                       normal_satir, bolge_kodlari, bolge_ortalama_tablosu, bolge_katsayilari):
+    # p kişilik parçanın kişi x gün matrisleri ve önek toplamları; satirlar
+    # parçanın df satır numaraları, konum kişi * d + gün
+    toplam_gunluk = np.bincount(konum, toplam_satir[satirlar], p * d).reshape(p, d)
+    normal_gunluk = np.bincount(konum, normal_satir[satirlar], p * d).reshape(p, d)
+    aktif = np.bincount(konum, minlength=p * d).reshape(p, d) > 0
+    ilk_satir = np.full(p * d, len(bolge_kodlari), dtype=np.int64)
+    np.minimum.at(ilk_satir, konum, satirlar)
+    ilk_satir = ilk_satir.reshape(p, d)
+
+    sifir = np.zeros((p, 1))
+    toplam_onek = np.hstack([sifir, np.cumsum(toplam_gunluk, axis=1)])
+    normal_onek = np.hstack([sifir, np.cumsum(normal_gunluk, axis=1)])
+    aktif_onek = np.hstack([sifir, np.cumsum(aktif, axis=1)])
+    sonraki = _sonraki_aktif(aktif)
+    onceki = _onceki_aktif(aktif)
+    ilk_satir_tablosu = _MinTablosu(ilk_satir)
+
+    for parcalar, (l, r) in zip(pencere_parcalari, araliklar):
+        l, r = l - ilk_gun, r - ilk_gun
+        toplam = toplam_onek[:, r + 1] - toplam_onek[:, l]
+        normal = normal_onek[:, r + 1] - normal_onek[:, l]
+        aktif_gun = aktif_onek[:, r + 1] - aktif_onek[:, l]
+        var = aktif_gun > 0
+        toplam_gun = np.where(var, onceki[:, r] - sonraki[:, l] + 1, 1)
+        ilk = ilk_satir_tablosu.sorgu(l, r)
+        bolge_kodu = np.where(var, bolge_kodlari[np.minimum(ilk, len(bolge_kodlari) - 1)], -1)
+        parcalar["toplam"].append(toplam)
+        parcalar["normal"].append(normal)
+        parcalar["aktif_gun"].append(aktif_gun)
+        parcalar["puan"].append(hesapla_puan_dizi(
+            normal, toplam, bolge_ortalama_tablosu[bolge_kodu], bolge_katsayilari[bolge_kodu],
+            aktif_gun, toplam_gun,
+        ))
+        parcalar["ilk"].append(ilk)
+
+def puan_serisi(df, ilk_gun, son_gun, bolge_ortalamalari, pencere="hafta", tur="ardisik", adim=1):
+    """df: filtrelenmiş okuma satırları; ilk_gun/son_gun gün numarası (ordinal).
+
+    Kişiler ilk görülme sırasıyla döner. Pencerede kaydı olmayan kişinin o
+    penceredeki değerleri None'dır; BOLGE ve KULLANICI_ADI kişinin o
+    penceredeki ilk kaydındandır.
+    """
+    araliklar = pencereler(ilk_gun, son_gun, pencere, tur, adim)
+    pencere_listesi = [
+        {"baslangic": date.fromordinal(l).isoformat(), "bitis": date.fromordinal(r).isoformat()}
+        for l, r in araliklar
+    ]
+    if df.empty or not araliklar:
+        return {"pencereler": pencere_listesi, "seriler": []}
+
+    gun = tarih_ordinalleri(df).to_numpy()
+    tarihli = ~np.isnan(gun) & (gun >= ilk_gun) & (gun <= son_gun)
+    df = df[tarihli]
+    gun = gun[tarihli].astype(np.int64) - ilk_gun
+    if df.empty:
+        return {"pencereler": pencere_listesi, "seriler": []}
+
+    kodlar, adlar = pd.factorize(_sutun(df, "AD_SOYAD", ""), use_na_sentinel=False)
+    bolge_kodlari, bolge_adlari = pd.factorize(_sutun(df, "BOLGE", ""), use_na_sentinel=False)
+    kullanici_satirlari = _sutun(df, "KULLANICI_ADI", None).tolist()
+    # Boş değerler groupby().sum() gibi atlanır
+    toplam_satir = _sutun(df, "TOPLAM_OKUMA", 0).fillna(0).to_numpy(dtype=float)
+    normal_satir = _sutun(df, "NORMAL_OKUMA", 0).fillna(0).to_numpy(dtype=float)
+    p, d = len(adlar), son_gun - ilk_gun + 1
+
+    # Bölge koduna göre katsayı ve ortalama (pencerede kişinin ilk kaydının bölgesi)
+    bolge_katsayilari = np.array([get_bolge_katsayi(b) for b in bolge_adlari] + [1.0])
+    bolge_ortalama_tablosu = np.array([_bolge_ortalamasi(bolge_ortalamalari, b) for b in bolge_adlari] + [1.0])
+    bolge_adlari = list(bolge_adlari)
+
+    # Pencere başına kişi değerleri; max_okuma bütün kişiler üzerinden
+    # alındığından PUAN normalizasyonu parçalar birleşince yapılır
+    parca_boyu = max(1, PARCA_HUCRE // (d * (d.bit_length() + 8)))
+    siralama = np.argsort(kodlar, kind="stable")
+    sinirlar = np.searchsorted(kodlar[siralama], np.arange(0, p + parca_boyu, parca_boyu))
+    alanlar = ("toplam", "normal", "aktif_gun", "puan", "ilk")
+    pencere_parcalari = [{alan: [] for alan in alanlar} for _ in araliklar]
+    for j, bas in enumerate(range(0, p, parca_boyu)):
+        satirlar = siralama[sinirlar[j]:sinirlar[j + 1]]
+        _parca_pencereleri(
+            pencere_parcalari, araliklar, ilk_gun, min(parca_boyu, p - bas), d, satirlar,
+            (kodlar[satirlar] - bas) * d + gun[satirlar], toplam_satir, normal_satir,
+            bolge_kodlari, bolge_ortalama_tablosu, bolge_katsayilari,
+        )
+
+    sutunlar = {ad: [] for ad in ("PUAN", "TOPLAM_OKUMA", "NORMAL_OKUMA", "AKTIF_GUN", "KATEGORI", "BOLGE", "KULLANICI_ADI")}
+    for parcalar in pencere_parcalari:
+        toplam, normal, aktif_gun, puan, ilk = (np.concatenate(parcalar[alan]) for alan in alanlar)
+        var = aktif_gun > 0
+        ilk = np.minimum(ilk, len(df) - 1)
+        bolge_kodu = np.where(var, bolge_kodlari[ilk], -1)
+        kategori = kategori_indeksleri(puan)
+        max_okuma = max(1, toplam[var].max()) if var.any() else 1
+        norm_factor = _math_uygula(math.log1p, toplam) / math.log1p(max_okuma)
+        puan_liste = puan.tolist()
+        norm_liste = norm_factor.tolist()
+        for ad, degerler in (
+            ("PUAN", [round(round(x, 2) * n, 2) for x, n in zip(puan_liste, norm_liste)]),
+            ("TOPLAM_OKUMA", toplam.astype(np.int64).tolist()),
+            ("NORMAL_OKUMA", normal.astype(np.int64).tolist()),
+            ("AKTIF_GUN", aktif_gun.astype(np.int64).tolist()),
+            ("KATEGORI", [_KATEGORILER[k][0] for k in kategori.tolist()]),
+            ("BOLGE", [bolge_adlari[b] if b >= 0 else None for b in bolge_kodu.tolist()]),
+            # /analiz'deki gibi pencerede kişinin ilk kaydından
+            ("KULLANICI_ADI", [kullanici_adi_veya_tire(kullanici_satirlari[i]) for i in ilk.tolist()]),
+        ):
+            sutunlar[ad].append([v if var_mi else None for v, var_mi in zip(degerler, var.tolist())])
+
+    seriler = []
+    for i, ad_soyad in enumerate(adlar):
+        seri = {"AD_SOYAD": ad_soyad}
+        for ad, pencere_degerleri in sutunlar.items():
+            seri[ad] = [degerler[i] for degerler in pencere_degerleri]
+        seriler.append(seri)
+    return {"pencereler": pencere_listesi, "seriler": seriler}
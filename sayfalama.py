@@ -0,0 +1,81 @@
+import base64
+import hashlib
+
+from json_yanit import sutunlu
+
+# /analiz sıralamasından sayfa ve alan seçimi. Sıralama önbellekte bir kez
+# (veri sürümü ve filtre başına) yapılır ve bütün sayfalar onu paylaşır; bir
+# sayfa sıralı listeden dilimdir, istek başına seçim/sıralama yapılmaz.
+
+class ImlecHatasi(ValueError):
+    pass
+
+def _surum_ozeti(etag):
+    return hashlib.sha1(etag.encode("utf-8")).hexdigest()[:12]
+
+def imlec_olustur(etag, offset):
+    # İmleç sıralamanın sürümünü taşır; veri değiştiyse eski imleç reddedilir
+    metin = f"{_surum_ozeti(etag)}:{offset}"
+    return base64.urlsafe_b64encode(metin.encode("ascii")).decode("ascii").rstrip("=")
+
+def imlec_coz(imlec, etag):
+    try:
+        metin = base64.urlsafe_b64decode(imlec + "=" * (-len(imlec) % 4)).decode("ascii")
+        surum, offset = metin.split(":")
+        offset = int(offset)
+    except (ValueError, UnicodeDecodeError):
+        raise ImlecHatasi("Geçersiz sayfa imleci.")
+    if surum != _surum_ozeti(etag) or offset < 0:
+        raise ImlecHatasi("Sayfa imleci eski; sıralama değişti, ilk sayfadan başlayın.")
+    return offset
+
+def _alan_listesi(metin):
+    return [a.strip() for a in metin.split(",") if a.strip()] if metin else []
+
+def alanlari_sec(satirlar, alanlar=None, haric=None):
+    secilen = _alan_listesi(alanlar)
+    cikar = set(_alan_listesi(haric))
+    if not secilen and not cikar:
+        return satirlar
+    if secilen:
+        secilen = [a for a in secilen if a not in cikar]
+        return [{a: s[a] for a in secilen if a in s} for s in satirlar]
+    return [{a: d for a, d in s.items() if a not in cikar} for s in satirlar]
+
+def gorunum_etag(etag, gorunum):
+    # Aynı sıralamanın farklı sayfa/alan seçimleri farklı ETag alır
+    return '"' + hashlib.sha1(f"{etag}|{gorunum!r}".encode("utf-8")).hexdigest() + '"'
+
+def analiz_sayfasi(sonuc, etag, top_k=None, limit=None, offset=0, imlec=None,
+                   alanlar=None, haric=None, kullanici_listesi=True, bicim="satir"):
+    """Önbellekteki tam /analiz sonucundan istenen görünümü üretir.
+
+    (sonuc, etag) döner. Hiçbir parametre verilmemişse sonuç aynen döner.
+    Sayfalama istendiğinde yanıta toplam, offset, limit ve sonraki_imlec
+    eklenir. bicim="sutun" satırları alan başına dizilere çevirir.
+    Geçersiz imleçte ImlecHatasi yükselir.
+    """
+    gorunum = (top_k, limit, offset, imlec, alanlar, haric, kullanici_listesi, bicim)
+    if gorunum == (None, None, 0, None, None, None, True, "satir"):
+        return sonuc, etag
+    satirlar = sonuc.get("analiz_sonucu")
+    if not isinstance(satirlar, list):
+        return sonuc, etag
+
+    yeni = dict(sonuc)
+    if not kullanici_listesi:
+        yeni.pop("kullanicilar", None)
+    sayfali = top_k is not None or limit is not None or offset or imlec
+    if sayfali:
+        if imlec:
+            offset = imlec_coz(imlec, etag)
+        toplam = len(satirlar) if top_k is None else min(top_k, len(satirlar))
+        bitis = toplam if limit is None else min(offset + limit, toplam)
+        satirlar = satirlar[offset:bitis]
+        yeni["toplam"] = toplam
+        yeni["offset"] = offset
+        yeni["limit"] = limit
+        yeni["sonraki_imlec"] = imlec_olustur(etag, bitis) if bitis < toplam else None
+    satirlar = alanlari_sec(satirlar, alanlar, haric)
+    yeni["analiz_sonucu"] = sutunlu(satirlar) if bicim == "sutun" else satirlar
+    return yeni, gorunum_etag(etag, gorunum)
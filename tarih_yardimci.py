@@ -0,0 +1,85 @@
+import math
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+from dateutil.parser import parse
+
+# Tek tarih katmanı: her farklı ham TARIH değeri bir kez ayrıştırılır ve gün
+# numarasına (date.toordinal) çevrilir. Filtreler ve puanlama bu sayıları
+# karşılaştırır; karışık biçimlerde metin karşılaştırması yapılmaz.
+
+AY_MAP = {
+    "Ocak": "01", "Şubat": "02", "Mart": "03", "Nisan": "04",
+    "Mayıs": "05", "Haziran": "06", "Temmuz": "07", "Ağustos": "08",
+    "Eylül": "09", "Ekim": "10", "Kasım": "11", "Aralık": "12"
+}
+
+# Büyük/küçük harf duyarsız ay araması için ("HAZİRAN", "haziran", "KASIM")
+_TR_KUCUK = str.maketrans({"I": "ı", "İ": "i"})
+_AY_NUMARASI = {ad.translate(_TR_KUCUK).lower(): int(no) for ad, no in AY_MAP.items()}
+_AYIRICI = re.compile(r"[-./ ]+")
+
+def _ay(parca):
+    if parca.isdigit():
+        return int(parca)
+    return _AY_NUMARASI.get(parca.translate(_TR_KUCUK).lower())
+
+@lru_cache(maxsize=8192)
+def _metin_ordinal(t):
+    t = t.strip()
+    if not t:
+        return None
+    try:
+        # 2025-06-13, 2025-06-13 00:00:00, 2025-06-13T08:30
+        return date.fromisoformat(t[:10]).toordinal()
+    except ValueError:
+        pass
+    parcalar = _AYIRICI.split(t)
+    if len(parcalar) == 3:
+        try:
+            if len(parcalar[0]) == 4:
+                # 2025/06/13
+                yil, ay, gun = int(parcalar[0]), _ay(parcalar[1]), int(parcalar[2])
+            else:
+                # 13-Haziran-2025, 13.06.2025, 13/06/2025
+                gun, ay, yil = int(parcalar[0]), _ay(parcalar[1]), int(parcalar[2])
+            if ay is not None:
+                return date(yil, ay, gun).toordinal()
+        except ValueError:
+            pass
+    try:
+        return parse(t).toordinal()
+    except (ValueError, OverflowError):
+        return None
+
+def tarih_ordinal(t):
+    """Ham TARIH değerini gün numarasına çevirir; çözülemezse None döner."""
+    if t is None:
+        return None
+    if isinstance(t, str):
+        return _metin_ordinal(t)
+    if isinstance(t, (datetime, date)):
+        # pandas.Timestamp da datetime alt sınıfıdır
+        return t.toordinal()
+    if isinstance(t, float) and math.isnan(t):
+        return None
+    return _metin_ordinal(str(t))
+
+def tarih_donustur(t):
+    # '13-Haziran-2025', '13.06.2025', Excel tarih hücresi vb. -> '2025-06-13'.
+    # Çözülemeyen değerlere dokunulmaz.
+    iso = iso_tarih(t)
+    return iso if iso is not None else t
+
+def ordinal_tarih(ordinal):
+    return date.fromordinal(ordinal)
+
+def iso_tarih(t):
+    # Ham değeri 'YYYY-AA-GG' metnine çevirir; çözülemezse None
+    ordinal = tarih_ordinal(t)
+    return date.fromordinal(ordinal).isoformat() if ordinal is not None else None
+
+def onbellek_durumu():
+    bilgi = _metin_ordinal.cache_info()
+    return {"isabet": bilgi.hits, "iska": bilgi.misses, "boyut": bilgi.currsize}
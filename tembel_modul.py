@@ -0,0 +1,24 @@
+import importlib
+
+# pandas/numpy gibi içe aktarması yüzlerce ms süren modüller için vekil.
+# Modül, vekilin bir özniteliğine ilk erişildiğinde içe aktarılır; böylece
+# uygulama bu modüller yüklenmeden ayağa kalkar. importlib.util.LazyLoader
+# Python 3.11'de eşzamanlı ilk erişimde güvenli olmadığından (ısınma thread'i
+# ile istekler aynı anda dokunabilir) içe aktarma kilidini kullanan
+# import_module tercih edildi.
+
+class TembelModul:
+    def __init__(self, ad):
+        self._ad = ad
+
+    def __getattr__(self, oznitelik):
+        deger = getattr(importlib.import_module(self._ad), oznitelik)
+        # Sonraki erişimler __getattr__'a düşmeden örnek sözlüğünden okunur
+        self.__dict__[oznitelik] = deger
+        return deger
+
+    def __repr__(self):
+        return f"<TembelModul {self._ad}>"
+
+def tembel_modul(ad):
+    return TembelModul(ad)
@@ -0,0 +1,122 @@
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import veritabani
+from analiz_fonksiyonlar import BOLGE_KATSAYILARI
+from analiz_vektorel import personel_ozeti, puan_sonuclari
+from canli_siralama import CanliSiralama
+from isim_kayit import normalize_ad
+from json_yanit import json_tiplerine
+from tarih_yardimci import tarih_ordinal
+from veri_aktarim import kayitlari_aktar
+
+# Canlı sıralamanın artımlı adımı (_artimli) her turdan sonra aynı filtreyle
+# baştan hesaplanan personel_ozeti + puan_sonuclari ile aynı satırları
+# vermeli; max_okuma büyüdüğünde ve tablo sıfırlandığında da.
+
+ILCELER = ["EDREMİT", "AYVALIK", "BANDIRMA", "GÖNEN"]
+
+FILTRELER = [
+    (None, None, None, 0),
+    ("2025-01-10", "2025-02-10", None, 0),
+    (None, None, "edremit", 0),
+    ("2025-01-05", None, None, 50),
+]
+
+@pytest.fixture
+def veritabani_gecici(tmp_path, monkeypatch):
+    motor = create_engine(f"sqlite:///{tmp_path / 'okumalar.db'}")
+    event.listen(motor, "connect", veritabani._sqlite_ayarla)
+    monkeypatch.setattr(veritabani, "engine", motor)
+    monkeypatch.setattr(veritabani, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=motor))
+    veritabani.init_db()
+    yield
+    motor.dispose()
+
+def kayitlar(rng, adet, kisi_sayisi, en_fazla=300):
+    for _ in range(adet):
+        p = rng.randrange(kisi_sayisi)
+        toplam = rng.randrange(en_fazla)
+        yield {
+            "AD_SOYAD": f"PERSONEL {p}" if p % 50 else None,
+            "KULLANICI_ADI": f"kullanici{p}" if p % 7 else None,
+            "BOLGE": ILCELER[p % 4] if p % 9 else "BİLİNMEYEN",
+            "ILCE": ILCELER[p % 4],
+            "TARIH": (date(2025, 1, 1) + timedelta(days=rng.randrange(60))).isoformat(),
+            "TOPLAM_OKUMA": toplam,
+            "NORMAL_OKUMA": rng.randrange(toplam + 1),
+            "DEFTER_ID": str(rng.randrange(30)),
+        }
+
+def canli(filtre):
+    ilk, son, ilce, normal_min = filtre
+    siralama = CanliSiralama(
+        ilk, son, tarih_ordinal(ilk) if ilk else None, tarih_ordinal(son) if son else None,
+        ilce, normal_min, lambda: "veritabani", None,
+    )
+    siralama.hazirla()
+    return siralama
+
+def taze_siralama(filtre):
+    ilk, son, ilce, normal_min = filtre
+    ilceler = veritabani.ilce_adlari_eslesen(normalize_ad(ilce), normalize_ad) if ilce else None
+    if normal_min > 0:
+        df = pd.DataFrame(veritabani.okumalari_sorgula(ilk, son, ilceler, normal_min))
+    else:
+        df = pd.DataFrame(veritabani.ozet_sorgula(ilk, son, ilceler))
+    ozet, kullanici_adlari = personel_ozeti(df, BOLGE_KATSAYILARI)
+    satirlar = json_tiplerine(puan_sonuclari(ozet, kullanici_adlari))
+    return {s["AD_SOYAD"]: s for s in satirlar}, max(ozet["toplam_okuma"].tolist())
+
+def ayni_mi(siralama):
+    satirlar, max_okuma = taze_siralama((siralama.ilkTarih, siralama.sonTarih, siralama.ilce, siralama.normal_okuma_min))
+    assert siralama.satirlar == satirlar
+    assert siralama.max_okuma == max_okuma
+
+@pytest.mark.parametrize("filtre", FILTRELER)
+def test_artimli_taze_hesaplama_ile_ayni(veritabani_gecici, filtre):
+    rng = random.Random(3)
+    kayitlari_aktar(kayitlar(rng, 3000, 300), sifirla=True)
+    siralama = canli(filtre)
+    ayni_mi(siralama)
+    for adet in (1, 5, 40, 200):
+        # Yeni kişiler de gelir (kisi_sayisi 300'den büyük)
+        kayitlari_aktar(kayitlar(rng, adet, 330))
+        siralama.guncelle()
+        ayni_mi(siralama)
+    assert siralama.tam_hesaplama == 1
+    assert siralama.artimli_hesaplama == 4
+
+@pytest.mark.parametrize("filtre", FILTRELER[:2])
+def test_max_okuma_buyudugunde_normalizasyon(veritabani_gecici, filtre):
+    rng = random.Random(5)
+    kayitlari_aktar(kayitlar(rng, 3000, 300), sifirla=True)
+    siralama = canli(filtre)
+    eski_max = siralama.max_okuma
+    kayitlari_aktar(kayitlar(rng, 20, 300, en_fazla=20000))
+    degisiklik = siralama.guncelle()
+    ayni_mi(siralama)
+    assert siralama.max_okuma > eski_max
+    assert degisiklik["max_okuma_degisti"]
+    # Yeniden puanlanmayan kişilerin de normalizasyonu değişir
+    assert len(degisiklik["guncellenen"]) > siralama.yeniden_puanlanan
+    assert siralama.tam_hesaplama == 1
+
+def test_sifirlama_bastan_kurar(veritabani_gecici):
+    rng = random.Random(7)
+    kayitlari_aktar(kayitlar(rng, 2000, 300), sifirla=True)
+    siralama = canli(FILTRELER[0])
+    eski_son_id = siralama._son_id
+    # Daha az kişiyle ama daha çok satırla yeniden doldurulur: MAX(id) geriye
+    # gitmez, sıfırlama yalnızca veri_durumu sayacından anlaşılır
+    kayitlari_aktar(kayitlar(rng, 2500, 100), sifirla=True)
+    degisiklik = siralama.guncelle()
+    ayni_mi(siralama)
+    assert siralama._son_id >= eski_son_id
+    assert siralama.tam_hesaplama == 2
+    assert degisiklik["silinen"]
@@ -0,0 +1,13 @@
+from isim_kayit import ILCE_KAYDI, BILINMEYEN, isim_raporu, sorgu_kimligi
+
+def test_sorgu_yazimi_uyumsuzluk_eklemez():
+    kimlik = ILCE_KAYDI.kimlik("Edremit")
+    once = isim_raporu()["uyumsuzluklar"]
+    onbellek = len(ILCE_KAYDI._ham_kimlik)
+
+    assert sorgu_kimligi(ILCE_KAYDI, "edremit") == kimlik
+    assert sorgu_kimligi(ILCE_KAYDI, " EDREMİT ") == kimlik
+    assert sorgu_kimligi(ILCE_KAYDI, "olmayan ilce") == BILINMEYEN
+
+    assert isim_raporu()["uyumsuzluklar"] == once
+    assert len(ILCE_KAYDI._ham_kimlik) == onbellek
@@ -0,0 +1,45 @@
+import importlib
+import json
+import math
+import sys
+
+import pytest
+
+import disa_aktarim
+import json_yanit
+
+# orjson ve stdlib json yolları NaN/Infinity'yi aynı biçimde (null) yazmalı.
+# stdlib yolu orjson kurulu değilken yüklenen modülle denenir.
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_modulu(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        yield json_yanit
+        return
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.delitem(sys.modules, "json_yanit")
+    modul = importlib.import_module("json_yanit")
+    assert modul.orjson is None
+    # Çıkışta monkeypatch sys.modules'daki asıl json_yanit'i geri koyar
+    yield modul
+
+SATIRLAR = [
+    {"AD_SOYAD": "A", "PUAN": 12.5, "DUZENLILIK_PUANI": math.nan},
+    {"AD_SOYAD": "B", "PUAN": math.inf, "DUZENLILIK_PUANI": [1.0, -math.inf]},
+]
+
+BEKLENEN = [
+    {"AD_SOYAD": "A", "PUAN": 12.5, "DUZENLILIK_PUANI": None},
+    {"AD_SOYAD": "B", "PUAN": None, "DUZENLILIK_PUANI": [1.0, None]},
+]
+
+def test_ndjson_akisi_nan(json_modulu, monkeypatch):
+    monkeypatch.setattr(disa_aktarim, "json_bayt", json_modulu.json_bayt)
+    monkeypatch.setattr(disa_aktarim, "nan_temizle", json_modulu.nan_temizle)
+    cikti = b"".join(disa_aktarim.ndjson_akisi([SATIRLAR[:1], SATIRLAR[1:]]))
+    assert [json.loads(satir) for satir in cikti.splitlines()] == BEKLENEN
+
+def test_yanit_nan(json_modulu):
+    yanit = json_modulu.HizliJSONResponse({"analiz_sonucu": SATIRLAR, "max_okuma": math.nan})
+    assert json.loads(yanit.body) == {"analiz_sonucu": BEKLENEN, "max_okuma": None}
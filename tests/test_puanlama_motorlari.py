@@ -0,0 +1,63 @@
+import math
+
+import pandas as pd
+import pytest
+
+import paralel_analiz
+from analiz_fonksiyonlar import BOLGE_KATSAYILARI, personel_karsilastirma_analizi
+from analiz_vektorel import personel_karsilastirma_analizi_vektorel
+from json_yanit import json_tiplerine
+
+# Klasik, sütunlu ve paralel motorlar aynı girdide aynı satırları vermeli
+# (/analiz?motor=...). Karışık girdi: boş bölge, boş okuma sayıları, eksik ve
+# çözülemeyen tarihler, adı olmayan kişi.
+
+def _kayitlar():
+    bolgeler = ["EDREMİT", "AKÇAY", None, "ALTINOLUK", "BİLİNMEYEN"]
+    tarihler = ["2025-06-02", "13-Haziran-2025", None, "2025-06-20", "tarih değil", "2025-06-11"]
+    kayitlar = []
+    for i in range(120):
+        kisi = i % 17
+        kayitlar.append({
+            "AD_SOYAD": f"PERSONEL {kisi}" if kisi != 16 else None,
+            "KULLANICI_ADI": f"kullanici{kisi}" if kisi % 5 else None,
+            "BOLGE": bolgeler[kisi % len(bolgeler)],
+            "ILCE": "EDREMİT",
+            "TARIH": tarihler[i % len(tarihler)],
+            "TOPLAM_OKUMA": None if i % 11 == 3 else 100 + i * 7 % 90,
+            "NORMAL_OKUMA": None if i % 13 == 5 else 60 + i * 5 % 40,
+        })
+    return kayitlar
+
+def _normal(satirlar):
+    # NaN ve None JSON'da aynı (null); karşılaştırma JSON tipleri üzerinden
+    return json_tiplerine(satirlar)
+
+@pytest.fixture
+def paralel(monkeypatch):
+    monkeypatch.setattr(paralel_analiz, "ISCI_SAYISI", 2)
+    monkeypatch.setattr(paralel_analiz, "PARALEL_ESIK", 1)
+    yield paralel_analiz.paralel_puanla
+    paralel_analiz.havuzu_kapat()
+
+@pytest.mark.parametrize("kaynak", ["kayit", "cerceve"])
+def test_motorlar_ayni_sonucu_verir(paralel, kaynak):
+    kayitlar = _kayitlar()
+    if kaynak == "cerceve":
+        # Excel yolu: kayıtlar DataFrame'den gelir (None -> NaN)
+        df = pd.DataFrame(kayitlar)
+        kayitlar = df.to_dict(orient="records")
+    else:
+        # Veritabanı / API yolu: kayıtlarda None
+        df = pd.DataFrame(kayitlar)
+
+    klasik = _normal(personel_karsilastirma_analizi(kayitlar, 0, BOLGE_KATSAYILARI))
+    vektorel = _normal(personel_karsilastirma_analizi_vektorel(df, 0, BOLGE_KATSAYILARI))
+    paralel_kayit = _normal(paralel(kayitlar, BOLGE_KATSAYILARI))
+    paralel_cerceve = _normal(paralel(df, BOLGE_KATSAYILARI))
+
+    assert len(klasik) == 17
+    assert all(isinstance(s["PUAN"], float) and math.isfinite(s["PUAN"]) for s in klasik)
+    assert vektorel == klasik
+    assert paralel_kayit == klasik
+    assert paralel_cerceve == klasik
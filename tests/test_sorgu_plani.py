@@ -0,0 +1,76 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import veritabani
+from benchmark.sorgu_plani import ornek_degerler, rapor_sorgulari
+
+# Rapor sorgularının indeksli filtreleri tam tablo taramasına düşmemeli
+# (bkz. benchmark/sorgu_plani.py). Sorgular geçici bir veritabanında,
+# okumalari_aktar'ın kurduğu indeks ve istatistiklerle açıklanır.
+
+@pytest.fixture(scope="module")
+def ornekler(tmp_path_factory):
+    motor = create_engine(f"sqlite:///{tmp_path_factory.mktemp('db') / 'okumalar.db'}")
+    event.listen(motor, "connect", veritabani._sqlite_ayarla)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(veritabani, "engine", motor)
+        mp.setattr(veritabani, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=motor))
+        veritabani.init_db()
+        rng = random.Random(7)
+        baslangic = datetime(2025, 1, 1)
+        veritabani.okumalari_aktar(
+            {
+                "ad_soyad": f"PERSONEL {p}",
+                "kullanici_adi": f"kullanici{p}",
+                "tarih": baslangic + timedelta(days=rng.randrange(60)),
+                "ilce": f"ILCE {p % 12}",
+                "bolge": f"BOLGE {p % 8}",
+                "defter_id": str(rng.randrange(400)),
+                "toplam_okuma": rng.randrange(300),
+                "normal_okuma": rng.randrange(200),
+            }
+            for p in (rng.randrange(250) for _ in range(6000))
+        )
+        yield rapor_sorgulari(ornek_degerler())
+    motor.dispose()
+
+SORGULAR = [
+    "filtre_alanlari_ilce",
+    "filtre_alanlari_kullanici",
+    "bolge_toplamlari_tam",
+    "bolge_toplamlari_artimli",
+    "kullanici_adlari_tarih",
+    "kullanici_adlari_tarih_ilce",
+    "kullanici_adlari_eslesen",
+    "okumalar_tarih_ilce",
+    "okumalar_kullanici",
+    "okumalar_kullanici_tarih",
+    "ozet_tarih",
+    "ozet_tarih_ilce",
+    "ozet_kullanici",
+    "defter",
+    "canli_degisen_kisiler",
+    "canli_kisi_kayitlari",
+    "canli_kisi_kayitlari_min_normal",
+]
+
+def test_sorgu_listesi_guncel(ornekler):
+    assert sorted(ornekler) == sorted(SORGULAR)
+
+@pytest.mark.parametrize("ad", SORGULAR)
+def test_tam_tarama_yok(ornekler, ad):
+    planlar = veritabani.sorgu_planlari(ornekler[ad])
+    assert planlar
+    taramalar = [(sql, plan) for sql, plan, tam_tarama in planlar if tam_tarama]
+    assert not taramalar
+
+def test_tam_tarama_mi():
+    assert veritabani.tam_tarama_mi("SCAN okumalar")
+    assert veritabani.tam_tarama_mi("SCAN gunluk_ozet USING INDEX ix_gunluk_ozet_ad_soyad")
+    assert not veritabani.tam_tarama_mi("SCAN okumalar USING COVERING INDEX ix_okumalar_bolge_okuma")
+    assert not veritabani.tam_tarama_mi("SEARCH okumalar USING INDEX ix_okumalar_tarih_ilce (tarih>? AND tarih<?)")
+    assert not veritabani.tam_tarama_mi("USE TEMP B-TREE FOR DISTINCT")
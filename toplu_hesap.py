@@ -0,0 +1,150 @@
+import io
+import itertools
+import json
+
+from analiz_vektorel import _KATEGORILER, hesapla_puan_dizi, kategori_indeksleri
+from tembel_modul import tembel_modul
+
+np = tembel_modul("numpy")
+pd = tembel_modul("pandas")
+
+# /default-hesapla ve hesapla_puan'ın toplu sürümleri. Girdiler JSON listesi
+# ya da CSV olarak gelir; bütün satırlar numpy dizileriyle tek seferde
+# hesaplanır. Satır satır sonuçlar tekil fonksiyonlarla birebir aynıdır.
+
+# Bir istekte hesaplanacak en fazla (parametre kombinasyonu x girdi) hücre
+MAX_HUCRE = 5_000_000
+
+class GirdiHatasi(ValueError):
+    pass
+
+def girdi_cercevesi(govde, icerik_turu):
+    # JSON: [{...}, ...] ya da {"girdiler": [...]}; aksi halde başlık satırlı CSV
+    if not govde:
+        raise GirdiHatasi("Girdi boş.")
+    if "json" in (icerik_turu or ""):
+        try:
+            veri = json.loads(govde)
+        except ValueError as e:
+            raise GirdiHatasi(f"JSON okunamadı: {e}")
+        if isinstance(veri, dict):
+            veri = veri.get("girdiler")
+        if not isinstance(veri, list) or not all(isinstance(v, dict) for v in veri):
+            raise GirdiHatasi("JSON girdisi nesne listesi olmalı.")
+        df = pd.DataFrame(veri)
+    else:
+        try:
+            df = pd.read_csv(io.BytesIO(govde))
+        except (ValueError, pd.errors.ParserError) as e:
+            raise GirdiHatasi(f"CSV okunamadı: {e}")
+    if df.empty:
+        raise GirdiHatasi("Girdi boş.")
+    return df
+
+def _sutun(df, alan, varsayilan=None, tam_sayi=False):
+    if alan not in df.columns:
+        if varsayilan is None:
+            raise GirdiHatasi(f"'{alan}' alanı eksik.")
+        return np.full(len(df), varsayilan, dtype=float)
+    degerler = pd.to_numeric(df[alan], errors="coerce")
+    if varsayilan is None:
+        hatali = degerler.isna()
+    else:
+        # İsteğe bağlı alanda boş hücre varsayılanı alır
+        hatali = degerler.isna() & df[alan].notna()
+        degerler = degerler.fillna(varsayilan)
+    if tam_sayi:
+        hatali |= degerler.notna() & (degerler % 1 != 0)
+    if hatali.any():
+        satirlar = (np.flatnonzero(hatali.to_numpy()) + 1).tolist()[:10]
+        raise GirdiHatasi(f"'{alan}' alanında geçersiz değer (satır {satirlar}).")
+    return degerler.to_numpy(dtype=float)
+
+def _tam_sayilar(dizi):
+    return [int(x) for x in dizi.tolist()]
+
+# ------------------ MANUEL DEFAULT ------------------
+def toplu_default_hesapla(df):
+    """manuel_default_hesapla'nın her satır için sonucu, girdi sırasıyla."""
+    defter = _sutun(df, "defter_sayisi", tam_sayi=True)
+    sure = _sutun(df, "toplam_sure_dakika")
+    toplam = _sutun(df, "toplam_okuma", tam_sayi=True)
+    normal = _sutun(df, "normal_okuma", tam_sayi=True)
+
+    gecersiz = (defter == 0) | (sure == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        okuma_hizi = np.where(gecersiz, 0.0, toplam / sure)
+        dogruluk = np.where(toplam > 0, normal / toplam, 0.0)
+    ham_puan = np.minimum(okuma_hizi * 30, 100)
+    puan = ham_puan * (0.7 * dogruluk + 0.3)
+    kategori = np.select([puan >= 90, puan >= 75, puan >= 60], ["Mükemmel", "İyi", "Orta"], default="Düşük")
+
+    sonuc = []
+    satirlar = zip(
+        gecersiz.tolist(), puan.tolist(), kategori.tolist(), okuma_hizi.tolist(), dogruluk.tolist(),
+        _tam_sayilar(defter), _tam_sayilar(toplam), _tam_sayilar(normal),
+    )
+    for gecersiz_mi, p, k, h, d, df_sayisi, t, n in satirlar:
+        if gecersiz_mi:
+            sonuc.append({"PUAN": 0.0, "KATEGORI": "Geçersiz", "MESAJ": "Defter sayısı veya süre 0 olamaz."})
+            continue
+        sonuc.append({
+            "PUAN": round(p, 2),
+            "KATEGORI": k,
+            "OKUMA_HIZI": round(h, 2),
+            "DOĞRULUK": round(d, 2),
+            "DEFTER": df_sayisi,
+            "TOPLAM_OKUMA": t,
+            "NORMAL_OKUMA": n,
+        })
+    return sonuc
+
+# ------------------ HESAPLA PUAN ------------------
+def _puan_girdileri(df):
+    normal = _sutun(df, "normal_okuma")
+    toplam = _sutun(df, "toplam_okuma")
+    bolge_ortalama = _sutun(df, "bolge_ortalama")
+    bolge_katsayi = _sutun(df, "bolge_katsayi", 1.0)
+    aktif_gun = _sutun(df, "aktif_gun", np.nan)
+    toplam_gun = _sutun(df, "toplam_gun", np.nan)
+    # hesapla_puan'da aktif_gun ya da toplam_gun yoksa düzenlilik 0.5'tir;
+    # dizi sürümünde bu toplam_gun = 0 ile ifade edilir
+    eksik = np.isnan(aktif_gun) | np.isnan(toplam_gun)
+    aktif_gun = np.where(eksik, 0.0, aktif_gun)
+    toplam_gun = np.where(eksik, 0.0, toplam_gun)
+    return normal, toplam, bolge_ortalama, bolge_katsayi, aktif_gun, toplam_gun
+
+def toplu_puan_hesapla(df, alphalar=None, betalar=None, gammalar=None):
+    """hesapla_puan'ın toplu sürümü.
+
+    Parametre taraması yoksa her satır için hesapla_puan ile aynı sözlük
+    döner. alpha/beta/gamma listelerinden biri verilirse bütün
+    kombinasyonlar için puan matrisi döner: satırlar kombinasyonlar,
+    sütunlar girdiler; kategoriler "kategoriler" listesindeki indekslerdir.
+    """
+    girdiler = _puan_girdileri(df)
+    if not (alphalar or betalar or gammalar):
+        puan = hesapla_puan_dizi(*girdiler)
+        sonuc = []
+        for p, k in zip(puan.tolist(), kategori_indeksleri(puan).tolist()):
+            kategori, arti, eksik = _KATEGORILER[k]
+            sonuc.append({"PUAN": round(p, 2), "KATEGORI": kategori, "ARTI_YONLER": arti, "EKSIK_YONLER": eksik})
+        return {"sonuclar": sonuc}
+
+    kombinasyonlar = list(itertools.product(alphalar or [0.65], betalar or [0.25], gammalar or [0.10]))
+    if len(kombinasyonlar) * len(df) > MAX_HUCRE:
+        raise GirdiHatasi(f"En fazla {MAX_HUCRE} hücre hesaplanabilir (kombinasyon x girdi).")
+    if any(a + b + g == 0 for a, b, g in kombinasyonlar):
+        raise GirdiHatasi("alpha + beta + gamma sıfır olamaz.")
+    # Ağırlıklar (kombinasyon, 1) şeklinde verilince sonuç (kombinasyon, girdi) olur
+    alpha, beta, gamma = (np.array(p, dtype=float)[:, None] for p in zip(*kombinasyonlar))
+    puan = np.broadcast_to(
+        hesapla_puan_dizi(*girdiler, alpha=alpha, beta=beta, gamma=gamma),
+        (len(kombinasyonlar), len(df)),
+    )
+    return {
+        "parametreler": [{"alpha": a, "beta": b, "gamma": g} for a, b, g in kombinasyonlar],
+        "kategoriler": [k[0] for k in _KATEGORILER],
+        "puan": [[round(p, 2) for p in satir] for satir in puan.tolist()],
+        "kategori": kategori_indeksleri(puan).tolist(),
+    }
@@ -0,0 +1,85 @@
+import argparse
+import json
+import math
+from datetime import datetime
+
+from bolge_istatistik import bolge_istatistikleri
+from onbellek import veri_surumu
+from veritabani import init_db, okumalari_aktar
+from veri_deposu import EXCEL_DOSYASI
+from tarih_yardimci import tarih_ordinal
+from akisli_okuma import akisli_kayitlar
+
+# Excel / CSV / API JSON kayıtlarını okumalar tablosuna toplu aktarır.
+# Excel ve CSV dosyaları akış halinde okunur; bellekte en fazla bir parti tutulur.
+#   python veri_aktarim.py readings_sahte.xlsx --sifirla
+#   python veri_aktarim.py aylik_okumalar.csv
+#   python veri_aktarim.py api_dokumu.json
+
+def _bos_mu(v):
+    return v is None or (isinstance(v, float) and math.isnan(v)) or v == ""
+
+def _metin(v):
+    return None if _bos_mu(v) else str(v)
+
+def _tam_sayi(v):
+    if _bos_mu(v):
+        return None
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+def _tarih(v):
+    if _bos_mu(v):
+        return None
+    if isinstance(v, datetime):
+        return v
+    ordinal = tarih_ordinal(v)
+    return datetime.fromordinal(ordinal) if ordinal is not None else None
+
+def okuma_satiri(kayit):
+    # Excel/API anahtarlarını Okuma sütunlarına çevirir
+    return {
+        "ad_soyad": _metin(kayit.get("AD_SOYAD")),
+        "tarih": _tarih(kayit.get("TARIH")),
+        "ilk_okuma": _metin(kayit.get("ILK_OKUMA")),
+        "son_okuma": _metin(kayit.get("SON_OKUMA")),
+        "normal_okuma": _tam_sayi(kayit.get("NORMAL_OKUMA")),
+        "diger": _tam_sayi(kayit.get("DIGER")),
+        "toplam_okuma": _tam_sayi(kayit.get("TOPLAM_OKUMA")),
+        "defter_id": _metin(kayit.get("DEFTER_ID")),
+        "ilce": _metin(kayit.get("ILCE")),
+        "bolge": _metin(kayit.get("BOLGE")),
+        "kullanici_adi": _metin(kayit.get("KULLANICI_ADI")),
+    }
+
+def dosya_kayitlari(yol, parti_boyutu=5000):
+    if yol.lower().endswith(".json"):
+        with open(yol, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return akisli_kayitlar(yol, parti_boyutu)
+
+def kayitlari_aktar(kayitlar, sifirla=False, parti_boyutu=5000):
+    if sifirla:
+        bolge_istatistikleri.sifirla()
+    try:
+        return okumalari_aktar((okuma_satiri(k) for k in kayitlar), parti_boyutu, sifirla)
+    finally:
+        # Yarım kalan aktarım da veriyi değiştirmiş olabilir
+        veri_surumu.artir()
+
+def dosyayi_aktar(yol=EXCEL_DOSYASI, sifirla=False, parti_boyutu=5000):
+    return kayitlari_aktar(dosya_kayitlari(yol, parti_boyutu), sifirla, parti_boyutu)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Okumaları veritabanına aktar")
+    parser.add_argument("dosya", nargs="?", default=EXCEL_DOSYASI, help="Excel (.xlsx), CSV ya da API JSON dökümü")
+    parser.add_argument("--sifirla", action="store_true", help="Aktarmadan önce okumalar tablosunu boşalt")
+    parser.add_argument("--parti", type=int, default=5000, help="executemany parti boyutu")
+    args = parser.parse_args()
+    init_db()
+    adet = dosyayi_aktar(args.dosya, args.sifirla, args.parti)
+    # Sunucu süreçleri yeni okumaları kendileri de görür; anlık görüntü burada tazelenir
+    bolge_istatistikleri.guncelle()
+    print(f"{adet} okuma aktarıldı.")
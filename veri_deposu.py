@@ -0,0 +1,214 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+from analiz_fonksiyonlar import defter_anahtari
+from analiz_vektorel import tarih_ordinalleri
+from isim_kayit import kimlik_sutunlari_ekle, uyumsuzluklari_raporla
+from okuma_anlik import ETKIN as ANLIK_GORUNTU_ETKIN, anlik_goruntu_ile_oku
+from onbellek import veri_surumu
+from tarih_yardimci import tarih_donustur
+from tembel_modul import tembel_modul
+
+np = tembel_modul("numpy")
+pd = tembel_modul("pandas")
+
+EXCEL_DOSYASI = "readings_sahte.xlsx"
+
+# ------------------ EXCEL OKUMA ------------------
+def _excel_cevir(yol):
+    df = pd.read_excel(yol)
+    if "TARIH" in df.columns:
+        # Her farklı tarih değeri bir kez çevrilir
+        donusum = {t: tarih_donustur(t) for t in df["TARIH"].dropna().unique()}
+        df["TARIH"] = df["TARIH"].map(donusum)
+    return df
+
+def _kimlikleri_ekle(df):
+    # Satırlar ILCE_ID / BOLGE_ID taşır; filtreler tamsayı karşılaştırır.
+    # Kimlikler süreç içi kayıttan gelir, bu yüzden anlık görüntüye yazılmaz.
+    kimlik_sutunlari_ekle(df)
+    uyumsuzluklari_raporla()
+    return df
+
+def excel_oku(yol):
+    return _kimlikleri_ekle(_excel_cevir(yol))
+
+def anlik_goruntuden_oku(yol):
+    # Excel yalnızca değiştiğinde çevrilir; diğer zamanlarda (başka worker'lar
+    # ve yeniden başlatmalar dahil) okuma_anlik görüntüsü açılır
+    df, _ = anlik_goruntu_ile_oku(yol, _excel_cevir)
+    return _kimlikleri_ekle(df)
+
+# ------------------ OKUMA DEPOSU ------------------
+class OkumaDeposu:
+    """Okuma kayıtlarını süreç boyunca bellekte tutar.
+
+    Dosya yalnızca ilk istekte ve mtime/boyut değiştiğinde yeniden okunur.
+    Veri hem sütunlu (DataFrame) hem de kayıt listesi olarak sunulur; kayıt
+    listesi ilk ihtiyaç duyulduğunda üretilir. Dönen nesneler paylaşılır;
+    çağıranlar bunları yerinde değiştirmemelidir.
+    """
+
+    def __init__(self, yol, yukleyici=None):
+        self.yol = yol
+        if yukleyici is None:
+            yukleyici = anlik_goruntuden_oku if ANLIK_GORUNTU_ETKIN else excel_oku
+        self._yukleyici = yukleyici
+        self._kilit = threading.Lock()
+        self._imza = None
+        self._cerceve = None
+        self._kayitlar = None
+        self._defter_indeksi = None
+        self._kullanici_indeksi = None
+        self.surum = 0
+        self._isabet = 0
+        self._iska = 0
+        self._yukleme_sayisi = 0
+        self._son_yukleme_suresi = None
+        self._toplam_yukleme_suresi = 0.0
+        self._son_yukleme_zamani = None
+        self._son_hata = None
+
+    def _dosya_imzasi(self):
+        st = os.stat(self.yol)
+        return (st.st_mtime_ns, st.st_size)
+
+    def cerceve(self):
+        try:
+            imza = self._dosya_imzasi()
+        except OSError as e:
+            print(f"Excel okuma hatası: {e}")
+            self._son_hata = str(e)
+            return pd.DataFrame()
+        if imza == self._imza:
+            self._isabet += 1
+            return self._cerceve
+        with self._kilit:
+            # Kilidi beklerken başka bir istek dosyayı yüklemiş olabilir
+            if imza == self._imza:
+                self._isabet += 1
+                return self._cerceve
+            self._iska += 1
+            baslangic = time.perf_counter()
+            try:
+                df = self._yukleyici(self.yol)
+            except Exception as e:
+                # İmzayı güncellemiyoruz; bir sonraki istek tekrar dener
+                print(f"Excel okuma hatası: {e}")
+                self._son_hata = str(e)
+                return pd.DataFrame()
+            sure = time.perf_counter() - baslangic
+            self._cerceve = df
+            self._kayitlar = None
+            self._defter_indeksi = None
+            self._kullanici_indeksi = None
+            self._imza = imza
+            self.surum += 1
+            veri_surumu.artir()
+            self._yukleme_sayisi += 1
+            self._son_yukleme_suresi = sure
+            self._toplam_yukleme_suresi += sure
+            self._son_yukleme_zamani = datetime.now().isoformat(timespec="seconds")
+            self._son_hata = None
+            return df
+
+    def kayitlar(self):
+        df = self.cerceve()
+        with self._kilit:
+            if df is self._cerceve:
+                if self._kayitlar is None:
+                    self._kayitlar = df.to_dict(orient="records")
+                return self._kayitlar
+        # Yükleme başarısız oldu ya da bu arada dosya yeniden yüklendi
+        return df.to_dict(orient="records")
+
+    def defter_kayitlari(self, defter_id):
+        # DEFTER_ID -> satır konumları indeksi ilk defter sorgusunda kurulur;
+        # sonraki sorgular yalnızca o defterin satırlarını okur
+        df = self.cerceve()
+        if "DEFTER_ID" not in df.columns:
+            return []
+        with self._kilit:
+            indeks = self._defter_indeksi if df is self._cerceve else None
+            if indeks is None:
+                anahtarlar = {d: defter_anahtari(d) for d in df["DEFTER_ID"].dropna().unique()}
+                defterler = df["DEFTER_ID"].map(anahtarlar).to_numpy()
+                indeks = pd.Series(np.arange(len(df))).groupby(defterler).indices
+                if df is self._cerceve:
+                    self._defter_indeksi = indeks
+        konumlar = indeks.get(defter_anahtari(defter_id))
+        if konumlar is None:
+            return []
+        return df.iloc[konumlar].to_dict(orient="records")
+
+    def _kullanici_indeksi_kur(self, df):
+        # Satır konumları (küçük harfli KULLANICI_ADI, gün) sırasına dizilir;
+        # her kullanıcı bu dizide bitişik bir aralıktır ve aralık içinde
+        # günler artan sıradadır. Tarihi çözülemeyen satırlar (inf) sonda kalır.
+        adlar = df["KULLANICI_ADI"]
+        anahtarlar = {a: a.lower() for a in adlar.dropna().unique() if isinstance(a, str)}
+        kodlar, tekiller = pd.factorize(adlar.map(anahtarlar))
+        gunler = tarih_ordinalleri(df).fillna(np.inf).to_numpy(dtype=float)
+        sira = np.lexsort((gunler, kodlar))
+        sira = sira[kodlar[sira] >= 0]
+        araliklar = {}
+        if len(sira):
+            sirali_kodlar = kodlar[sira]
+            sinirlar = (np.flatnonzero(np.diff(sirali_kodlar)) + 1).tolist()
+            baslar = [0] + sinirlar
+            sonlar = sinirlar + [len(sira)]
+            for k, bas, son in zip(sirali_kodlar[baslar].tolist(), baslar, sonlar):
+                araliklar[tekiller[k]] = (bas, son)
+        return {"konumlar": sira, "gunler": gunler[sira], "araliklar": araliklar}
+
+    def kullanici_kayitlari(self, kullanici_adi, ilk_gun=None, son_gun=None):
+        """Bir kullanıcının (büyük/küçük harf duyarsız) kayıtları, dosya sırasıyla.
+
+        Tarih sınırı verilirse TARIH'i çözülemeyen satırlar dahil edilmez.
+        Kullanıcı indeksi veri sürümü başına bir kez kurulur; tarih aralığı
+        kullanıcının günlere göre sıralı diliminde ikili aramayla bulunur.
+        """
+        df = self.cerceve()
+        if "KULLANICI_ADI" not in df.columns or not kullanici_adi:
+            return []
+        with self._kilit:
+            indeks = self._kullanici_indeksi if df is self._cerceve else None
+            if indeks is None:
+                indeks = self._kullanici_indeksi_kur(df)
+                if df is self._cerceve:
+                    self._kullanici_indeksi = indeks
+        aralik = indeks["araliklar"].get(kullanici_adi.lower())
+        if aralik is None:
+            return []
+        bas, son = aralik
+        gunler = indeks["gunler"][bas:son]
+        if ilk_gun is not None or son_gun is not None:
+            alt = 0 if ilk_gun is None else int(np.searchsorted(gunler, ilk_gun, side="left"))
+            if son_gun is None:
+                # Yalnızca alt sınır varsa da tarihsiz satırlar dışarıda kalır
+                ust = int(np.searchsorted(gunler, np.inf, side="left"))
+            else:
+                ust = int(np.searchsorted(gunler, son_gun, side="right"))
+            bas, son = bas + alt, bas + ust
+        konumlar = np.sort(indeks["konumlar"][bas:son])
+        return df.iloc[konumlar].to_dict(orient="records")
+
+    def istatistikler(self):
+        return {
+            "dosya": self.yol,
+            "surum": self.surum,
+            "kayit_sayisi": len(self._cerceve) if self._cerceve is not None else 0,
+            "isabet": self._isabet,
+            "iska": self._iska,
+            "yukleme_sayisi": self._yukleme_sayisi,
+            "son_yukleme_suresi_sn": (
+                round(self._son_yukleme_suresi, 4) if self._son_yukleme_suresi is not None else None
+            ),
+            "toplam_yukleme_suresi_sn": round(self._toplam_yukleme_suresi, 4),
+            "son_yukleme_zamani": self._son_yukleme_zamani,
+            "son_hata": self._son_hata,
+        }
+
+okuma_deposu = OkumaDeposu(EXCEL_DOSYASI)
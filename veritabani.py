@@ -1,21 +1,46 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float
+from datetime import datetime, date, timedelta
+
+from sqlalchemy import (
+    create_engine, event, select, text, func, or_,
+    Column, Integer, String, DateTime, Date, Float, Index, UniqueConstraint,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from tarih_yardimci import tarih_ordinal
+
 SQLALCHEMY_DATABASE_URL = "sqlite:///./database.db"  # ya da PostgreSQL, MySQL, vs.
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 
+@event.listens_for(engine, "connect")
+def _sqlite_ayarla(dbapi_connection, connection_record):
+    # WAL: toplu aktarım sürerken okuma endpointleri beklemez
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 class Okuma(Base):
     __tablename__ = "okumalar"
+    # Rapor sorgularının biçimine göre birleşik indeksler:
+    #   (tarih, ilce): tarih aralığı + ilçe filtreleri
+    #   (bolge, toplam_okuma, normal_okuma): GROUP BY bolge toplamları tablo
+    #     satırlarına inmeden indeksten okunur
+    #   (kullanici_adi, tarih): kullanıcı adı listeleri ve tek kişilik raporlar
+    __table_args__ = (
+        Index("ix_okumalar_tarih_ilce", "tarih", "ilce"),
+        Index("ix_okumalar_bolge_okuma", "bolge", "toplam_okuma", "normal_okuma"),
+        Index("ix_okumalar_kullanici_tarih", "kullanici_adi", "tarih"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     ad_soyad = Column(String, index=True)
     tarih = Column(DateTime)
     ilk_okuma = Column(String)
@@ -23,10 +48,437 @@ class Okuma(Base):
     normal_okuma = Column(Integer)
     diger = Column(Integer)
     toplam_okuma = Column(Integer)
-    defter_id = Column(String)
+    defter_id = Column(String, index=True)
     ilce = Column(String, index=True)
-    bolge = Column(String, index=True)
-    kullanici_adi = Column(String, index=True)
+    bolge = Column(String)
+    kullanici_adi = Column(String)
+
+class GunlukOzet(Base):
+    # Kişi başına günlük toplamlar. Puanlama ham okumalar yerine bu tablodan
+    # beslenir; okumalar aktarıldıkça artımlı olarak güncellenir.
+    __tablename__ = "gunluk_ozet"
+    __table_args__ = (
+        UniqueConstraint("tarih", "kullanici_adi", "ad_soyad", "bolge", "ilce", name="uq_gunluk_ozet"),
+        # Tarih filtresi olmadan kişi/kullanıcı bazlı özet sorguları için
+        Index("ix_gunluk_ozet_kullanici_tarih", "kullanici_adi", "tarih"),
+        Index("ix_gunluk_ozet_ad_soyad", "ad_soyad"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    tarih = Column(Date)
+    # Anahtar sütunlarda NULL yerine "" tutulur; aksi halde UNIQUE çakışması
+    # oluşmaz ve aynı gün için yinelenen satırlar birikir.
+    kullanici_adi = Column(String, nullable=False, default="")
+    ad_soyad = Column(String, nullable=False, default="")
+    bolge = Column(String, nullable=False, default="")
+    ilce = Column(String, nullable=False, default="")
+    toplam_okuma = Column(Integer, nullable=False, default=0)
+    normal_okuma = Column(Integer, nullable=False, default=0)
+    okuma_sayisi = Column(Integer, nullable=False, default=0)
+    # Özet satırlarını ham okumalarla aynı sırada döndürmek için
+    ilk_okuma_id = Column(Integer, nullable=False)
+
+class VeriDurumu(Base):
+    # Tek satırlık durum tablosu. sifirlama, okumalar tablosu her
+    # boşaltıldığında DELETE ile aynı transaction'da artar. id'ler boşaltmadan
+    # sonra yeniden 1'den başladığından MAX(id) tek başına sıfırlamayı
+    # göstermez; id'ye göre artımlı tutulan durumlar (bölge toplamları) bu
+    # sayaç değişince baştan kurulur. Başka süreçteki aktarımlar da görülür.
+    __tablename__ = "veri_durumu"
+
+    id = Column(Integer, primary_key=True)
+    sifirlama = Column(Integer, nullable=False, default=0)
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM veri_durumu WHERE id = 1")).first() is None:
+            conn.execute(VeriDurumu.__table__.insert(), {"id": 1, "sifirlama": 0})
+        # create_all var olan tabloya sonradan eklenen indeksleri kurmaz
+        for tablo in (Okuma.__table__, GunlukOzet.__table__):
+            for indeks in tablo.indexes:
+                indeks.create(conn, checkfirst=True)
+        # Birleşik indekslerin ilk sütunu olan tek sütunlu indeksler ve
+        # rowid'in kopyası olan id indeksi gereksiz
+        conn.execute(text("DROP INDEX IF EXISTS ix_okumalar_id"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_okumalar_bolge"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_okumalar_kullanici_adi"))
+        ozet_bos = conn.execute(text("SELECT 1 FROM gunluk_ozet LIMIT 1")).first() is None
+        okuma_var = conn.execute(text("SELECT 1 FROM okumalar LIMIT 1")).first() is not None
+        if ozet_bos and okuma_var:
+            _gunluk_ozete_ekle(conn, 0)
+        if okuma_var:
+            istatistikleri_guncelle(conn)
+
+def istatistikleri_guncelle(conn):
+    # Planlayıcı istatistik olmadan eşitlik koşulunu seçici sayar ve tarih
+    # aralığı + ilçe sorgusunda ix_okumalar_tarih_ilce yerine az değerli ilçe
+    # indeksini seçer. ANALYZE, tablo son ölçümün yarısının altına inince ya
+    # da iki katını geçince yenilenir. analysis_limit ile örnekleme az değerli
+    # sütunlarda (ilçe, bölge) satır sayısını çok düşük tahmin ettiğinden tam yapılır.
+    satir = conn.execute(text("SELECT IFNULL(MAX(id), 0) FROM okumalar")).scalar()
+    olculen = None
+    if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")).first():
+        stat = conn.execute(text("SELECT stat FROM sqlite_stat1 WHERE tbl = 'okumalar' LIMIT 1")).scalar()
+        olculen = int(stat.split()[0]) if stat else None
+    if olculen is None or not olculen / 2 <= satir <= olculen * 2:
+        conn.execute(text("ANALYZE okumalar"))
+        conn.execute(text("ANALYZE gunluk_ozet"))
+
+# ------------------ GÜNLÜK ÖZET ------------------
+_OZET_UPSERT = text("""
+    INSERT INTO gunluk_ozet (
+        tarih, kullanici_adi, ad_soyad, bolge, ilce,
+        toplam_okuma, normal_okuma, okuma_sayisi, ilk_okuma_id
+    )
+    SELECT date(tarih), IFNULL(kullanici_adi, ''), IFNULL(ad_soyad, ''),
+           IFNULL(bolge, ''), IFNULL(ilce, ''),
+           SUM(IFNULL(toplam_okuma, 0)), SUM(IFNULL(normal_okuma, 0)), COUNT(*), MIN(id)
+    FROM okumalar
+    WHERE id > :son_id
+    GROUP BY 1, 2, 3, 4, 5
+    ON CONFLICT (tarih, kullanici_adi, ad_soyad, bolge, ilce) DO UPDATE SET
+        toplam_okuma = toplam_okuma + excluded.toplam_okuma,
+        normal_okuma = normal_okuma + excluded.normal_okuma,
+        okuma_sayisi = okuma_sayisi + excluded.okuma_sayisi,
+        ilk_okuma_id = MIN(ilk_okuma_id, excluded.ilk_okuma_id)
+""")
+
+def _gunluk_ozete_ekle(conn, son_id):
+    # id'si son_id'den büyük okumaları günlük özete ekler (aynı transaction içinde)
+    conn.execute(_OZET_UPSERT, {"son_id": son_id})
+
+def gunluk_ozeti_yeniden_olustur():
+    with engine.begin() as conn:
+        conn.execute(GunlukOzet.__table__.delete())
+        _gunluk_ozete_ekle(conn, 0)
+
+# ------------------ TOPLU AKTARIM ------------------
+def okumalari_aktar(satirlar, parti_boyutu=5000, sifirla=False):
+    # satirlar: Okuma sütun adlarıyla sözlükler (id hariç). Her parti tek bir
+    # executemany ve tek bir transaction ile yazılır; günlük özet aynı
+    # transaction içinde yalnızca yeni satırlarla güncellenir.
+    adet = 0
+    if sifirla:
+        with engine.begin() as conn:
+            conn.execute(Okuma.__table__.delete())
+            conn.execute(GunlukOzet.__table__.delete())
+            conn.execute(text("UPDATE veri_durumu SET sifirlama = sifirlama + 1 WHERE id = 1"))
+    parti = []
+    for satir in satirlar:
+        parti.append(satir)
+        if len(parti) >= parti_boyutu:
+            adet += _parti_yaz(parti)
+            parti = []
+    if parti:
+        adet += _parti_yaz(parti)
+    if adet:
+        with engine.begin() as conn:
+            istatistikleri_guncelle(conn)
+    return adet
+
+def _parti_yaz(parti):
+    with engine.begin() as conn:
+        son_id = conn.execute(text("SELECT IFNULL(MAX(id), 0) FROM okumalar")).scalar()
+        conn.execute(Okuma.__table__.insert(), parti)
+        _gunluk_ozete_ekle(conn, son_id)
+    return len(parti)
+
+# ------------------ BÖLGE TOPLAMLARI ------------------
+_OKUMA_DURUMU = text(
+    "SELECT IFNULL((SELECT sifirlama FROM veri_durumu WHERE id = 1), 0), IFNULL(MAX(id), 0) FROM okumalar"
+)
+
+def okuma_durumu():
+    # (sifirlama, son_id): ikisi tek sorguda okunur. Sıfırlama sayacı
+    # değiştiyse son_id'ye göre tutulan durum geçersizdir.
+    with engine.connect() as conn:
+        return tuple(conn.execute(_OKUMA_DURUMU).one())
+
+def bolge_toplamlari(son_id=0):
+    # son_id'den sonra eklenen okumaların bölge bazında toplam ve adetleri.
+    # (sifirlama, yeni_son_id, satırlar) döner; satır: (bolge, toplam_sum,
+    # toplam_adet, normal_sum, normal_adet). Adetler AVG gibi NULL değerleri
+    # saymaz. Sayaç satırlardan önce okunur; arada bir sıfırlama olursa
+    # çağıran bir sonraki sorguda sayacın değiştiğini görür.
+    with engine.connect() as conn:
+        sifirlama, yeni_son_id = conn.execute(_OKUMA_DURUMU).one()
+        if yeni_son_id <= son_id:
+            return sifirlama, yeni_son_id, []
+        if son_id == 0:
+            # Baştan kurulumda bütün satırlar okunur: "+id" id aralığını
+            # birincil anahtar aramasından çıkarır, böylece toplamlar
+            # ix_okumalar_bolge_okuma'dan bölge sırasıyla (geçici GROUP BY
+            # ağacı olmadan) okunur
+            kosul = "+id <= :yeni_son_id"
+        else:
+            kosul = "id > :son_id AND id <= :yeni_son_id"
+        satirlar = conn.execute(text(f"""
+            SELECT bolge, SUM(toplam_okuma), COUNT(toplam_okuma), SUM(normal_okuma), COUNT(normal_okuma)
+            FROM okumalar
+            WHERE {kosul}
+            GROUP BY bolge
+        """), {"son_id": son_id, "yeni_son_id": yeni_son_id}).all()
+    return sifirlama, yeni_son_id, satirlar
+
+# ------------------ SORGULAR ------------------
+OKUMA_VAR = select(Okuma.id).limit(1)
+
+def okuma_var_mi():
+    session = SessionLocal()
+    try:
+        return session.execute(OKUMA_VAR).first() is not None
+    finally:
+        session.close()
+
+def _gun_baslangici(tarih):
+    ordinal = tarih_ordinal(tarih)
+    if ordinal is None:
+        raise ValueError(f"Geçersiz tarih: {tarih}")
+    return datetime.fromordinal(ordinal)
+
+def eslesen_ilceler(ilceler, ilce_norm, normalize):
+    return [i for i in ilceler if i and normalize(i) == ilce_norm]
+
+def ilce_adlari_eslesen(ilce_norm, normalize):
+    # DISTINCT ilce ix_okumalar_ilce indeksinden okunur; böylece normalize
+    # edilmiş ilçe filtresi indeksli bir IN (...) koşuluna dönüşür.
+    session = SessionLocal()
+    try:
+        return eslesen_ilceler(session.execute(ILCE_LISTESI).scalars(), ilce_norm, normalize)
+    finally:
+        session.close()
+
+def kullanici_adlari_eslesen(kullanici_adi):
+    session = SessionLocal()
+    try:
+        adlar = session.query(Okuma.kullanici_adi).distinct().all()
+        return [a[0] for a in adlar if a[0] and a[0].lower() == kullanici_adi.lower()]
+    finally:
+        session.close()
+
+def _filtreler(ilk_tarih=None, son_tarih=None, ilceler=None, normal_okuma_min=0, kullanici_adlari=None):
+    kosullar = []
+    if ilk_tarih:
+        kosullar.append(Okuma.tarih >= _gun_baslangici(ilk_tarih))
+    if son_tarih:
+        kosullar.append(Okuma.tarih < _gun_baslangici(son_tarih) + timedelta(days=1))
+    if ilceler is not None:
+        kosullar.append(Okuma.ilce.in_(ilceler))
+    if normal_okuma_min > 0:
+        kosullar.append(Okuma.normal_okuma >= normal_okuma_min)
+    if kullanici_adlari is not None:
+        kosullar.append(Okuma.kullanici_adi.in_(kullanici_adlari))
+    return kosullar
+
+_KAYIT_SUTUNLARI = (
+    Okuma.ilce, Okuma.bolge, Okuma.ad_soyad, Okuma.kullanici_adi, Okuma.tarih,
+    Okuma.ilk_okuma, Okuma.son_okuma, Okuma.normal_okuma, Okuma.diger,
+    Okuma.toplam_okuma, Okuma.defter_id,
+)
+
+def okuma_kaydi(k):
+    # Veritabanı satırını Excel kayıtlarıyla aynı anahtarlara çevirir
+    return {
+        "ILCE": k.ilce,
+        "BOLGE": k.bolge,
+        "AD_SOYAD": k.ad_soyad,
+        "KULLANICI_ADI": k.kullanici_adi,
+        "TARIH": k.tarih.strftime("%Y-%m-%d") if k.tarih else None,
+        "ILK_OKUMA": k.ilk_okuma,
+        "SON_OKUMA": k.son_okuma,
+        "NORMAL_OKUMA": k.normal_okuma or 0,
+        "DIGER": k.diger or 0,
+        "TOPLAM_OKUMA": k.toplam_okuma or 0,
+        "DEFTER_ID": k.defter_id,
+    }
+
+def okumalari_sorgula(ilk_tarih=None, son_tarih=None, ilceler=None, normal_okuma_min=0, kullanici_adlari=None):
+    session = SessionLocal()
+    try:
+        kosullar = _filtreler(ilk_tarih, son_tarih, ilceler, normal_okuma_min, kullanici_adlari)
+        sorgu = session.query(*_KAYIT_SUTUNLARI).filter(*kosullar).order_by(Okuma.id)
+        return [okuma_kaydi(k) for k in sorgu]
+    finally:
+        session.close()
+
+def kullanici_adlari_ifadesi(ilk_tarih=None, son_tarih=None, ilceler=None):
+    # Tarih geçersizse ValueError
+    return select(Okuma.kullanici_adi).where(*_filtreler(ilk_tarih, son_tarih, ilceler)).distinct()
+
+def kullanici_adlari_sorgula(ilk_tarih=None, son_tarih=None, ilceler=None):
+    session = SessionLocal()
+    try:
+        adlar = session.execute(kullanici_adlari_ifadesi(ilk_tarih, son_tarih, ilceler)).scalars()
+        return sorted({a for a in adlar if a})
+    finally:
+        session.close()
+
+def defter_okumalari(defter_id, ilk_tarih=None, son_tarih=None, ilceler=None, normal_okuma_min=0):
+    # Yalnızca o defterin satırları ix_okumalar_defter_id üzerinden okunur
+    session = SessionLocal()
+    try:
+        kosullar = [Okuma.defter_id == defter_id] + _filtreler(ilk_tarih, son_tarih, ilceler, normal_okuma_min)
+        sorgu = session.query(*_KAYIT_SUTUNLARI).filter(*kosullar).order_by(Okuma.id)
+        return [okuma_kaydi(k) for k in sorgu]
+    finally:
+        session.close()
+
+# ------------------ ÖZET SORGULARI ------------------
+def _bos_ise_none(deger):
+    return deger if deger != "" else None
+
+def ozet_kaydi(k):
+    # Özet satırını puanlama fonksiyonlarının beklediği kayıt biçimine çevirir
+    return {
+        "ILCE": _bos_ise_none(k.ilce),
+        "BOLGE": _bos_ise_none(k.bolge),
+        "AD_SOYAD": _bos_ise_none(k.ad_soyad),
+        "KULLANICI_ADI": _bos_ise_none(k.kullanici_adi),
+        "TARIH": k.tarih.isoformat() if k.tarih else None,
+        "TOPLAM_OKUMA": k.toplam_okuma,
+        "NORMAL_OKUMA": k.normal_okuma,
+    }
+
+def _ozet_filtreleri(ilk_tarih=None, son_tarih=None, ilceler=None, kullanici_adlari=None):
+    kosullar = []
+    if ilk_tarih:
+        kosullar.append(GunlukOzet.tarih >= _gun_baslangici(ilk_tarih).date())
+    if son_tarih:
+        kosullar.append(GunlukOzet.tarih <= _gun_baslangici(son_tarih).date())
+    if ilceler is not None:
+        kosullar.append(GunlukOzet.ilce.in_(ilceler))
+    if kullanici_adlari is not None:
+        kosullar.append(GunlukOzet.kullanici_adi.in_(kullanici_adlari))
+    return kosullar
+
+_OZET_SUTUNLARI = (
+    GunlukOzet.ilce, GunlukOzet.bolge, GunlukOzet.ad_soyad, GunlukOzet.kullanici_adi,
+    GunlukOzet.tarih, GunlukOzet.toplam_okuma, GunlukOzet.normal_okuma,
+)
+
+def ozet_sorgula(ilk_tarih=None, son_tarih=None, ilceler=None, kullanici_adlari=None):
+    # Kayıt başına min. normal okuma filtresi günlük toplamlara uygulanamaz;
+    # o durumda okumalari_sorgula kullanılmalı.
+    session = SessionLocal()
+    try:
+        kosullar = _ozet_filtreleri(ilk_tarih, son_tarih, ilceler, kullanici_adlari)
+        sorgu = session.query(*_OZET_SUTUNLARI).filter(*kosullar).order_by(GunlukOzet.ilk_okuma_id)
+        return [ozet_kaydi(k) for k in sorgu]
+    finally:
+        session.close()
+
+# ------------------ KİŞİ SIRALI AKIŞ ------------------
+def _kisi_sorgusu(ilk_tarih, son_tarih, ilceler, normal_okuma_min):
+    # (tablo, koşullar, sıra sütunu, kayıt dönüştürücü); min. normal okuma
+    # filtresi yoksa günlük özet tablosu kullanılır
+    if normal_okuma_min > 0:
+        kosullar = _filtreler(ilk_tarih, son_tarih, ilceler, normal_okuma_min)
+        return Okuma, kosullar, Okuma.id, _KAYIT_SUTUNLARI, okuma_kaydi
+    kosullar = _ozet_filtreleri(ilk_tarih, son_tarih, ilceler)
+    return GunlukOzet, kosullar, GunlukOzet.ilk_okuma_id, _OZET_SUTUNLARI, ozet_kaydi
+
+def kisi_toplami_en_buyuk(ilk_tarih=None, son_tarih=None, ilceler=None, normal_okuma_min=0):
+    # Kişi başına TOPLAM_OKUMA toplamlarının en büyüğü (puanlamadaki max_okuma)
+    session = SessionLocal()
+    try:
+        tablo, kosullar, _, _, _ = _kisi_sorgusu(ilk_tarih, son_tarih, ilceler, normal_okuma_min)
+        toplamlar = (
+            session.query(func.sum(tablo.toplam_okuma).label("toplam"))
+            .filter(*kosullar).group_by(tablo.ad_soyad).subquery()
+        )
+        return session.query(func.max(toplamlar.c.toplam)).scalar() or 0
+    finally:
+        session.close()
+
+def kisi_sirali_kayitlar(ilk_tarih=None, son_tarih=None, ilceler=None, normal_okuma_min=0, parti_boyutu=5000):
+    # Puanlama kayıtlarını kişi kişi akıtır: ad_soyad sırasıyla, her kişinin
+    # kayıtları /analiz'deki sırayla. Satırlar parti_boyutu'ndan fazla
+    # bellekte tutulmaz; oturum üreteç bitince kapanır.
+    session = SessionLocal()
+    try:
+        tablo, kosullar, sira, sutunlar, donustur = _kisi_sorgusu(
+            ilk_tarih, son_tarih, ilceler, normal_okuma_min
+        )
+        sorgu = session.query(*sutunlar).filter(*kosullar).order_by(tablo.ad_soyad, sira)
+        for k in sorgu.yield_per(parti_boyutu):
+            yield donustur(k)
+    finally:
+        session.close()
+
+# ------------------ DEĞİŞEN KİŞİLER ------------------
+def degisen_kisiler(son_id, yeni_son_id, ilk_tarih=None, son_tarih=None, ilceler=None, normal_okuma_min=0):
+    # (son_id, yeni_son_id] aralığında eklenen ve filtrelere uyan okumaların
+    # kişileri (ad_soyad); id aralığı birincil anahtar üzerinden okunur
+    session = SessionLocal()
+    try:
+        kosullar = [Okuma.id > son_id, Okuma.id <= yeni_son_id]
+        kosullar += _filtreler(ilk_tarih, son_tarih, ilceler, normal_okuma_min)
+        return [a[0] for a in session.query(Okuma.ad_soyad).filter(*kosullar).distinct()]
+    finally:
+        session.close()
+
+def kisilerin_kayitlari(ad_soyadlar, ilk_tarih=None, son_tarih=None, ilceler=None, normal_okuma_min=0, parca=500):
+    # Verilen kişilerin puanlama kayıtları (/analiz'deki kaynak ve sırayla);
+    # IN listesi SQLite değişken sınırı için parça parça gönderilir
+    session = SessionLocal()
+    try:
+        tablo, kosullar, sira, sutunlar, donustur = _kisi_sorgusu(
+            ilk_tarih, son_tarih, ilceler, normal_okuma_min
+        )
+        adlar = list(ad_soyadlar)
+        kayitlar = []
+        for i in range(0, len(adlar), parca):
+            grup = adlar[i:i + parca]
+            if tablo is GunlukOzet:
+                # Özet tablosunda NULL ad "" olarak tutulur
+                kosul = GunlukOzet.ad_soyad.in_({a or "" for a in grup})
+            else:
+                kosul = Okuma.ad_soyad.in_([a for a in grup if a is not None])
+                if None in grup:
+                    kosul = or_(kosul, Okuma.ad_soyad.is_(None))
+            sorgu = session.query(*sutunlar).filter(*kosullar, kosul).order_by(sira)
+            kayitlar.extend(donustur(k) for k in sorgu)
+        return kayitlar
+    finally:
+        session.close()
+
+# ------------------ FİLTRE ALANLARI ------------------
+# /filtre-alanlari ve ilçe eşleştirme; ikisi de kaplayan indekslerden (ix_okumalar_ilce,
+# ix_okumalar_kullanici_tarih) tablo satırlarına inmeden okunur
+ILCE_LISTESI = select(Okuma.ilce).distinct()
+KULLANICI_LISTESI = select(Okuma.kullanici_adi).distinct()
+
+# ------------------ SORGU PLANLARI ------------------
+def tam_tarama_mi(plan_satiri):
+    # "SCAN okumalar" ve "SCAN okumalar USING INDEX ..." tablonun bütün
+    # satırlarını okur; yalnızca kaplayan indeks taraması kabul edilir
+    parcalar = plan_satiri.split()
+    return (
+        len(parcalar) >= 2 and parcalar[0] == "SCAN" and parcalar[1] in Base.metadata.tables
+        and "COVERING INDEX" not in plan_satiri
+    )
+
+def sorgu_planlari(calistir):
+    """calistir()'ın veritabanına gönderdiği SELECT'lerin planları.
+
+    Sorgular gönderildikleri SQL ve parametrelerle yakalanır, ardından
+    EXPLAIN QUERY PLAN ile açıklanır: [(sql, [plan satırları], tam_tarama)]
+    """
+    sorgular = []
+
+    def yakala(conn, cursor, sql, parametreler, context, executemany):
+        if sql.lstrip().upper().startswith("SELECT"):
+            sorgular.append((sql, parametreler))
+
+    event.listen(engine, "before_cursor_execute", yakala)
+    try:
+        calistir()
+    finally:
+        event.remove(engine, "before_cursor_execute", yakala)
+    planlar = []
+    with engine.connect() as conn:
+        for sql, parametreler in sorgular:
+            satirlar = [s[-1] for s in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, parametreler)]
+            planlar.append((sql, satirlar, any(tam_tarama_mi(s) for s in satirlar)))
+    return planlar
@@ -0,0 +1,126 @@
+import os
+
+import anyio
+
+from veritabani import SessionLocal, _sqlite_ayarla, engine
+
+# Async endpointler için havuzlu veritabanı erişimi (FastAPI bağımlılığı:
+# veritabani_oturumu). Varsayılan kip "thread"dir: sorgular senkron motorun
+# bağlantı havuzunda, havuz boyutuyla sınırlı worker thread'lerde çalışır ve
+# ek bir paket gerektirmez. ASYNC_VERITABANI_URL verilirse (ör.
+# sqlite+aiosqlite:///./database.db ya da postgresql+asyncpg://...)
+# SQLAlchemy'nin async motoru denenir; bunun için sürücünün ve greenlet'in
+# kurulu olması gerekir, değilse thread kipine düşülür. Endpointler iki
+# durumda da aynı arayüzü görür:
+#   sonuc = await oturum.execute(ILCE_LISTESI)
+#
+# Bağımlılığı yalnızca sorgu sonucunu doğrudan döndüren endpointler kullanır
+# (/filtre-alanlari, /kullanicilar, /test-okuma-kayitlari). /analiz,
+# /puan-serisi, /analiz-disa-aktar ve canlı sıralama senkron kalır: okunan
+# satırlar aynı worker thread'de pandas/puanlama ile işlenir ve sorgular
+# senkron motorun bağlantı havuzundan bağlantı alır; G/Ç'yi async oturuma
+# taşımak döngüyü boşaltmaz, yalnızca her sorguya bir thread geçişi ekler.
+# /ortalama-okuma bellekteki bölge toplamlarından döner.
+
+ASYNC_VERITABANI_URL = os.environ.get("ASYNC_VERITABANI_URL")
+HAVUZ_BOYUTU = int(os.environ.get("VERITABANI_HAVUZ_BOYUTU", "5"))
+HAVUZ_TASMASI = int(os.environ.get("VERITABANI_HAVUZ_TASMASI", "10"))
+
+class _ThreadOturumu:
+    # AsyncSession'ın kullandığımız kısmı; senkron oturum worker thread'de çalışır
+    def __init__(self, sinir):
+        self._oturum = SessionLocal()
+        self._sinir = sinir
+
+    async def _thread(self, fonksiyon, *args):
+        return await anyio.to_thread.run_sync(fonksiyon, *args, limiter=self._sinir)
+
+    async def execute(self, ifade, parametreler=None):
+        # Sonuç thread içinde okunur (freeze) ve burada yeniden açılır
+        donmus = await self._thread(lambda: self._oturum.execute(ifade, parametreler).freeze())
+        return donmus()
+
+    async def scalar(self, ifade, parametreler=None):
+        return (await self.execute(ifade, parametreler)).scalar()
+
+    async def close(self):
+        await self._thread(self._oturum.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *hata):
+        await self.close()
+
+class AsenkronVeritabani:
+    def __init__(self, url=ASYNC_VERITABANI_URL, havuz_boyutu=HAVUZ_BOYUTU, havuz_tasmasi=HAVUZ_TASMASI):
+        self.url = url
+        self.havuz_boyutu = havuz_boyutu
+        self.havuz_tasmasi = havuz_tasmasi
+        self._motor = None
+        self._oturum_uretici = None
+        self._sinir = None
+        self.kip = None
+        self.oturum_sayisi = 0
+
+    def _hazirla(self):
+        # Motor ilk oturumda, uygulamanın olay döngüsünde kurulur
+        if self.kip is not None:
+            return
+        if not self.url:
+            self._thread_kipi()
+            return
+        try:
+            from sqlalchemy import event
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+            self._motor = create_async_engine(
+                self.url,
+                pool_size=self.havuz_boyutu,
+                max_overflow=self.havuz_tasmasi,
+                pool_pre_ping=True,
+            )
+            if self._motor.dialect.name == "sqlite":
+                event.listen(self._motor.sync_engine, "connect", _sqlite_ayarla)
+            self._oturum_uretici = async_sessionmaker(self._motor, expire_on_commit=False)
+            self.kip = "async"
+        except ImportError as e:
+            print(f"Async veritabanı sürücüsü yok ({e}); sorgular thread havuzunda çalışacak.")
+            self._thread_kipi()
+
+    def _thread_kipi(self):
+        self._sinir = anyio.CapacityLimiter(self.havuz_boyutu)
+        self.kip = "thread"
+
+    def oturum(self):
+        self._hazirla()
+        self.oturum_sayisi += 1
+        if self.kip == "async":
+            return self._oturum_uretici()
+        return _ThreadOturumu(self._sinir)
+
+    async def kapat(self):
+        if self._motor is not None:
+            await self._motor.dispose()
+        self._motor = None
+        self._oturum_uretici = None
+        self._sinir = None
+        self.kip = None
+
+    def istatistikler(self):
+        # Thread kipinde bağlantılar senkron motorun havuzundan alınır
+        motor = self._motor.sync_engine if self._motor is not None else engine
+        return {
+            "kip": self.kip,
+            "surucu": motor.url.drivername,
+            "havuz_boyutu": self.havuz_boyutu,
+            "havuz_tasmasi": self.havuz_tasmasi,
+            "havuz": motor.pool.status(),
+            "oturum_sayisi": self.oturum_sayisi,
+        }
+
+asenkron_veritabani = AsenkronVeritabani()
+
+async def veritabani_oturumu():
+    # FastAPI bağımlılığı: istek başına havuzdan bir oturum
+    async with asenkron_veritabani.oturum() as oturum:
+        yield oturum